@@ -0,0 +1,213 @@
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+class Backend:
+    """
+    Базовый класс вычислителя для работы с рыбой бассейна. Рыба задается массивами кубических корней масс
+     в момент отсчета (roots) и их суточных приростов (rates, см. Pool). Вычислитель отвечает за работу,
+     которая просматривает всю рыбу бассейна: корни текущих масс, суммы для биомассы, возрасты достижения
+     массы и подсчет товарной рыбы, выбор крайних по массе рыб при продаже и распределении рыбы.
+    Этот класс - эталонная реализация на чистом Python: медленная, но простая для проверки остальных.
+    """
+    name: str = 'python'
+
+    def grow_roots(self, roots: np.ndarray, rates: np.ndarray, age: int) -> np.ndarray:
+        """
+        Метод для расчета кубических корней масс рыб в указанном возрасте бассейна.
+        :param roots: Корни масс в момент отсчета.
+        :param rates: Суточные приросты корней.
+        :param age: Количество суток с момента отсчета.
+        :return: Массив корней.
+        """
+        return np.array([root + rate * age for root, rate in zip(roots.tolist(), rates.tolist())], dtype=float)
+
+    def power_sums(self, roots: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        """
+        Метод для расчета сумм, через которые выражается биомасса группы рыб.
+        :param roots: Кубические корни из масс рыб.
+        :param rates: Суточные приросты кубических корней (mac / 3).
+        :return: Массив [Σa^3, Σa^2*b, Σa*b^2, Σb^3], где a - корни, b - приросты корней.
+        """
+        pairs: list[tuple[float, float]] = list(zip(roots.tolist(), rates.tolist()))
+        return np.array([math.fsum(root ** 3 for root, _ in pairs),
+                         math.fsum(root ** 2 * rate for root, rate in pairs),
+                         math.fsum(root * rate ** 2 for root, rate in pairs),
+                         math.fsum(rate ** 3 for _, rate in pairs)])
+
+    def crossing_ages(self, roots: np.ndarray, rates: np.ndarray, mass: float) -> np.ndarray:
+        """
+        Метод для расчета возрастов бассейна, в которые рыбы достигают указанной массы.
+        :param roots: Корни масс в момент отсчета.
+        :param rates: Суточные приросты корней.
+        :param mass: Масса рыбы в г.
+        :return: Массив возрастов (-inf - рыба всегда не легче, inf - никогда) в порядке рыб.
+        """
+        mass_root: float = float(np.cbrt(mass))
+        ages: list[float] = list()
+        for root, rate in zip(roots.tolist(), rates.tolist()):
+            if rate > 0:
+                ages.append((mass_root - root) / rate)
+            else:
+                ages.append(-math.inf if mass_root - root <= 0 else math.inf)
+        return np.array(ages, dtype=float)
+
+    def count_not_lighter(self, roots: np.ndarray, rates: np.ndarray, age: int, mass: float) -> int:
+        """
+        Метод для точного подсчета рыб, масса которых в указанном возрасте не меньше указанной.
+        :param roots: Корни масс в момент отсчета.
+        :param rates: Суточные приросты корней.
+        :param age: Возраст бассейна.
+        :param mass: Масса рыбы в г.
+        :return: Количество рыб.
+        """
+        return sum(1 for root, rate in zip(roots.tolist(), rates.tolist()) if (root + rate * age) ** 3 >= mass)
+
+    def select_extreme(self, roots: np.ndarray, number_fish: int,
+                       biggest_fish: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод для выбора самых больших или самых маленьких рыб.
+        :param roots: Корни текущих масс рыб.
+        :param number_fish: Количество выбираемых рыб (от 1 до количества рыб без единицы).
+        :param biggest_fish: Если True, то выбираются самые большие рыбы, иначе - самые маленькие.
+        :return: Номера выбранных рыб и номера остальных рыб (в произвольном порядке).
+        """
+        order: list[int] = sorted(range(len(roots)), key=roots.tolist().__getitem__)
+        border: int = len(order) - number_fish if biggest_fish else number_fish
+        low, high = np.array(order[:border], dtype=int), np.array(order[border:], dtype=int)
+        return (high, low) if biggest_fish else (low, high)
+
+
+class NumpyBackend(Backend):
+    """
+    Вычислитель на массивах NumPy.
+    """
+    name: str = 'numpy'
+
+    def grow_roots(self, roots: np.ndarray, rates: np.ndarray, age: int) -> np.ndarray:
+        return roots + rates * age
+
+    def power_sums(self, roots: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        return np.array([(roots ** 3).sum(), (roots ** 2 * rates).sum(),
+                         (roots * rates ** 2).sum(), (rates ** 3).sum()])
+
+    def crossing_ages(self, roots: np.ndarray, rates: np.ndarray, mass: float) -> np.ndarray:
+        root_gap: np.ndarray = np.cbrt(mass) - roots
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(rates > 0, root_gap / rates, np.where(root_gap <= 0, -np.inf, np.inf))
+
+    def count_not_lighter(self, roots: np.ndarray, rates: np.ndarray, age: int, mass: float) -> int:
+        return int(np.count_nonzero((roots + rates * age) ** 3 >= mass))
+
+    def select_extreme(self, roots: np.ndarray, number_fish: int,
+                       biggest_fish: bool) -> tuple[np.ndarray, np.ndarray]:
+        border: int = len(roots) - number_fish if biggest_fish else number_fish
+        partition: np.ndarray = np.argpartition(roots, border if biggest_fish else border - 1)
+        if biggest_fish:
+            return partition[border:], partition[:border]
+        return partition[:border], partition[border:]
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _grow_roots_kernel(roots, rates, age):
+        result = np.empty(roots.shape[0])
+        for number in range(roots.shape[0]):
+            result[number] = roots[number] + rates[number] * age
+        return result
+
+    @numba.njit(cache=True)
+    def _power_sums_kernel(roots, rates):
+        sums = np.zeros(4)
+        for number in range(roots.shape[0]):
+            root = roots[number]
+            rate = rates[number]
+            sums[0] += root * root * root
+            sums[1] += root * root * rate
+            sums[2] += root * rate * rate
+            sums[3] += rate * rate * rate
+        return sums
+
+    @numba.njit(cache=True)
+    def _crossing_ages_kernel(roots, rates, mass_root):
+        ages = np.empty(roots.shape[0])
+        for number in range(roots.shape[0]):
+            gap = mass_root - roots[number]
+            if rates[number] > 0:
+                ages[number] = gap / rates[number]
+            elif gap <= 0:
+                ages[number] = -np.inf
+            else:
+                ages[number] = np.inf
+        return ages
+
+    @numba.njit(cache=True)
+    def _count_not_lighter_kernel(roots, rates, age, mass):
+        count = 0
+        for number in range(roots.shape[0]):
+            root = roots[number] + rates[number] * age
+            if root ** 3 >= mass:
+                count += 1
+        return count
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    Вычислитель с ядрами, скомпилированными Numba: каждое ядро проходит по рыбе один раз без промежуточных
+     массивов. Доступен, только если установлен пакет numba. Выбор крайних рыб берется из NumpyBackend.
+    """
+    name: str = 'numba'
+
+    def __init__(self):
+        if numba is None:
+            raise ValueError('Вычислитель numba недоступен: пакет numba не установлен')
+
+    def grow_roots(self, roots: np.ndarray, rates: np.ndarray, age: int) -> np.ndarray:
+        return _grow_roots_kernel(roots, rates, float(age))
+
+    def power_sums(self, roots: np.ndarray, rates: np.ndarray) -> np.ndarray:
+        return _power_sums_kernel(roots, rates)
+
+    def crossing_ages(self, roots: np.ndarray, rates: np.ndarray, mass: float) -> np.ndarray:
+        return _crossing_ages_kernel(roots, rates, float(np.cbrt(mass)))
+
+    def count_not_lighter(self, roots: np.ndarray, rates: np.ndarray, age: int, mass: float) -> int:
+        return int(_count_not_lighter_kernel(roots, rates, float(age), float(mass)))
+
+
+# Вычислители по названиям в порядке от самого быстрого
+backends: dict[str, type[Backend]] = {'numba': NumbaBackend, 'numpy': NumpyBackend, 'python': Backend}
+# Уже созданные вычислители (у них нет состояния, поэтому достаточно одного на название)
+_instances: dict[str, Backend] = dict()
+
+
+def available_backends() -> list[str]:
+    """
+    Функция для получения названий вычислителей, которые можно использовать на этой машине.
+    :return: Список названий от самого быстрого.
+    """
+    return [name for name in backends if name != 'numba' or numba is not None]
+
+
+def get_backend(backend: str | Backend | None = None) -> Backend:
+    """
+    Функция для получения вычислителя.
+    :param backend: Название вычислителя ('python', 'numpy', 'numba'), сам вычислитель или None (или 'auto') -
+     тогда берется самый быстрый из доступных.
+    :return: Вычислитель.
+    """
+    if isinstance(backend, Backend):
+        return backend
+    if backend is None or backend == 'auto':
+        backend = available_backends()[0]
+    if backend not in backends:
+        raise ValueError(f'Неизвестный вычислитель: {backend}')
+    if backend not in _instances:
+        _instances[backend] = backends[backend]()
+    return _instances[backend]
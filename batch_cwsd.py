@@ -0,0 +1,285 @@
+import numpy as np
+
+from cwsd import CWSD
+from fish import random_macs
+
+
+class BatchCWSD:
+    """
+    Класс для одновременной работы нескольких копий (повторений) одного УЗВ.
+    Рыба всех повторений хранится в двумерных массивах (повторения × рыбы): кубический корень из массы,
+     его суточный прирост и номер бассейна (-1 для проданной рыбы). Когда проданной рыбы становится
+     не меньше половины столбцов, массивы сжимаются (см. _compact).
+     Все повторения проходят сутки вместе: рост, продажа и распределение рыбы выполняются над массивами
+     с масками повторений. Повторения, в которых произошло переполнение УЗВ или биомасса опустилась
+     до заданной, выбывают из расчета.
+    """
+    def __init__(self, cwsd: CWSD, replicates: int):
+        """
+        Метод __init__.
+        :param cwsd: УЗВ, копии которого будут работать.
+        :param replicates: Количество повторений.
+        """
+        if cwsd.pool_mode != 'fish':
+            raise ValueError('Совместные повторения работают только с поштучным хранением рыбы')
+        self.replicates: int = replicates
+        self.number_pools: int = cwsd.number_pools
+        self.pool_area: float = cwsd.pool_area
+        self.max_planting_density: float = cwsd.max_planting_density
+        self.commercial_fish_mass: float = cwsd.commercial_fish_mass
+        self.min_package: int = cwsd.min_package
+        self.feed_ratios: np.ndarray = np.array([pool.feed_ratio for pool in cwsd.pools])
+
+        # Рыба из УЗВ одинакова во всех повторениях
+        roots: list[np.ndarray] = [np.empty(0)]
+        rates: list[np.ndarray] = [np.empty(0)]
+        pools: list[np.ndarray] = [np.empty(0, dtype=int)]
+        for number, pool in enumerate(cwsd.pools):
+            roots.append(np.cbrt(pool.fishes.mass))
+            rates.append(pool.fishes.mac / 3)
+            pools.append(np.full(pool.number_fish, number))
+        self._root: np.ndarray = np.tile(np.concatenate(roots), (replicates, 1))
+        self._rate: np.ndarray = np.tile(np.concatenate(rates), (replicates, 1))
+        self._pool: np.ndarray = np.tile(np.concatenate(pools), (replicates, 1))
+
+        self.mass_indexes: np.ndarray = np.tile([pool.mass_index for pool in cwsd.pools], (replicates, 1))
+
+        # Номера повторений, которые еще работают, и итоговые результаты всех повторений
+        self._active: np.ndarray = np.arange(replicates)
+        self.success: np.ndarray = np.ones(replicates, dtype=bool)
+        self.finished: np.ndarray = np.zeros(replicates, dtype=bool)
+        self.days: np.ndarray = np.full(replicates, cwsd.days)
+        self.spent_feed: np.ndarray = np.full(replicates, cwsd.spent_feed)
+        self.sold_biomass: np.ndarray = np.full(replicates, cwsd.sold_biomass)
+
+        # Массы рыб, биомасса (кг) и количество рыбы в бассейнах работающих повторений
+        self._mass: np.ndarray = np.empty(0)
+        self._biomass: np.ndarray = np.empty(0)
+        self._number_fish: np.ndarray = np.empty(0)
+        self._update_info()
+
+    def _update_info(self):
+        """
+        Метод для пересчета масс рыб, биомассы и количества рыбы в бассейнах работающих повторений.
+        :return: Ничего.
+        """
+        replicates: int = self._pool.shape[0]
+        index: np.ndarray = np.where(self._pool >= 0,
+                                     np.arange(replicates)[:, None] * self.number_pools + self._pool,
+                                     replicates * self.number_pools).ravel()
+        self._mass = self._root ** 3
+        self._biomass = np.bincount(index, weights=self._mass.ravel(), minlength=replicates * self.number_pools + 1
+                                    )[:-1].reshape(replicates, self.number_pools) / 1000
+        self._number_fish = np.bincount(index, minlength=replicates * self.number_pools + 1
+                                        )[:-1].reshape(replicates, self.number_pools)
+
+    def _update_mass_indexes(self, mask: np.ndarray):
+        """
+        Метод для обновления массовых индексов бассейнов в части повторений так же, как в CWSD:
+         индекс бассейна равен месту в порядке по средней массе рыбы, равные массы упорядочены по номеру бассейна.
+        :param mask: Маска повторений, в которых нужно обновить индексы.
+        :return: Ничего.
+        """
+        average_mass: np.ndarray = np.where(self._number_fish > 0,
+                                            self._biomass / np.maximum(self._number_fish, 1) * 1000, 0.0)
+        lighter: np.ndarray = average_mass[:, None, :] < average_mass[:, :, None]
+        earlier: np.ndarray = (average_mass[:, None, :] == average_mass[:, :, None]) & \
+            np.tri(self.number_pools, k=-1, dtype=bool)[None]
+        indexes: np.ndarray = (lighter | earlier).sum(axis=2)
+        self.mass_indexes[mask] = indexes[mask]
+
+    def _find_pool_with_mass_index(self, mass_indexes: np.ndarray) -> np.ndarray:
+        """
+        Метод для поиска в каждом повторении первого бассейна с указанным массовым индексом.
+        :param mass_indexes: Массив искомых индексов для каждого повторения.
+        :return: Массив номеров бассейнов, -1 - если бассейна с таким индексом нет.
+        """
+        found: np.ndarray = self.mass_indexes == mass_indexes[:, None]
+        return np.where(found.any(axis=1), found.argmax(axis=1), -1)
+
+    def _move_fish(self, mask: np.ndarray, source: np.ndarray, number_fish: np.ndarray, biggest_fish: bool,
+                   destination: np.ndarray) -> np.ndarray:
+        """
+        Метод для перемещения рыбы из одного бассейна в другой (или для продажи) в части повторений.
+        :param mask: Маска повторений, в которых перемещается рыба.
+        :param source: Номер бассейна, из которого убирается рыба, для каждого повторения.
+        :param number_fish: Количество убираемых рыб для каждого повторения.
+        :param biggest_fish: Если True, то убираются самые большие рыбы, иначе - самые маленькие.
+        :param destination: Номер бассейна, в который добавляется рыба, для каждого повторения.
+         -1 - рыба продается.
+        :return: Биомасса перемещенной рыбы в кг для каждого повторения.
+        """
+        moved_biomass: np.ndarray = np.zeros(len(mask))
+        rows: np.ndarray = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return moved_biomass
+        source = source[rows]
+        destination = destination[rows]
+        pool: np.ndarray = self._pool[rows]
+        mass: np.ndarray = self._mass[rows]
+
+        # Выберем нужное количество самых больших или самых маленьких рыб бассейна
+        in_pool: np.ndarray = pool == source[:, None]
+        key: np.ndarray = np.where(in_pool, -mass if biggest_fish else mass, np.inf)
+        order: np.ndarray = np.argsort(key, axis=1, kind='stable')
+        rank: np.ndarray = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(order.shape[1])[None, :], axis=1)
+        moved: np.ndarray = in_pool & (rank < number_fish[rows, None])
+
+        pool = np.where(moved, destination[:, None], pool)
+        self._pool[rows] = pool
+
+        # Обновим информацию о бассейнах
+        moved_biomass[rows] = np.where(moved, mass, 0.0).sum(axis=1) / 1000
+        moved_number: np.ndarray = moved.sum(axis=1)
+        self._biomass[rows, source] -= moved_biomass[rows]
+        self._number_fish[rows, source] -= moved_number
+        receiving: np.ndarray = destination >= 0
+        self._biomass[rows[receiving], destination[receiving]] += moved_biomass[rows][receiving]
+        self._number_fish[rows[receiving], destination[receiving]] += moved_number[receiving]
+        return moved_biomass
+
+    def add_fish(self, number_fish: int, average_mass: float,
+                 rng: np.random.Generator | list[np.random.Generator] | None = None, mac: np.ndarray | None = None):
+        """
+        Метод для добавления новой рыбы в каждое повторение: в первый пустой бассейн, а если пустых нет,
+         то в бассейн с наиболее близкой средней массой рыбы. Коэффициенты массонакопления новой рыбы
+         в каждом повторении свои.
+        :param number_fish: Количество новой рыбы.
+        :param average_mass: Масса новой рыбы.
+        :param rng: Генератор случайных чисел для коэффициентов массонакопления или список генераторов,
+         по одному на повторение (тогда повторение совпадает с отдельным запуском CWSD с тем же генератором).
+         Если None, то используется генератор с зерном из random (см. fish.random_macs).
+        :param mac: Готовые коэффициенты массонакопления (повторения × рыбы). Если указаны, то rng не нужен.
+        :return: Ничего.
+        """
+        replicates: int = self._pool.shape[0]
+        empty: np.ndarray = self._number_fish == 0
+        average_masses: np.ndarray = np.where(empty, 0.0, self._biomass / np.maximum(self._number_fish, 1) * 1000)
+        chosen_pool: np.ndarray = np.where(empty.any(axis=1), empty.argmax(axis=1),
+                                           np.abs(average_masses - average_mass).argmin(axis=1))
+
+        self._root = np.concatenate((self._root, np.full((replicates, number_fish), np.cbrt(average_mass))), axis=1)
+        if isinstance(rng, list):
+            mac = np.stack([random_macs(number_fish, replicate_rng) for replicate_rng in rng])
+        elif mac is None:
+            mac = random_macs(replicates * number_fish, rng).reshape(replicates, number_fish)
+        self._rate = np.concatenate((self._rate, mac / 3), axis=1)
+        self._pool = np.concatenate((self._pool, np.tile(chosen_pool[:, None], (1, number_fish))), axis=1)
+        self._update_info()
+        self._update_mass_indexes(np.ones(replicates, dtype=bool))
+
+    def _compact(self):
+        """
+        Метод для удаления проданной рыбы из массивов. В каждом повторении оставшаяся рыба сдвигается
+         в начало строки с сохранением порядка (поэтому выбор крайних рыб не меняется), и массивы
+         обрезаются до наибольшего количества оставшейся рыбы. Хвосты коротких строк заполняются
+         пустыми местами с номером бассейна -1. Сжатие выполняется, только если оно уменьшает массивы
+         хотя бы вдвое, поэтому его стоимость распределяется по продажам.
+        :return: Ничего.
+        """
+        alive: np.ndarray = self._pool >= 0
+        width: int = int(alive.sum(axis=1).max(initial=0))
+        if 2 * width > self._pool.shape[1]:
+            return
+        order: np.ndarray = np.argsort(~alive, axis=1, kind='stable')[:, :width]
+        kept: np.ndarray = np.take_along_axis(alive, order, axis=1)
+        self._root = np.where(kept, np.take_along_axis(self._root, order, axis=1), 0.0)
+        self._rate = np.where(kept, np.take_along_axis(self._rate, order, axis=1), 0.0)
+        self._mass = np.where(kept, np.take_along_axis(self._mass, order, axis=1), 0.0)
+        self._pool = np.take_along_axis(self._pool, order, axis=1)
+
+    def _retire(self, mask: np.ndarray, success: bool):
+        """
+        Метод для исключения повторений из расчета.
+        :param mask: Маска работающих повторений, которые нужно исключить.
+        :param success: Результат этих повторений.
+        :return: Ничего.
+        """
+        if not mask.any():
+            return
+        self.success[self._active[mask]] = success
+        self.finished[self._active[mask]] = True
+
+        kept: np.ndarray = ~mask
+        self._active = self._active[kept]
+        self._root = self._root[kept]
+        self._rate = self._rate[kept]
+        self._pool = self._pool[kept]
+        self._mass = self._mass[kept]
+        self._biomass = self._biomass[kept]
+        self._number_fish = self._number_fish[kept]
+        self.mass_indexes = self.mass_indexes[kept]
+        self._compact()
+
+    def daily_growth(self, min_biomass: float = 1.0):
+        """
+        Метод для проведения одних суток во всех работающих повторениях так же, как в CWSD.daily_growth.
+        :param min_biomass: Биомасса в кг, при которой повторение считается успешно завершенным.
+        :return: Ничего.
+        """
+        active: np.ndarray = self._active
+        replicates: int = len(active)
+        rows: np.ndarray = np.arange(replicates)
+
+        # Рост рыбы (проданная рыба до сжатия массивов тоже растет, но нигде не учитывается)
+        previous_biomass: np.ndarray = self._biomass
+        self._root = self._root + self._rate
+        self._update_info()
+        self.spent_feed[active] += ((self._biomass - previous_biomass) * self.feed_ratios).sum(axis=1)
+        self.days[active] += 1
+
+        # Продажа товарной рыбы
+        commercial_pool: np.ndarray = self._find_pool_with_mass_index(np.full(replicates, self.number_pools - 1))
+        commercial_pool = np.where(commercial_pool >= 0, commercial_pool, 0)
+        number_commercial_fish: np.ndarray = ((self._pool == commercial_pool[:, None]) &
+                                              (self._mass >= self.commercial_fish_mass)).sum(axis=1)
+        selling: np.ndarray = (number_commercial_fish >= self.min_package) | \
+            (number_commercial_fish == self._number_fish[rows, commercial_pool])
+        self.sold_biomass[active] += self._move_fish(selling, commercial_pool, number_commercial_fish, True,
+                                                     np.full(replicates, -1))
+        self._update_mass_indexes(selling)
+        if selling.any():
+            self._compact()
+
+        # Переполнение всего УЗВ
+        overflowed: np.ndarray = self._biomass.sum(axis=1) / (self.pool_area * self.number_pools) >= \
+            self.max_planting_density
+
+        # Распределение рыбы из переполненных бассейнов
+        for pool in range(self.number_pools):
+            separating: np.ndarray = ~overflowed & \
+                (self._biomass[:, pool] / self.pool_area >= self.max_planting_density)
+            if not separating.any():
+                continue
+            source: np.ndarray = np.full(replicates, pool)
+            number_moved: np.ndarray = (self._number_fish[:, pool] * 30.0 / 100 / 2).astype(int)
+            for shift, biggest_fish in ((-1, False), (1, True)):
+                neighbor: np.ndarray = self._find_pool_with_mass_index(self.mass_indexes[:, pool] + shift)
+                moving: np.ndarray = separating & (neighbor >= 0) & \
+                    (self._number_fish[rows, np.maximum(neighbor, 0)] > 0)
+                self._move_fish(moving, source, number_moved, biggest_fish, neighbor)
+            self._update_mass_indexes(separating)
+
+        finished: np.ndarray = ~overflowed & (self._biomass.sum(axis=1) <= min_biomass)
+        self._retire(overflowed, False)
+        self._retire(finished[~overflowed], True)
+
+    def run_until(self, min_biomass: float = 1.0, max_days: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Метод для работы всех повторений, пока в каждом биомасса не опустится до указанной или не
+         произойдет переполнение УЗВ.
+        :param min_biomass: Биомасса в кг, при которой работа повторения прекращается.
+        :param max_days: Наибольшее количество суток работы. Если None, то не ограничено.
+        :return: Словарь с массивами результатов всех повторений вида {'success': ..., 'days': ...,
+         'spent_feed': ..., 'sold_biomass': ...}. 'success' - True, если не было переполнения.
+        """
+        self._retire(self._biomass.sum(axis=1) <= min_biomass, True)
+
+        day: int = 0
+        while len(self._active) > 0 and (max_days is None or day < max_days):
+            self.daily_growth(min_biomass)
+            day += 1
+
+        return {'success': self.success.copy(), 'days': self.days.copy(),
+                'spent_feed': self.spent_feed.copy(), 'sold_biomass': self.sold_biomass.copy()}
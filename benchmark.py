@@ -0,0 +1,319 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import date, datetime
+from typing import Callable
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import Fish, create_list_fish
+from optimization import Optimization
+from pool import Pool
+from profit import Profit
+
+
+# Стандартное УЗВ, которое работает без переполнения: [[количество рыбы, масса], ...]
+numbers_and_mass: list[list[float | int]] = [[400, 200.0], [450, 150.0], [500, 100.0], [900, 50.0]]
+base_number_fish: int = sum(number_fish for number_fish, _ in numbers_and_mass)
+sizes: list[int] = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def get_scaled_cwsd(number_fish: int, empty_pools: int = 0) -> CWSD:
+    """
+    Функция для получения стандартного УЗВ, увеличенного так, чтобы в нем было примерно number_fish рыб.
+     Площадь бассейнов и минимальный пакет увеличиваются в том же отношении, поэтому рыба растет
+     и продается так же, как в стандартном УЗВ.
+    :param number_fish: Количество рыбы в УЗВ.
+    :param empty_pools: Сколько бассейнов с самой маленькой рыбой оставить пустыми.
+    :return: объект CWSD
+    """
+    scale: float = number_fish / base_number_fish
+    cwsd: CWSD = CWSD(
+        number_pools=len(numbers_and_mass),
+        pool_area=6.0 * scale,
+        max_planting_density=40.0,
+        commercial_fish_mass=450.0,
+        min_package=max(1, round(1000 * scale)),
+        start_date=date(2024, 1, 1)
+    )
+    for number, mass in numbers_and_mass[:len(numbers_and_mass) - empty_pools]:
+        cwsd.add_fish(create_list_fish(max(1, round(number * scale)), mass))
+    return cwsd
+
+
+def get_optimization(cwsd: CWSD) -> Optimization:
+    """
+    Функция для получения объекта Optimization с параметрами УЗВ.
+    :param cwsd: объект CWSD
+    :return: объект Optimization
+    """
+    return Optimization(cwsd.number_pools, cwsd.pool_area, cwsd.max_planting_density,
+                        cwsd.commercial_fish_mass, cwsd.min_package)
+
+
+def bench_fish_daily_growth(number_fish: int, attempts: int) -> Callable:
+    """
+    Суточный рост number_fish отдельных объектов Fish.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    fishes: list[Fish] = [Fish(100.0) for _ in range(number_fish)]
+    return lambda: [fish.daily_growth() for fish in fishes]
+
+
+def bench_pool_daily_growth(number_fish: int, attempts: int) -> Callable:
+    """
+    100 суток роста бассейна с number_fish рыбами. Рост бассейна считается по суммам степеней корней масс
+     и не зависит от количества рыбы, поэтому этот замер показывает накладные расходы вызова
+     (работу с каждой рыбой замеряет bench_pool_sale_grading).
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(number_fish, 100.0))
+
+    def run():
+        for _ in range(100):
+            pool.daily_growth()
+    return run
+
+
+def bench_pool_add_remove(number_fish: int, attempts: int) -> Callable:
+    """
+    10 циклов добавления 10% рыбы, удаления самых больших и маленьких рыб и суток роста.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(number_fish, 100.0))
+    pool.grow(10)
+    new_fish = create_list_fish(number_fish // 10, 120.0)
+
+    def run():
+        for _ in range(10):
+            pool.add_new_fishes(new_fish)
+            pool.remove_fish(number_fish // 20)
+            pool.remove_fish(number_fish // 20, biggest_fish=False)
+            pool.daily_growth()
+    return run
+
+
+def bench_pool_sale_grading(number_fish: int, attempts: int) -> Callable:
+    """
+    10 циклов работы с каждой рыбой бассейна, как при продаже и распределении рыбы: подсчет товарной рыбы,
+     продажа самых больших рыб и перемещение самых маленьких и самых больших рыб в соседние бассейны.
+     Бассейн подрощен и не отсортирован: в нем две партии рыбы разной массы, добавленные в разное время.
+     В отличие от Pool.daily_growth, время этих операций растет с количеством рыбы.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(number_fish // 2, 100.0))
+    pool.grow(30)
+    pool.add_new_fishes(create_list_fish(number_fish - number_fish // 2, 150.0))
+    pool.grow(10)
+    previous_pool: Pool = Pool(6.0, 1)
+    next_pool: Pool = Pool(6.0, 2)
+    number_moved: int = max(1, number_fish // 50)
+
+    def run():
+        for cycle in range(10):
+            pool.count_fish_not_lighter(200.0 + 10 * cycle)
+            pool.remove_fish(number_moved)
+            pool.transfer_fish(previous_pool, number_moved, biggest_fish=False)
+            pool.transfer_fish(next_pool, number_moved)
+            pool.daily_growth()
+    return run
+
+
+def bench_cwsd_cycle(number_fish: int, attempts: int) -> Callable:
+    """
+    200 суток работы УЗВ с number_fish рыбами (продажи и распределение рыбы).
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    cwsd: CWSD = get_scaled_cwsd(number_fish)
+
+    def run():
+        for _ in range(200):
+            if cwsd.daily_growth(print_info=False) is None:
+                break
+    return run
+
+
+def bench_growing_time(number_fish: int, attempts: int) -> Callable:
+    """
+    Расчет длительности выращивания по number_fish рыбам.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    optimization: Optimization = get_optimization(get_scaled_cwsd(number_fish))
+    return lambda: optimization.calculate_growing_time(50.0, number_fish)
+
+
+def bench_max_density(number_fish: int, attempts: int) -> Callable:
+    """
+    Поиск количества рыбы для максимальной плотности делением пополам до number_fish рыб.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    optimization: Optimization = get_optimization(get_scaled_cwsd(number_fish))
+    step: int = max(1, number_fish // 500)
+    return lambda: optimization.calculate_number_fish_for_max_density(83, 50.0, step, step, number_fish,
+                                                                      mode='bisection')
+
+
+def bench_optimal_new_fish(number_fish: int, attempts: int) -> Callable:
+    """
+    Поиск количества новой рыбы в пустой бассейн УЗВ с number_fish рыбами.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    cwsd: CWSD = get_scaled_cwsd(number_fish, empty_pools=1)
+    step: int = max(1, number_fish // 20)
+    return lambda: Optimization.calculate_optimal_number_new_fish_in_current_cwsd(
+        cwsd, 50.0, step, step, number_fish, attempts=attempts, stopping='deterministic')
+
+
+def bench_profit(number_fish: int, attempts: int) -> Callable:
+    """
+    30 суток расчета прибыли УЗВ с number_fish рыбами и одним пустым бассейном.
+    :param number_fish: Количество рыбы.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Замеряемая функция.
+    """
+    cwsd: CWSD = get_scaled_cwsd(number_fish, empty_pools=1)
+    step: int = max(1, number_fish // 20)
+    profit: Profit = Profit(cwsd, 100.0, [[50.0, 10]] * cwsd.number_pools, 850.0, date(2024, 1, 1), 1e6,
+                            search=(step, step, number_fish), attempts=attempts)
+    return lambda: profit.work_cwsd(30)
+
+
+# Название: (функция подготовки, наибольшее количество рыбы по умолчанию)
+benchmarks: dict[str, tuple[Callable, int | None]] = {
+    'Fish.daily_growth': (bench_fish_daily_growth, None),
+    'Pool.daily_growth x100': (bench_pool_daily_growth, None),
+    'Pool.add_new_fishes/remove_fish x10': (bench_pool_add_remove, None),
+    'Pool.count_fish_not_lighter/remove_fish/transfer_fish x10': (bench_pool_sale_grading, None),
+    'CWSD.daily_growth x200': (bench_cwsd_cycle, None),
+    'Optimization.calculate_growing_time': (bench_growing_time, None),
+    'Optimization.calculate_number_fish_for_max_density': (bench_max_density, None),
+    'Optimization.calculate_optimal_number_new_fish_in_current_cwsd': (bench_optimal_new_fish, 100_000),
+    'Profit.work_cwsd x30': (bench_profit, 10_000),
+}
+
+
+def run_benchmark(setup: Callable, number_fish: int, repeat: int, seed: int, attempts: int) -> list[float]:
+    """
+    Функция для замера времени работы. Подготовка не замеряется и повторяется перед каждым замером
+     с тем же зерном генераторов случайных чисел.
+    :param setup: Функция подготовки, которая возвращает замеряемую функцию.
+    :param number_fish: Количество рыбы.
+    :param repeat: Количество замеров.
+    :param seed: Зерно генераторов случайных чисел.
+    :param attempts: Количество попыток для оптимизации.
+    :return: Список времен в секундах.
+    """
+    times: list[float] = list()
+    for _ in range(repeat):
+        random.seed(seed)
+        np.random.seed(seed)
+        run: Callable = setup(number_fish, attempts)
+        start: float = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> int:
+    """
+    Функция для сравнения результатов с сохраненными ранее.
+    :param results: Новые результаты.
+    :param baseline_path: Путь к файлу JSON с прошлыми результатами.
+    :param threshold: Во сколько раз должно вырасти время, чтобы считать это замедлением.
+    :return: Количество замедлений.
+    """
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline: dict = {(result['benchmark'], result['number_fish']): result
+                          for result in json.load(file)['results']}
+
+    regressions: int = 0
+    for result in results:
+        old: dict | None = baseline.get((result['benchmark'], result['number_fish']))
+        if result['skipped'] or old is None or old['skipped']:
+            continue
+        ratio: float = result['min'] / old['min']
+        mark: str = ''
+        if ratio > threshold:
+            regressions += 1
+            mark = '  <- замедление'
+        print(f"{result['benchmark']} [{result['number_fish']}]: {old['min']:.4f} -> {result['min']:.4f} с"
+              f" (x{ratio:.2f}){mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замеры скорости рыбы, бассейна, УЗВ, оптимизации и расчета прибыли.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=sizes, help='Количества рыбы.')
+    parser.add_argument('--only', nargs='+', default=None, help='Названия замеров (подстроки).')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество замеров.')
+    parser.add_argument('--seed', type=int, default=12345, help='Зерно генераторов случайных чисел.')
+    parser.add_argument('--attempts', type=int, default=10, help='Количество попыток для оптимизации.')
+    parser.add_argument('--no-limits', action='store_true',
+                        help='Запускать медленные замеры на всех количествах рыбы.')
+    parser.add_argument('--output', default='benchmark_results.json', help='Файл JSON для результатов.')
+    parser.add_argument('--compare', default=None, help='Файл JSON с прошлыми результатами для сравнения.')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Во сколько раз должно вырасти время, чтобы считать это замедлением.')
+    args = parser.parse_args()
+
+    results: list[dict] = list()
+    for name, (setup, limit) in benchmarks.items():
+        if args.only is not None and not any(part in name for part in args.only):
+            continue
+        for number_fish in args.sizes:
+            result: dict = {'benchmark': name, 'number_fish': number_fish, 'skipped': False}
+            if limit is not None and number_fish > limit and not args.no_limits:
+                result['skipped'] = True
+                print(f'{name} [{number_fish}]: пропущен (больше {limit} рыб, см. --no-limits)')
+            else:
+                times: list[float] = run_benchmark(setup, number_fish, args.repeat, args.seed, args.attempts)
+                result.update({'times': times, 'min': min(times), 'median': statistics.median(times),
+                               'mean': statistics.fmean(times)})
+                print(f'{name} [{number_fish}]: {min(times):.4f} с')
+            results.append(result)
+
+    report: dict = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'attempts': args.attempts,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f'Результаты сохранены в {args.output}')
+
+    if args.compare is not None:
+        regressions: int = compare(results, args.compare, args.threshold)
+        if regressions:
+            raise SystemExit(f'Замедлений: {regressions}')
+
+
+if __name__ == '__main__':
+    main()
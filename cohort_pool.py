@@ -0,0 +1,291 @@
+import numpy as np
+
+from backend import Backend
+from fish import ListFish, MassStatistics
+from pool import Pool
+
+
+def _weighted_power_sums(roots: np.ndarray, rates: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Функция для расчета сумм, через которые выражается биомасса группы когорт (см. backend.Backend.power_sums).
+    :param roots: Кубические корни из масс когорт.
+    :param rates: Суточные приросты кубических корней.
+    :param counts: Количество рыб в каждой когорте.
+    :return: Массив [Σc*a^3, Σc*a^2*b, Σc*a*b^2, Σc*b^3].
+    """
+    return np.array([(counts * roots ** 3).sum(), (counts * roots ** 2 * rates).sum(),
+                     (counts * roots * rates ** 2).sum(), (counts * rates ** 3).sum()])
+
+
+class CohortListFish(ListFish):
+    """
+    Класс для списка рыб, сгруппированных в когорты: у каждой когорты есть масса, коэффициент
+     массонакопления и количество рыб (не обязательно целое).
+    """
+    def __init__(self):
+        super().__init__()
+        self.counts: np.ndarray = np.empty(0)
+
+    @classmethod
+    def from_cohorts(cls, mass: np.ndarray, mac: np.ndarray, counts: np.ndarray) -> 'CohortListFish':
+        """
+        Метод для создания списка когорт из массивов.
+        :param mass: Массив масс когорт.
+        :param mac: Массив коэффициентов массонакопления.
+        :param counts: Массив количеств рыб.
+        :return: Список когорт.
+        """
+        list_fish: CohortListFish = cls.from_arrays(mass, mac)
+        list_fish.counts = np.asarray(counts, dtype=float)
+        return list_fish
+
+    def get_number_fish(self) -> int:
+        """
+        Метод для получения количества рыб во всех когортах.
+        :return: Количество рыб
+        """
+        return int(round(float(self.counts.sum())))
+
+    def statistics(self, bins: np.ndarray | None = None) -> MassStatistics:
+        """
+        Метод для получения статистики масс с учетом количеств рыб в когортах.
+        :param bins: Границы интервалов масс для гистограммы. Если None, то гистограмма не считается.
+        :return: Статистика масс.
+        """
+        present: np.ndarray = self.counts > 0
+        if not present.any():
+            return MassStatistics(bins=bins, histogram=None if bins is None else np.zeros(len(bins) - 1))
+        return MassStatistics(self.get_number_fish(), float((self.mass * self.counts).sum()) / 1000,
+                              float(self.mass[present].min()), float(self.mass[present].max()), bins,
+                              None if bins is None else np.histogram(self.mass, bins, weights=self.counts)[0])
+
+
+class CohortPool(Pool):
+    """
+    Бассейн, в котором рыба хранится не поштучно, а когортами - клетками двумерной гистограммы
+     (кубический корень из массы × суточный прирост корня). В каждой когорте хранится количество рыб
+     (не обязательно целое) и средние по ее рыбам корень и прирост. Корень каждой когорты растет линейно,
+     поэтому суточный рост, как и у Pool, - это сдвиг возраста, а биомасса - многочлен от него.
+     Память и время работы зависят от количества занятых клеток, а не от количества рыб.
+    При добавлении рыбы по клеткам шириной root_bin (в г^(1/3)) и rate_bin раскладываются только новые рыбы:
+     они сливаются с когортой бассейна из той же клетки или образуют новую когорту. Удаление самых больших
+     или самых маленьких рыб забирает целые когорты с края и часть крайней когорты.
+    Погрешность относительно поштучного бассейна Pool. Пусть в когорту было k добавлений (считая то, которое
+     ее создало), и с первого из них прошло t суток. Каждое слияние сдвигает корень когорты не больше чем
+     на root_bin, а прирост - не больше чем на rate_bin, поэтому корень массы каждой рыбы отличается от корня
+     ее когорты не больше чем на h = k * (root_bin + rate_bin * t) (у когорт, перемещенных из другого бассейна,
+     к этому добавляется их погрешность в том бассейне). Масса отдельной рыбы отличается не больше чем
+     в (1 + h / r)^3 раз, где r - корень из массы рыбы. Средние корень и прирост когорты совпадают со средними
+     ее рыб, поэтому ошибка биомассы второго порядка: не больше 3(h/r)^2 + (h/r)^3 от биомассы. Для значений
+     по умолчанию, одного добавления и рыбы от 50 г (r > 3.6) через 100 суток h = 0.06, ошибка массы отдельной
+     рыбы - до 5%, ошибка биомассы - до 0.1%. Выбор удаляемой рыбы по когортам может сдвинуть
+     продажу или распределение рыбы на сутки относительно поштучного расчета.
+    """
+    def __init__(self, area: float, mass_index: int, feed_ratio: float = 1.5, root_bin: float = 0.02,
+                 rate_bin: float = 0.0004, backend: str | Backend | None = None):
+        super().__init__(area, mass_index, feed_ratio, backend)
+        self.root_bin: float = root_bin
+        self.rate_bin: float = rate_bin
+        self._counts: np.ndarray = np.empty(0)
+
+    @property
+    def fishes(self) -> CohortListFish:
+        """
+        Когорты рыб в бассейне с массами для текущего возраста.
+        :return: Список когорт.
+        """
+        if self._fishes is None:
+            self._fishes = CohortListFish.from_cohorts((self._roots + self._rates * self._age) ** 3,
+                                                       self._rates * 3, self._counts)
+        return self._fishes
+
+    @property
+    def number_cohorts(self) -> int:
+        """
+        Количество когорт в бассейне.
+        :return: Количество когорт.
+        """
+        return len(self._counts)
+
+    def _set_cohorts(self, roots: np.ndarray, rates: np.ndarray, counts: np.ndarray):
+        """
+        Метод для замены когорт бассейна. Пустые когорты отбрасываются, суммы пересчитываются.
+        :param roots: Корни когорт.
+        :param rates: Приросты корней.
+        :param counts: Количества рыб.
+        :return: Ничего.
+        """
+        present: np.ndarray = counts > 1e-9
+        self._roots, self._rates, self._counts = roots[present], rates[present], counts[present]
+        self._sums = _weighted_power_sums(self._roots, self._rates, self._counts)
+        self._sums_error = np.zeros(4)
+        self._sorted_age = None
+        self._fishes = None
+        self._crossing = dict()
+        self._statistics = None
+        self._envelopes = (None, None)
+        self.number_fish = int(round(float(self._counts.sum())))
+        self._update_info()
+
+    def add_new_fishes(self, new_fish: ListFish):
+        """
+        Метод для добавления новых рыбок в бассейн. По клеткам гистограммы раскладываются только новые рыбы:
+         рыбы одной клетки сливаются в когорту бассейна из той же клетки, а если такой нет - образуют новую
+         когорту. Остальные когорты бассейна не меняются.
+        :param new_fish: Список новых рыбок (или когорт).
+        :return: Ничего.
+        """
+        new_counts: np.ndarray = new_fish.counts if isinstance(new_fish, CohortListFish) \
+            else np.ones(new_fish.get_number_fish())
+        new_roots: np.ndarray = np.cbrt(new_fish.mass)
+        new_rates: np.ndarray = new_fish.mac / 3
+
+        # Новые рыбы одной клетки собираются в одну когорту
+        new_cells: np.ndarray = np.stack((np.floor(new_roots / self.root_bin), np.floor(new_rates / self.rate_bin)),
+                                         axis=1)
+        new_cells, cohort = np.unique(new_cells, axis=0, return_inverse=True)
+        cohort = cohort.ravel()
+        added_counts: np.ndarray = np.bincount(cohort, weights=new_counts)
+        added_roots: np.ndarray = np.bincount(cohort, weights=new_counts * new_roots) / added_counts
+        added_rates: np.ndarray = np.bincount(cohort, weights=new_counts * new_rates) / added_counts
+
+        # Когорта бассейна из той же клетки (первая, если их несколько)
+        roots: np.ndarray = self._roots + self._rates * self._age
+        cells: np.ndarray = np.stack((np.floor(roots / self.root_bin), np.floor(self._rates / self.rate_bin)), axis=1)
+        _, first, group = np.unique(np.concatenate((cells, new_cells)), axis=0, return_index=True,
+                                    return_inverse=True)
+        target: np.ndarray = first[group.ravel()[len(cells):]]
+        merged: np.ndarray = target < len(cells)
+        target = target[merged]
+
+        rates: np.ndarray = self._rates.copy()
+        counts: np.ndarray = self._counts.copy()
+        total: np.ndarray = counts[target] + added_counts[merged]
+        roots[target] = (counts[target] * roots[target] + added_counts[merged] * added_roots[merged]) / total
+        rates[target] = (counts[target] * rates[target] + added_counts[merged] * added_rates[merged]) / total
+        counts[target] = total
+        self._age = 0
+        self._set_cohorts(np.concatenate((roots, added_roots[~merged])), np.concatenate((rates, added_rates[~merged])),
+                          np.concatenate((counts, added_counts[~merged])))
+
+    def remove_fish(self, number_fish: int, biggest_fish: bool = True) -> CohortListFish:
+        """
+        Метод для удаления рыбы из бассейна: забираются крайние когорты и часть следующей когорты.
+        :param number_fish: Количество удаляемых рыб.
+        :param biggest_fish: Если True, то удаляет самые большие рыбы,
+         иначе - самые маленькие.
+        :return: Список удаленных когорт (от крайней по массе когорты к середине)
+        """
+        if number_fish > self.number_fish:
+            print('Попытка удалить рыбы больше чем есть в бассейне!')
+            return None
+
+        roots: np.ndarray = self._roots + self._rates * self._age
+        order: np.ndarray = np.argsort(roots, kind='stable')
+        if biggest_fish:
+            order = order[::-1]
+
+        # Сколько рыб забрать из каждой когорты по порядку от края
+        taken_before: np.ndarray = np.cumsum(self._counts[order]) - self._counts[order]
+        taken: np.ndarray = np.clip(number_fish - taken_before, 0.0, self._counts[order])
+        removed: np.ndarray = taken > 0
+        removed_fish: CohortListFish = CohortListFish.from_cohorts(
+            roots[order][removed] ** 3, self._rates[order][removed] * 3, taken[removed])
+
+        counts: np.ndarray = self._counts.copy()
+        counts[order] -= taken
+        self._set_cohorts(self._roots, self._rates, counts)
+        return removed_fish
+
+    def transfer_fish(self, destination: Pool, number_fish: int, biggest_fish: bool = True) -> int:
+        """
+        Метод для перемещения крайних когорт (и части следующей когорты) в другой бассейн.
+        :param destination: Бассейн, в который перемещается рыба.
+        :param number_fish: Количество перемещаемых рыб.
+        :param biggest_fish: Если True, то перемещаются самые большие рыбы, иначе - самые маленькие.
+        :return: Количество перемещенных рыб.
+        """
+        removed_fish: CohortListFish | None = self.remove_fish(number_fish, biggest_fish)
+        if removed_fish is None:
+            return 0
+        destination.add_new_fishes(removed_fish)
+        return number_fish
+
+    def _crossing_counts(self, mass: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод для получения отсортированных возрастов, в которые когорты достигают указанной массы,
+         и количества рыб, достигших ее к каждому из этих возрастов.
+        :param mass: Масса рыбы в г.
+        :return: Массив возрастов и массив накопленных количеств рыб.
+        """
+        ages, order = self._crossing_ages(mass)
+        return ages, np.cumsum(self._counts[order])
+
+    def _count_fish_not_lighter_at(self, mass: float, age: int) -> int:
+        """
+        Метод для подсчета рыб не легче указанной массы в указанном возрасте бассейна.
+         Дробная часть отбрасывается.
+        :param mass: Масса рыбы в г.
+        :param age: Возраст бассейна.
+        :return: Количество рыб.
+        """
+        ages, cumulative = self._crossing_counts(mass)
+        position: int = int(np.searchsorted(ages, age, side='right'))
+        if position == 0:
+            return 0
+        return int(np.floor(cumulative[position - 1] + 1e-9))
+
+    def days_to_commercial(self, commercial_fish_mass: float, min_package: int, max_days: int) -> int | None:
+        """
+        Метод для расчета количества суток, через которое в бассейне вырастет пакет товарной рыбы
+         (либо вырастет вся рыба).
+        :param commercial_fish_mass: Масса товарной рыбы в г.
+        :param min_package: Минимальный размер пакета на продажу.
+        :param max_days: Наибольшее количество суток для поиска.
+        :return: Количество суток (от 1 до max_days). Если пакет не вырастет, то None.
+        """
+        if self.is_empty():
+            return None
+
+        package: int = min(max(min_package, 1), self.number_fish)
+        ages, cumulative = self._crossing_counts(commercial_fish_mass)
+        position: int = min(int(np.searchsorted(cumulative, package - 1e-9)), len(ages) - 1)
+        if ages[position] - self._age > max_days + 1:
+            return None
+
+        # -inf: рыба не растет, но уже не легче товарной массы, пакет готов сразу
+        days: int = max(int(np.ceil(ages[position] - self._age)), 1) if np.isfinite(ages[position]) else 1
+        while days > 1 and self._count_fish_not_lighter_at(commercial_fish_mass, self._age + days - 1) >= package:
+            days -= 1
+        while self._count_fish_not_lighter_at(commercial_fish_mass, self._age + days) < package:
+            days += 1
+        if days > max_days:
+            return None
+        return days
+
+    def get_state(self) -> tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Метод для получения состояния бассейна для сохранения на диск (см. Pool.get_state).
+         Количества рыб в когортах и ширины клеток сохраняются в словаре.
+        :return: Массив корней, массив приростов и словарь с остальными параметрами бассейна.
+        """
+        roots, rates, info = super().get_state()
+        info.update({'counts': self._counts.tolist(), 'root_bin': self.root_bin, 'rate_bin': self.rate_bin})
+        return roots, rates, info
+
+    @classmethod
+    def from_state(cls, roots: np.ndarray, rates: np.ndarray, info: dict,
+                   backend: str | Backend | None = None) -> 'CohortPool':
+        """
+        Метод для восстановления бассейна из сохраненного состояния (см. Pool.from_state).
+        :param roots: Массив корней.
+        :param rates: Массив приростов корней.
+        :param info: Словарь с остальными параметрами бассейна.
+        :param backend: Вычислитель (см. backend.get_backend).
+        :return: Бассейн.
+        """
+        pool: CohortPool = cls(info['area'], info['mass_index'], info['feed_ratio'], info['root_bin'],
+                               info['rate_bin'], backend)
+        pool._age = info['age']
+        pool._set_cohorts(np.asarray(roots), np.asarray(rates), np.array(info['counts']))
+        return pool
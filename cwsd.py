@@ -1,12 +1,27 @@
+import json
+import os
+from copy import copy
 from datetime import date
-from fish import Fish, ListFish
+from time import perf_counter
+
+import numpy as np
+
+from backend import Backend, get_backend
+from cohort_pool import CohortPool
+from fish import ListFish
+from observer import Event, Observer, PrintObserver
 from pool import Pool
 
 
+# Наблюдатель, через которого печатаются события при print_info=True
+_printer: PrintObserver = PrintObserver()
+
+
 class CWSD:
     def __init__(self, number_pools: int, pool_area: float,
                  max_planting_density: float, commercial_fish_mass: float,
-                 min_package: int, start_date: date):
+                 min_package: int, start_date: date, pool_mode: str = 'fish',
+                 rng: np.random.Generator | None = None, backend: str | Backend | None = None):
         """
         Метод __init__.
         :param number_pools: Количество бассейнов.
@@ -14,6 +29,12 @@ class CWSD:
         :param max_planting_density: Максимальная плотность посадки рыбы в кг/м^2.
         :param commercial_fish_mass: Масса товарной рыбы в г.
         :param min_package: Минимальный размер пакета на продажу.
+        :param pool_mode: Способ хранения рыбы в бассейнах: 'fish' - поштучно (Pool),
+         'cohort' - когортами двумерной гистограммы (CohortPool, см. там же погрешность).
+        :param rng: Генератор случайных чисел для новой рыбы этого УЗВ (например, в Profit).
+         Если None, то используется генератор с зерном из random (см. fish.random_macs).
+        :param backend: Вычислитель для работы с рыбой бассейнов: 'python', 'numpy', 'numba' или None -
+         самый быстрый из доступных (см. backend.get_backend).
         """
         self.number_pools: int = number_pools
         self.pool_area: float = pool_area
@@ -24,31 +45,191 @@ class CWSD:
 
         self.max_planting_density: float = max_planting_density
 
+        if pool_mode not in ('fish', 'cohort'):
+            raise ValueError(f'Неизвестный способ хранения рыбы: {pool_mode}')
+        self.pool_mode: str = pool_mode
+        self.backend: Backend = get_backend(backend)
+
         self.pools: list[Pool] = list()
         for number in range(number_pools):
-            pool: Pool = Pool(pool_area, number)
+            pool: Pool = Pool(pool_area, number, backend=self.backend) if pool_mode == 'fish' \
+                else CohortPool(pool_area, number, backend=self.backend)
             self.pools.append(pool)
+        # Номера бассейнов в порядке возрастания массового индекса
+        self._ranking: list[int] = list(range(number_pools))
 
         self.biomass: float = 0.0
         self.days: int = 0
         self.spent_feed: float = 0.0
         self.sold_biomass: float = 0.0
+        self.rng: np.random.Generator | None = rng
+
+        self.observers: list[Observer] = list()
+        self._sorts: int = 0  # количество сортировок массовых индексов
+        self._phase_sorts: int = 0  # количество сортировок к началу текущего этапа
+
+    def fork(self) -> 'CWSD':
+        """
+        Метод для быстрого копирования УЗВ, например, для пробных запусков. Копируются только бассейны,
+         а массивы рыб используются совместно с исходным УЗВ до первого изменения рыбы в бассейне.
+         Время копирования пропорционально количеству бассейнов, а не количеству рыб.
+         Копия получает собственный дочерний генератор случайных чисел, независимый от генератора исходного УЗВ.
+        :return: Копия УЗВ.
+        """
+        forked_cwsd: CWSD = copy(self)
+        forked_cwsd.pools = [pool.copy() for pool in self.pools]
+        forked_cwsd._ranking = self._ranking.copy()
+        if self.rng is not None:
+            forked_cwsd.rng = self.rng.spawn(1)[0]
+        # События пробных запусков не относятся к исходному УЗВ
+        forked_cwsd.observers = list()
+        return forked_cwsd
+
+    def save(self, path: str):
+        """
+        Метод для сохранения состояния УЗВ в папку path. Рыба всех бассейнов хранится в двух непрерывных
+         массивах roots.npy и rates.npy (кубические корни масс и их суточные приросты, см. Pool.get_state),
+         параметры и счетчики УЗВ и бассейнов, а также состояние генератора случайных чисел - в cwsd.json.
+         Наблюдатели не сохраняются.
+        :param path: Путь к папке.
+        :return: Ничего.
+        """
+        os.makedirs(path, exist_ok=True)
+        states: list[tuple[np.ndarray, np.ndarray, dict]] = [pool.get_state() for pool in self.pools]
+        np.save(os.path.join(path, 'roots.npy'), np.concatenate([roots for roots, _, _ in states]))
+        np.save(os.path.join(path, 'rates.npy'), np.concatenate([rates for _, rates, _ in states]))
+
+        pools: list[dict] = list()
+        offset: int = 0
+        for roots, _, info in states:
+            pools.append({'offset': offset, 'size': len(roots), **info})
+            offset += len(roots)
+        state: dict = {'number_pools': self.number_pools, 'pool_area': self.pool_area,
+                       'max_planting_density': self.max_planting_density,
+                       'commercial_fish_mass': self.commercial_fish_mass, 'min_package': self.min_package,
+                       'start_date': self.start_date.isoformat(), 'pool_mode': self.pool_mode,
+                       'biomass': self.biomass, 'days': self.days,
+                       'spent_feed': self.spent_feed, 'sold_biomass': self.sold_biomass,
+                       'ranking': self._ranking, 'pools': pools,
+                       'rng': self._rng_state()}
+        with open(os.path.join(path, 'cwsd.json'), 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+
+    def _rng_state(self) -> dict | None:
+        """
+        Метод для получения состояния генератора случайных чисел для сохранения в JSON. Кроме состояния
+         генератора сохраняется его последовательность зерен, чтобы дочерние генераторы после загрузки
+         были теми же.
+        :return: Словарь {'state': ..., 'seed_sequence': ...} или None, если генератора нет.
+        """
+        if self.rng is None:
+            return None
+        seed_sequence: np.random.SeedSequence = self.rng.bit_generator.seed_seq
+        return {'state': self.rng.bit_generator.state,
+                'seed_sequence': {'entropy': seed_sequence.entropy, 'spawn_key': list(seed_sequence.spawn_key),
+                                  'n_children_spawned': seed_sequence.n_children_spawned}}
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, backend: str | Backend | None = None) -> 'CWSD':
+        """
+        Метод для загрузки УЗВ, сохраненного методом save.
+        :param path: Путь к папке.
+        :param mmap: Если True, то массивы рыб отображаются в память и читаются с диска только
+         при обращении к ним. Бассейны используют срезы этих массивов без копирования.
+        :param backend: Вычислитель загруженного УЗВ (вычислитель не сохраняется, так как зависит от машины).
+        :return: УЗВ.
+        """
+        with open(os.path.join(path, 'cwsd.json'), encoding='utf-8') as file:
+            state: dict = json.load(file)
+        mmap_mode: str | None = 'r' if mmap else None
+        roots: np.ndarray = np.load(os.path.join(path, 'roots.npy'), mmap_mode=mmap_mode)
+        rates: np.ndarray = np.load(os.path.join(path, 'rates.npy'), mmap_mode=mmap_mode)
+
+        cwsd: CWSD = cls(state['number_pools'], state['pool_area'], state['max_planting_density'],
+                         state['commercial_fish_mass'], state['min_package'],
+                         date.fromisoformat(state['start_date']), state.get('pool_mode', 'fish'), backend=backend)
+        pool_class: type[Pool] = Pool if cwsd.pool_mode == 'fish' else CohortPool
+        for number, info in enumerate(state['pools']):
+            fish: slice = slice(info['offset'], info['offset'] + info['size'])
+            cwsd.pools[number] = pool_class.from_state(roots[fish], rates[fish], info, cwsd.backend)
+        cwsd._ranking = state['ranking']
+        cwsd.biomass = state['biomass']
+        cwsd.days = state['days']
+        cwsd.spent_feed = state['spent_feed']
+        cwsd.sold_biomass = state['sold_biomass']
+        if state.get('rng') is not None:
+            seed_sequence: np.random.SeedSequence = np.random.SeedSequence(**state['rng']['seed_sequence'])
+            bit_generator: type = getattr(np.random, state['rng']['state']['bit_generator'])
+            cwsd.rng = np.random.Generator(bit_generator(seed_sequence))
+            cwsd.rng.bit_generator.state = state['rng']['state']
+        return cwsd
+
+    def add_observer(self, observer: Observer):
+        """
+        Метод для подключения наблюдателя, который будет получать события УЗВ.
+        :param observer: Наблюдатель.
+        :return: Ничего.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Observer):
+        """
+        Метод для отключения наблюдателя.
+        :param observer: Наблюдатель.
+        :return: Ничего.
+        """
+        self.observers.remove(observer)
+
+    def _emit(self, kind: str, print_info: bool = False, **data):
+        """
+        Метод для отправки события наблюдателям. Если наблюдателей нет и печатать не нужно,
+         то событие даже не создается.
+        :param kind: Вид события (см. observer.Event).
+        :param print_info: Показывает, нужно ли напечатать событие.
+        :param data: Данные события.
+        :return: Ничего.
+        """
+        if not self.observers and not print_info:
+            return
+        event: Event = Event(kind, self.days, data)
+        for observer in self.observers:
+            observer.notify(event)
+        if print_info:
+            _printer.notify(event)
+
+    def _finish_phase(self, name: str, start: float, fish_days: int = 0) -> float:
+        """
+        Метод для отправки наблюдателям времени работы этапа суток.
+        :param name: Название этапа.
+        :param start: Время начала этапа по perf_counter.
+        :param fish_days: Количество рыбо-суток роста за этап.
+        :return: Время окончания этапа (начала следующего).
+        """
+        now: float = perf_counter()
+        self._emit('phase', name=name, seconds=now - start, fish_days=fish_days,
+                   sorts=self._sorts - self._phase_sorts)
+        self._phase_sorts = self._sorts
+        return now
 
     def _update_mass_indexes(self):
         """
         Метод для обновления массовых индексов бассейнов. Они выставляются по
-         возрастанию средней массы рыбы.
+         возрастанию средней массы рыбы, при равных средних массах - по порядку бассейнов.
+         Между обновлениями растет рыба во всех бассейнах, поэтому средние массы читаются для всех
+         бассейнов. Пары (средняя масса, номер) сортируются в прежнем порядке self._ranking, который
+         между обновлениями меняется мало, поэтому сортировка почти линейна. Массовые индексы
+         переписываются только у бассейнов, место которых изменилось.
         :return: Ничего
         """
-        average_masses: list[float] = [pool.average_mass for pool in self.pools]
-        average_masses.sort()
+        ranked: list[tuple[float, int]] = sorted([(self.pools[number].average_mass, number)
+                                                  for number in self._ranking])
+        self._sorts += 1
 
-        # Присвоим бассейнам в зависимости от средней массы массовый индекс
-        for pool in self.pools:
-            for number in range(len(average_masses)):
-                if pool.average_mass == average_masses[number]:
-                    pool.mass_index = number
-                    break
+        # Присвоим новый массовый индекс бассейнам, которые сменили место
+        for mass_index, (_, number) in enumerate(ranked):
+            if self._ranking[mass_index] != number:
+                self._ranking[mass_index] = number
+                self.pools[number].mass_index = mass_index
 
     def add_fish(self, fishes: ListFish) -> bool:
         """
@@ -67,6 +248,8 @@ class CWSD:
             empty_pool.add_new_fishes(fishes)
             self.biomass += empty_pool.biomass
             self._update_mass_indexes()
+            self._emit('stocking', pool=empty_pool.mass_index, number_fish=fishes.get_number_fish(),
+                       biomass=empty_pool.biomass, empty_pool=True)
             return True
         else:
             return False
@@ -90,9 +273,9 @@ class CWSD:
                 min_delta_mass = delta_mass
                 chosen_pool = pool
 
-        # Если нужно, напечатаем в какой бассейн добавили рыбу
-        if print_info:
-            print(f'Рыбу добавили в бассейн с массовым индексом {chosen_pool.mass_index}')
+        # Сообщим, в какой бассейн добавили рыбу
+        self._emit('stocking', print_info, pool=chosen_pool.mass_index, number_fish=list_fish.get_number_fish(),
+                   biomass=list_fish.get_biomass(), empty_pool=False)
 
         # Добавим в найденный бассейн новую рыбу
         chosen_pool.add_new_fishes(list_fish)
@@ -100,25 +283,26 @@ class CWSD:
         self.biomass += list_fish.get_biomass()
         self._update_mass_indexes()
 
+    def _find_commercial_pool(self) -> Pool:
+        """
+        Метод для поиска товарного бассейна (с наибольшим массовым индексом).
+        :return: Товарный бассейн.
+        """
+        commercial_pool: Pool | None = self._find_pool_with_mass_index(self.number_pools - 1)
+        if commercial_pool is None:
+            commercial_pool = self.pools[0]
+        return commercial_pool
+
     def sell_fish(self) -> ListFish | None:
         """
         Если есть достаточно много товарной рыбы, этот метод ее продает.
         :return: Список проданной рыбы. Если таковой нет, то None.
         """
         # Найдем товарный бассейн
-        commercial_pool: Pool = self.pools[0]
-
-        for pool in self.pools:
-            if pool.mass_index == self.number_pools - 1:
-                commercial_pool = pool
-                break
+        commercial_pool: Pool = self._find_commercial_pool()
 
         # Посчитаем количество товарной рыбы
-        number_commercial_fish: int = 0
-
-        for fish in commercial_pool.fishes:
-            if fish.mass >= self.commercial_fish_mass:
-                number_commercial_fish += 1
+        number_commercial_fish: int = commercial_pool.count_fish_not_lighter(self.commercial_fish_mass)
 
         # Если количество товарной рыбы превысил минимальный размер пакета или
         # выросла вся рыба
@@ -129,6 +313,8 @@ class CWSD:
 
             # Обновим информацию о проданной рыбе
             self.sold_biomass += sold_fish.get_biomass()
+            self._emit('sale', pool=commercial_pool.mass_index, number_fish=number_commercial_fish,
+                       biomass=sold_fish.get_biomass())
             # Обновим массовые индексы в бассейнах
             self._update_mass_indexes()
 
@@ -144,9 +330,8 @@ class CWSD:
         :param mass_index: Массовый индекс искомого бассейна.
         :return: искомый бассейн.
         """
-        for pool in self.pools:
-            if pool.mass_index == mass_index:
-                return pool
+        if 0 <= mass_index < self.number_pools:
+            return self.pools[self._ranking[mass_index]]
         # Если бассейна с таким массовым индексом нет, то вернем None
         return None
 
@@ -173,19 +358,15 @@ class CWSD:
             overflowed_pool.number_fish * percent / 100 / 2)
 
         if (previous_pool is not None) and (not previous_pool.is_empty()):
-            slow_growing_fish: ListFish = overflowed_pool.remove_fish(
-                number_fish_to_be_removed, biggest_fish=False)
-            if print_info:
-                print(f'Переместим {number_fish_to_be_removed} медленно растущих рыб из'
-                      f' {index_overflowed_pool} бассейна в {previous_pool.mass_index}.')
-            previous_pool.add_new_fishes(slow_growing_fish)
+            overflowed_pool.transfer_fish(previous_pool, number_fish_to_be_removed, biggest_fish=False)
+            self._emit('separation', print_info, source=index_overflowed_pool,
+                       destination=previous_pool.mass_index, number_fish=number_fish_to_be_removed,
+                       slow_growing=True)
         if (next_pool is not None) and (not next_pool.is_empty()):
-            fast_growing_fish: ListFish = overflowed_pool.remove_fish(
-                number_fish_to_be_removed)
-            if print_info:
-                print(f'Переместим {number_fish_to_be_removed} быстро растущих рыб из'
-                      f' {index_overflowed_pool} бассейна в {next_pool.mass_index}.')
-            next_pool.add_new_fishes(fast_growing_fish)
+            overflowed_pool.transfer_fish(next_pool, number_fish_to_be_removed)
+            self._emit('separation', print_info, source=index_overflowed_pool,
+                       destination=next_pool.mass_index, number_fish=number_fish_to_be_removed,
+                       slow_growing=False)
 
         # Обновим информацию о массовых индексах
         self._update_mass_indexes()
@@ -193,24 +374,35 @@ class CWSD:
     def daily_growth(self, print_info: bool = True) -> dict[str, float] | None:
         """
         Метод для проведения ежедневного выращивания.
-        :param print_info: Показывает, нужно ли печатать информацию о перемещении рыбы.
+        :param print_info: Показывает, нужно ли печатать информацию о перемещении рыбы и переполнении.
         :return: Словарь с информацией об изменении биомассы,
          затраченном корме и проданной биомассе. Словарь имеет вид
           {'biomass_increase': biomass_increase, 'spent_feed': spent_feed,
            'sold_biomass': sold_biomass}
         """
+        # Этапы замеряются, только если есть наблюдатели
+        timing: bool = bool(self.observers)
+        start: float = 0.0
+        if timing:
+            start = perf_counter()
+            self._phase_sorts = self._sorts
+
         biomass_increase: float = 0.0
         spent_feed: float = 0.0
         for pool in self.pools:
             pool_result: dict[str, float] = pool.daily_growth()
             biomass_increase += pool_result['biomass_increase']
             spent_feed += pool_result['spent_feed']
+        if timing:
+            start = self._finish_phase('growth', start, sum(pool.number_fish for pool in self.pools))
 
         # Если есть, продадим товарную рыбу
         sold_fish: ListFish | None = self.sell_fish()
         sold_biomass: float = 0.0
         if sold_fish is not None:
             sold_biomass = sold_fish.get_biomass()
+        if timing:
+            start = self._finish_phase('sale', start)
 
         # Обновим информацию о рыбе в УЗВ
         self.biomass += biomass_increase - sold_biomass
@@ -223,19 +415,151 @@ class CWSD:
                                     'sold_biomass': sold_biomass}
 
         # Если переполнено все УЗВ, то сообщим об ошибке и завершим работу
-        if self.biomass / (self.pool_area * self.number_pools) >=\
-                self.max_planting_density:
-            print('Переполнение!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!')
+        density: float = self.biomass / (self.pool_area * self.number_pools)
+        if density >= self.max_planting_density:
+            self._emit('overflow', print_info, biomass=self.biomass, density=density)
+            if timing:
+                self._finish_phase('overflow', start)
             return None
+        if timing:
+            start = self._finish_phase('overflow', start)
 
         # Если есть переполненные бассейны - распределим рыбу
         for pool in self.pools:
             if pool.planting_density >= self.max_planting_density:
                 self.separate_fish(pool, print_info=print_info)
+        if timing:
+            self._finish_phase('separation', start)
 
         # Вернем ежедневный результат
         return result
 
+    def _days_to_next_event(self, max_days: int) -> int:
+        """
+        Метод для расчета количества суток до ближайшего события: переполнения какого-либо бассейна
+         или появления пакета товарной рыбы. До этого события в УЗВ ничего не происходит, кроме роста рыбы.
+         Переполнение всего УЗВ отдельно не проверяется, так как при нем переполнен хотя бы один бассейн.
+        :param max_days: Наибольшее количество суток для поиска.
+        :return: Количество суток до события (от 1 до max_days).
+        """
+        days_to_event: int = max_days
+
+        for pool in self.pools:
+            days: int | None = pool.days_to_density(self.max_planting_density, days_to_event)
+            if days is not None:
+                days_to_event = days
+
+        days_to_sale: int | None = self._find_commercial_pool().days_to_commercial(
+            self.commercial_fish_mass, self.min_package, days_to_event)
+        if days_to_sale is not None:
+            days_to_event = days_to_sale
+
+        return days_to_event
+
+    def fast_forward(self, max_days: int = 365, print_info: bool = True) -> dict[str, float] | None:
+        """
+        Метод для перехода сразу к ближайшему событию (продаже или переполнению бассейна).
+         Рост рыбы до дня события считается по точной формуле за один шаг, а день события
+         проводится обычным методом daily_growth.
+        :param max_days: Наибольшее количество суток, на которое можно перейти.
+        :param print_info: Показывает, нужно ли печатать информацию о перемещении рыбы.
+        :return: Словарь с информацией об изменении биомассы, затраченном корме,
+         проданной биомассе и количестве прошедших суток. Словарь имеет вид
+          {'biomass_increase': biomass_increase, 'spent_feed': spent_feed,
+           'sold_biomass': sold_biomass, 'days': days}. Если произошло переполнение УЗВ, то None.
+        """
+        days: int = self._days_to_next_event(max_days)
+
+        # Вырастим рыбу за спокойные сутки
+        timing: bool = bool(self.observers)
+        start: float = perf_counter() if timing else 0.0
+        biomass_increase: float = 0.0
+        spent_feed: float = 0.0
+        for pool in self.pools:
+            pool_result: dict[str, float] = pool.grow(days - 1)
+            biomass_increase += pool_result['biomass_increase']
+            spent_feed += pool_result['spent_feed']
+
+        self.biomass += biomass_increase
+        self.days += days - 1
+        self.spent_feed += spent_feed
+        if timing:
+            self._phase_sorts = self._sorts
+            self._finish_phase('growth', start, sum(pool.number_fish for pool in self.pools) * (days - 1))
+
+        # Проведем день события
+        result: dict[str, float] | None = self.daily_growth(print_info=print_info)
+        if result is None:
+            return None
+
+        result['biomass_increase'] += biomass_increase
+        result['spent_feed'] += spent_feed
+        result['days'] = days
+        return result
+
+    def run_until(self, min_biomass: float = 1.0, max_days: int | None = None,
+                  print_info: bool = True) -> dict[str, float] | None:
+        """
+        Метод для работы УЗВ, пока биомасса не опустится до указанной или не пройдет указанное количество суток.
+         Работает через fast_forward, т.е. переходит от события к событию.
+        :param min_biomass: Биомасса в кг, при которой работа прекращается.
+        :param max_days: Наибольшее количество суток работы. Если None, то не ограничено.
+        :param print_info: Показывает, нужно ли печатать информацию о перемещении рыбы.
+        :return: Словарь с суммарной информацией за всю работу такого же вида, как у fast_forward.
+         Если произошло переполнение УЗВ, то None.
+        """
+        total: dict[str, float] = {'biomass_increase': 0.0, 'spent_feed': 0.0,
+                                   'sold_biomass': 0.0, 'days': 0}
+
+        while self.biomass > min_biomass:
+            step: int = 365
+            if max_days is not None:
+                step = min(step, max_days - total['days'])
+                if step <= 0:
+                    break
+
+            result: dict[str, float] | None = self.fast_forward(step, print_info=print_info)
+            if result is None:
+                return None
+
+            for key in total:
+                total[key] += result[key]
+
+        return total
+
+    def record(self, daily_result: dict[str, float]) -> dict:
+        """
+        Метод для получения компактной суточной записи о состоянии УЗВ.
+        :param daily_result: Результат daily_growth за эти сутки.
+        :return: Словарь вида {'day': ..., 'biomass': ..., 'biomass_increase': ..., 'spent_feed': ...,
+         'sold_biomass': ..., 'pool_biomass': ..., 'pool_density': ..., 'pool_number_fish': ...}, где
+         значения для бассейнов - массивы NumPy в порядке номеров бассейнов.
+        """
+        return {'day': self.days,
+                'biomass': self.biomass,
+                'biomass_increase': daily_result['biomass_increase'],
+                'spent_feed': daily_result['spent_feed'],
+                'sold_biomass': daily_result['sold_biomass'],
+                'pool_biomass': np.array([pool.biomass for pool in self.pools]),
+                'pool_density': np.array([pool.planting_density for pool in self.pools]),
+                'pool_number_fish': np.array([pool.number_fish for pool in self.pools])}
+
+    def iter_days(self, days: int | None = None, print_info: bool = False):
+        """
+        Генератор ежедневной работы УЗВ, который после каждых суток выдает суточную запись (см. record).
+         Записи не накапливаются, поэтому их можно сразу писать на диск (см. records.RecordSink).
+        :param days: Количество суток работы. Если None, то работа не ограничена.
+        :param print_info: Показывает, нужно ли печатать информацию о перемещении рыбы и переполнении.
+        :return: Генератор суточных записей. Заканчивается после days суток или при переполнении УЗВ.
+        """
+        day: int = 0
+        while days is None or day < days:
+            daily_result: dict[str, float] | None = self.daily_growth(print_info=print_info)
+            if daily_result is None:
+                return
+            yield self.record(daily_result)
+            day += 1
+
     def have_empty_pool(self) -> int:
         """
         Метод, который считает количество пустых бассейнов.
@@ -250,7 +574,8 @@ class CWSD:
 
     def print(self, print_full_info: bool = False):
         print(f'Прошло {self.days} дней.\n'
-              f'В УЗВ находится {self.biomass} кг биомассы.\n'
+              f'В УЗВ находится {self.biomass} кг биомассы'
+              f' ({sum(pool.number_fish for pool in self.pools)} шт. рыбы).\n'
               f'За это время продано {self.sold_biomass} кг биомассы.\n'
               f'При этом было потрачено {self.spent_feed} кг корма.')
         if print_full_info:
@@ -1,5 +1,17 @@
 import random
 
+import numpy as np
+
+
+min_mass_accumulation: float = 0.07
+max_mass_accumulation: float = 0.087
+# Среднее значение коэффициента массонакопления
+mac_mean: float = (max_mass_accumulation + min_mass_accumulation) / 2
+# Стандартное отклонение возьмем из расчета, что 68% выпадает
+# на вторую треть промежутка между min_mass_accumulation
+# и max_mass_accumulation
+mac_std: float = ((max_mass_accumulation - min_mass_accumulation) / 3) / 2
+
 
 class Fish:
     """
@@ -10,27 +22,17 @@ class Fish:
     def _calculate_random_mac() -> float:
         """
         Расчет случайного значения коэффициента массонакопления
-        по нормальному распределению.
+        по нормальному распределению (см. mac_mean и mac_std).
         :return: Коэффициент массонакопления (mass accumulation coefficient)
         """
-        min_mass_accumulation: float = 0.07
-        max_mass_accumulation: float = 0.087
-
-        medium: float = (max_mass_accumulation + min_mass_accumulation) / 2
-        # Стандартное отклонение возьмем из расчета, что 68% выпадает
-        # на вторую треть промежутка между min_mass_accumulation
-        # и max_mass_accumulation
-        standard_deviation: float = \
-            ((max_mass_accumulation - min_mass_accumulation) / 3) / 2
-
-        mass_accumulation_coefficient: float = random.gauss(medium,
-                                                            standard_deviation)
-        return mass_accumulation_coefficient
+        return random.gauss(mac_mean, mac_std)
 
-    def __init__(self, start_mass: float, feed_ratio: float = 1.5):
+    def __init__(self, start_mass: float, feed_ratio: float = 1.5, mac: float | None = None):
         self.mass: float = start_mass  # текущая масса
         self.feed_ratio: float = feed_ratio  # кормовой коэффициент
-        self._mac: float = self._calculate_random_mac()  # коэффициент массонакопления
+        if mac is None:
+            mac = self._calculate_random_mac()
+        self._mac: float = mac  # коэффициент массонакопления
 
     def daily_growth(self) -> dict[str, float]:
         """
@@ -43,8 +45,7 @@ class Fish:
         # Масса в начале суток
         previous_mass: float = self.mass
         # Масса в конце суток
-        next_mass: float = \
-            (previous_mass ** (1 / 3) + self._mac / 3) ** 3
+        next_mass: float = float(grow_mass(previous_mass, self._mac))
         # Относительный суточный прирост
         relative_daily_increase: float =\
             (next_mass - previous_mass) * 100 / previous_mass
@@ -68,32 +69,214 @@ class Fish:
         print(f'Масса рыбки: {self.mass}')
 
 
+def grow_mass(mass: float | np.ndarray, mac: float | np.ndarray,
+              days: int | np.ndarray = 1) -> float | np.ndarray:
+    """
+    Функция для расчета массы рыбы через указанное количество суток. Кубический корень
+     из массы растет линейно, поэтому масса через n суток равна (m^(1/3) + n * mac / 3)^3.
+     Работает как с отдельными числами, так и с массивами NumPy.
+    :param mass: Масса рыбы в начале периода.
+    :param mac: Коэффициент массонакопления.
+    :param days: Количество суток.
+    :return: Масса рыбы в конце периода.
+    """
+    return (np.cbrt(mass) + days * mac / 3) ** 3
+
+
+def days_to_reach_mass(mass: np.ndarray, mac: np.ndarray, target_mass: float) -> np.ndarray:
+    """
+    Функция для расчета количества суток, через которое каждая рыба достигнет указанной массы.
+    :param mass: Массив текущих масс рыб.
+    :param mac: Массив коэффициентов массонакопления.
+    :param target_mass: Масса, которую должна достигнуть рыба.
+    :return: Массив наименьших количеств суток n, для которых grow_mass(mass, mac, n) >= target_mass.
+     Для рыб, которые никогда не достигнут этой массы, - бесконечность.
+    """
+    root_gap: np.ndarray = np.cbrt(target_mass) - np.cbrt(mass)
+    growing: np.ndarray = mac > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days: np.ndarray = np.where(growing, np.ceil(3 * root_gap / mac), np.inf)
+    days = np.where(root_gap <= 0, 0.0, days)
+
+    # Поправим ошибки округления так, чтобы ответ совпадал с расчетом по grow_mass
+    finite: np.ndarray = np.isfinite(days)
+    safe_days: np.ndarray = np.where(finite, days, 0.0)
+    days = np.where(finite & (grow_mass(mass, mac, safe_days) < target_mass), days + 1, days)
+    safe_days = np.where(finite, np.maximum(days - 1, 0.0), 0.0)
+    days = np.where(finite & (days > 0) & (grow_mass(mass, mac, safe_days) >= target_mass), days - 1, days)
+    return days
+
+
+def first_day(condition, max_days: int) -> int | None:
+    """
+    Функция для поиска первых суток, в которые выполняется монотонное условие
+     (если условие выполнилось, то оно будет выполняться и дальше).
+    :param condition: Функция от количества суток, возвращающая True или False.
+    :param max_days: Наибольшее количество суток для поиска.
+    :return: Наименьшее n от 1 до max_days, для которого условие выполнено. Если такого нет, то None.
+    """
+    if max_days < 1:
+        return None
+
+    # Сначала удваиваем шаг, чтобы близкие события находились за несколько проверок
+    low: int = 0  # условие не выполнено (или это начальный момент)
+    high: int = 1
+    while not condition(high):
+        if high >= max_days:
+            return None
+        low = high
+        high = min(high * 2, max_days)
+
+    # Затем делим пополам промежуток, в котором условие начало выполняться
+    while high - low > 1:
+        middle: int = (low + high) // 2
+        if condition(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+class MassStatistics:
+    """
+    Класс для сводной статистики масс группы рыб: количество, биомасса, наименьшая, наибольшая
+     и средняя масса. Если заданы границы интервалов масс, то хранится и гистограмма, по которой
+     оцениваются процентили. Ошибка такой оценки не больше ширины интервала, в который попал процентиль.
+    """
+    def __init__(self, number_fish: int = 0, biomass: float = 0.0, min_mass: float = 0.0, max_mass: float = 0.0,
+                 bins: np.ndarray | None = None, histogram: np.ndarray | None = None):
+        self.number_fish: int = number_fish
+        self.biomass: float = biomass  # в кг
+        self.min_mass: float = min_mass  # в граммах
+        self.max_mass: float = max_mass  # в граммах
+        self.bins: np.ndarray | None = bins  # границы интервалов масс в граммах
+        self.histogram: np.ndarray | None = histogram  # количество рыб в каждом интервале
+
+    @classmethod
+    def from_mass(cls, mass: np.ndarray, bins: np.ndarray | None = None) -> 'MassStatistics':
+        """
+        Метод для расчета статистики по массиву масс за один просмотр массива.
+        :param mass: Массив масс рыб в граммах.
+        :param bins: Границы интервалов масс для гистограммы. Если None, то гистограмма не считается.
+        :return: Статистика масс.
+        """
+        if len(mass) == 0:
+            return cls(bins=bins, histogram=None if bins is None else np.zeros(len(bins) - 1, dtype=int))
+        # NumPy складывает попарно, поэтому ошибка суммы растет как log(n), а не как n
+        return cls(len(mass), float(mass.sum()) / 1000, float(mass.min()), float(mass.max()), bins,
+                   None if bins is None else np.histogram(mass, bins)[0])
+
+    @property
+    def average_mass(self) -> float:
+        """
+        Средняя масса рыбы в граммах.
+        :return: Средняя масса (0, если рыбы нет).
+        """
+        if self.number_fish == 0:
+            return 0.0
+        return self.biomass / self.number_fish * 1000
+
+    def percentile(self, q: float) -> float:
+        """
+        Метод для оценки процентиля масс по гистограмме (линейно внутри интервала).
+        :param q: Процент от 0 до 100.
+        :return: Оценка массы в граммах.
+        """
+        if self.histogram is None:
+            raise ValueError('Для оценки процентиля нужна гистограмма (параметр bins)')
+        cumulative: np.ndarray = np.concatenate(([0], np.cumsum(self.histogram)))
+        if cumulative[-1] == 0:
+            return 0.0
+        return float(np.interp(q / 100 * cumulative[-1], cumulative, self.bins))
+
+    def print(self):
+        """
+        Метод для печати статистики.
+        :return: Ничего
+        """
+        print(f'Количество рыбы: {self.number_fish} шт.\n'
+              f'Биомасса: {self.biomass} кг.\n'
+              f'Масса рыбы: от {self.min_mass} до {self.max_mass} г, в среднем {self.average_mass} г.')
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """
+    Функция для получения представления массива, которое нельзя изменить на месте.
+     Сам массив остается изменяемым.
+    :param array: Массив.
+    :return: Представление массива только для чтения.
+    """
+    view: np.ndarray = array.view()
+    view.flags.writeable = False
+    return view
+
+
 class ListFish:
     """
-    Класс для работы со списком объектов Fish
+    Класс для работы со списком рыб. Массы и коэффициенты массонакопления рыб
+     хранятся в непрерывных массивах NumPy только для чтения. Массивы не изменяются на месте, а только
+     заменяются, поэтому статистика масс считается один раз для каждого массива.
     """
-    def __init__(self, list_fish: list[Fish]):
-        self.list_fish: list[Fish] = list_fish
+    def __init__(self, list_fish: list[Fish] | None = None):
+        if list_fish is None:
+            list_fish = list()
+        self.mass: np.ndarray = _read_only(np.fromiter((fish.mass for fish in list_fish),
+                                                       dtype=float, count=len(list_fish)))
+        self.mac: np.ndarray = _read_only(np.fromiter((fish._mac for fish in list_fish),
+                                                      dtype=float, count=len(list_fish)))
+        # Статистика и массив масс, по которому она посчитана
+        self._statistics: tuple[np.ndarray, MassStatistics] | None = None
 
-    def get_biomass(self) -> float:
+    @classmethod
+    def from_arrays(cls, mass: np.ndarray, mac: np.ndarray) -> 'ListFish':
         """
-        Метод для расчета биомассы списка рыб.
-        :return: Биомасса списка рыб
+        Метод для создания списка рыб из готовых массивов без создания объектов Fish. Массивы не копируются,
+         список рыб хранит их представления только для чтения, поэтому переданные массивы нельзя изменять
+         после создания списка.
+        :param mass: Массив масс рыб.
+        :param mac: Массив коэффициентов массонакопления.
+        :return: Список рыб.
         """
+        list_fish: ListFish = cls()
+        list_fish.mass = _read_only(np.asarray(mass, dtype=float))
+        list_fish.mac = _read_only(np.asarray(mac, dtype=float))
+        return list_fish
 
-        biomass: float = 0.0
+    @property
+    def list_fish(self) -> list[Fish]:
+        """
+        Список объектов Fish, построенный по массивам. Изменение этих объектов
+         не влияет на данный список рыб.
+        :return: Список объектов Fish.
+        """
+        return [Fish(float(mass), mac=float(mac)) for mass, mac in zip(self.mass, self.mac)]
 
-        for fish in self.list_fish:
-            biomass += fish.mass / 1000
+    def statistics(self, bins: np.ndarray | None = None) -> MassStatistics:
+        """
+        Метод для получения статистики масс списка рыб. Статистика без гистограммы запоминается
+         и пересчитывается только после замены массива масс.
+        :param bins: Границы интервалов масс для гистограммы. Если None, то гистограмма не считается.
+        :return: Статистика масс.
+        """
+        if bins is not None:
+            return MassStatistics.from_mass(self.mass, bins)
+        if self._statistics is None or self._statistics[0] is not self.mass:
+            self._statistics = (self.mass, MassStatistics.from_mass(self.mass))
+        return self._statistics[1]
 
-        return biomass
+    def get_biomass(self) -> float:
+        """
+        Метод для расчета биомассы списка рыб.
+        :return: Биомасса списка рыб
+        """
+        return self.statistics().biomass
 
     def get_number_fish(self) -> int:
         """
         Метод для получения количества рыб в списке.
         :return: Количество рыб в списке
         """
-        return len(self.list_fish)
+        return len(self.mass)
 
     def get_mass(self, min: bool = False, max: bool = False, average: bool = False) -> float:
         """
@@ -103,18 +286,92 @@ class ListFish:
         :param average: Вывести среднюю.
         :return: Минимальная или максимальная, или средняя масса.
         """
-        self.list_fish.sort(key=lambda fish: fish.mass)
+        statistics: MassStatistics = self.statistics()
         if min:
-            return self.list_fish[0].mass
+            return statistics.min_mass
         elif max:
-            return self.list_fish[-1].mass
+            return statistics.max_mass
         elif average:
-            mass: float = 0.0
-            for fish in self.list_fish:
-                mass += fish.mass
-            return mass / len(self.list_fish)
+            return statistics.average_mass
 
 
-def create_list_fish(number_fish: int, mass: float) -> ListFish:
-    fishes: list[Fish] = [Fish(mass) for _ in range(number_fish)]
-    return ListFish(fishes)
+def _default_rng() -> np.random.Generator:
+    """
+    Функция для получения генератора случайных чисел, когда генератор не передан. Зерно берется
+     из генератора random, поэтому random.seed по-прежнему делает расчет воспроизводимым.
+    :return: Генератор NumPy.
+    """
+    return np.random.default_rng(random.getrandbits(128))
+
+
+def random_macs(number_fish: int, rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Функция для получения массива случайных коэффициентов массонакопления. Все значения берутся
+     из генератора одним вызовом.
+    :param number_fish: Количество рыб.
+    :param rng: Генератор случайных чисел. Если None, то создается генератор с зерном из random.
+    :return: Массив коэффициентов массонакопления.
+    """
+    if rng is None:
+        rng = _default_rng()
+    return rng.normal(mac_mean, mac_std, number_fish)
+
+
+def create_list_fish(number_fish: int, mass: float, rng: np.random.Generator | None = None) -> ListFish:
+    return ListFish.from_arrays(np.full(number_fish, mass, dtype=float), random_macs(number_fish, rng))
+
+
+def _normal_quantile(probability: np.ndarray) -> np.ndarray:
+    """
+    Функция для расчета квантилей стандартного нормального распределения (рациональное приближение
+     Акклама, относительная погрешность меньше 1.2e-9).
+    :param probability: Массив вероятностей от 0 до 1 (не включая концы).
+    :return: Массив квантилей.
+    """
+    a: tuple[float, ...] = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+                            1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b: tuple[float, ...] = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+                            6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+    c: tuple[float, ...] = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+                            -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d: tuple[float, ...] = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+                            3.754408661907416e+00, 1.0)
+
+    probability = np.asarray(probability, dtype=float)
+    # В центре - приближение по (p - 0.5)^2, на хвостах - по sqrt(-2 ln p)
+    q: np.ndarray = probability - 0.5
+    r: np.ndarray = q * q
+    quantile: np.ndarray = np.polyval(a, r) * q / np.polyval(b, r)
+    tail: np.ndarray = np.minimum(probability, 1 - probability)
+    is_tail: np.ndarray = tail < 0.02425
+    if is_tail.any():
+        s: np.ndarray = np.sqrt(-2 * np.log(tail[is_tail]))
+        tail_quantile: np.ndarray = np.polyval(c, s) / np.polyval(d, s)
+        quantile[is_tail] = np.where(probability[is_tail] < 0.5, tail_quantile, -tail_quantile)
+    return quantile
+
+
+def stratified_macs(number_fish: int, rng: np.random.Generator | None = None, attempt: int = 0,
+                    attempts: int = 1, shifts: np.ndarray | None = None) -> np.ndarray:
+    """
+    Функция для получения коэффициентов массонакопления стратифицированной выборкой: распределение
+     делится на number_fish равновероятных слоев, и из каждого слоя берется одно значение. Поэтому
+     распределение масс в каждой попытке близко к теоретическому, и разброс между попытками меньше.
+    Если попыток несколько (attempts > 1), то выборка - латинский гиперкуб по рыбам и попыткам: каждый слой
+     делится еще на attempts частей, и попытка attempt берет в слое i часть (attempt + shifts[i]) % attempts.
+     Так за все попытки каждая часть каждого слоя используется ровно один раз.
+    :param number_fish: Количество рыб.
+    :param rng: Генератор случайных чисел попытки. Если None, то создается генератор с зерном из random.
+    :param attempt: Номер попытки.
+    :param attempts: Количество попыток.
+    :param shifts: Случайные сдвиги частей слоев (целые от 0 до attempts - 1), общие для всех попыток.
+     Нужны, если attempts > 1.
+    :return: Массив коэффициентов массонакопления.
+    """
+    if rng is None:
+        rng = _default_rng()
+    strata: np.ndarray = np.arange(number_fish, dtype=float)
+    part: np.ndarray = rng.random(number_fish)
+    if attempts > 1:
+        part = ((attempt + shifts) % attempts + part) / attempts
+    return mac_mean + mac_std * _normal_quantile((strata + part) / number_fish)
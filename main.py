@@ -19,24 +19,14 @@ start_mass: float = 200.0
 number_fish: int = 1000
 attempts: int = 100
 
-min_days: int = 100000
-max_days: int = 0
-average_days: int = 0
-
-for _ in range(attempts):
-    days: int = optimization.calculate_growing_time(start_mass, number_fish)
-    if min_days > days:
-        min_days = days
-    if max_days < days:
-        max_days = days
-    average_days += days
-    print(days)
+growing_time: dict = optimization.calculate_growing_time_distribution(start_mass, number_fish, replicates=attempts)
+for days in growing_time['days']:
+    print(int(days))
 print()
 
-average_days /= attempts
-print(f'Минимум дней: {min_days}\n'
-      f'Максимум дней: {max_days}\n'
-      f'Среднее количество дней: {average_days}')
+print(f'Минимум дней: {growing_time["min"]}\n'
+      f'Максимум дней: {growing_time["max"]}\n'
+      f'Среднее количество дней: {growing_time["mean"]}')
 
 print(optimization.calculate_number_fish_for_max_density(
     days=83,
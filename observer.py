@@ -0,0 +1,116 @@
+class Event:
+    """
+    Класс для события в работе УЗВ.
+    Виды событий и их данные:
+     'stocking' - добавление рыбы: pool (массовый индекс бассейна), number_fish, biomass, empty_pool
+      (True, если рыбу посадили в пустой бассейн);
+     'sale' - продажа: pool, number_fish, biomass;
+     'separation' - перемещение рыбы из переполненного бассейна: source, destination (массовые индексы),
+      number_fish, slow_growing (True для медленно растущих рыб);
+     'overflow' - переполнение всего УЗВ: biomass, density;
+     'phase' - завершение этапа суток: name ('growth', 'sale', 'overflow', 'separation'), seconds,
+      fish_days (количество рыбо-суток роста), sorts (количество сортировок массовых индексов);
+     'attempts' - проверка количества новой рыбы при оптимизации: number_fish, average_mass,
+      successes, attempts, result, confidence (достигнутая уверенность в результате);
+     'search' - итог поиска количества новой рыбы: optimal, risk, attempts, successes и tested
+      (удачные и проведенные попытки для первого неподходящего количества).
+    """
+    def __init__(self, kind: str, day: int, data: dict):
+        self.kind: str = kind
+        self.day: int = day
+        self.data: dict = data
+
+    def __repr__(self) -> str:
+        return f'Event({self.kind!r}, {self.day}, {self.data!r})'
+
+
+class Observer:
+    """
+    Базовый класс наблюдателя за УЗВ. Наблюдатель получает все события УЗВ, к которому он подключен
+     методом CWSD.add_observer. Если наблюдателей нет, то события не создаются и этапы не замеряются.
+    """
+    def notify(self, event: Event):
+        """
+        Метод для обработки события.
+        :param event: Событие.
+        :return: Ничего.
+        """
+        pass
+
+
+class PrintObserver(Observer):
+    """
+    Наблюдатель, который печатает события так, как раньше их печатало УЗВ при print_info=True.
+    """
+    def notify(self, event: Event):
+        """
+        Метод для печати события.
+        :param event: Событие.
+        :return: Ничего.
+        """
+        data: dict = event.data
+        if event.kind == 'stocking' and not data['empty_pool']:
+            print(f"Рыбу добавили в бассейн с массовым индексом {data['pool']}")
+        elif event.kind == 'separation':
+            kind_fish: str = 'медленно' if data['slow_growing'] else 'быстро'
+            print(f"Переместим {data['number_fish']} {kind_fish} растущих рыб из"
+                  f" {data['source']} бассейна в {data['destination']}.")
+        elif event.kind == 'overflow':
+            print('Переполнение!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!')
+        elif event.kind == 'attempts':
+            print(f"Тестируем с {data['number_fish']} рыб массой {data['average_mass']}")
+            print(f"Было {data['successes']} попыток из {data['attempts']}")
+        elif event.kind == 'search':
+            print(f"Оптимальное значение количества новой рыбы, при котором не происходит"
+                  f" переполнение в {data['attempts']} из {data['attempts']} случаев, равно {data['optimal']}.\n"
+                  f"Рискованное значение количества новой рыбы, при котором не происходит"
+                  f" переполнение в 90% и выше (в {data['successes']} случаях из"
+                  f" {data['tested']}), равно {data['risk']}.")
+
+
+class Profiler(Observer):
+    """
+    Наблюдатель, который копит время работы каждого этапа суток и счетчики: рыбо-сутки роста,
+     перемещенную и проданную рыбу, сортировки массовых индексов и количество событий каждого вида.
+    """
+    def __init__(self):
+        self.timings: dict[str, float] = dict()
+        self.counters: dict[str, int] = {'fish_days': 0, 'fish_moved': 0, 'fish_sold': 0, 'fish_stocked': 0,
+                                         'sorts': 0}
+        self.events: dict[str, int] = dict()
+
+    def notify(self, event: Event):
+        """
+        Метод для учета события.
+        :param event: Событие.
+        :return: Ничего.
+        """
+        self.events[event.kind] = self.events.get(event.kind, 0) + 1
+        data: dict = event.data
+        if event.kind == 'phase':
+            self.timings[data['name']] = self.timings.get(data['name'], 0.0) + data['seconds']
+            self.counters['fish_days'] += data.get('fish_days', 0)
+            self.counters['sorts'] += data.get('sorts', 0)
+        elif event.kind == 'separation':
+            self.counters['fish_moved'] += data['number_fish']
+        elif event.kind == 'sale':
+            self.counters['fish_sold'] += data['number_fish']
+        elif event.kind == 'stocking':
+            self.counters['fish_stocked'] += data['number_fish']
+
+    def report(self) -> dict:
+        """
+        Метод для получения накопленной информации.
+        :return: Словарь вида {'timings': {этап: секунды, ...}, 'counters': {...}, 'events': {вид: количество, ...}}.
+        """
+        return {'timings': dict(self.timings), 'counters': dict(self.counters), 'events': dict(self.events)}
+
+    def print(self):
+        """
+        Метод для печати накопленной информации.
+        :return: Ничего
+        """
+        for name, seconds in self.timings.items():
+            print(f'Этап {name}: {seconds:.6f} с.')
+        for name, value in self.counters.items():
+            print(f'{name}: {value}')
@@ -1,19 +1,132 @@
+from backend import Backend, get_backend
+from batch_cwsd import BatchCWSD
 from cwsd import CWSD
+from observer import Event, Observer, PrintObserver
 from pool import Pool
-from fish import Fish, ListFish, create_list_fish
+from result_cache import ResultCache
+from fish import ListFish, create_list_fish, days_to_reach_mass, grow_mass, random_macs, stratified_macs
 from datetime import date
-from copy import deepcopy
+from math import exp, fsum, lgamma, log
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import groupby
+import random
+
+import numpy as np
+
+
+# УЗВ, переданное в процесс-исполнитель один раз при его запуске
+_worker_cwsd: CWSD | None = None
+
+
+def _init_worker(cwsd: CWSD):
+    """
+    Функция для инициализации процесса-исполнителя пробных запусков.
+    :param cwsd: Работающее УЗВ, которое будет копироваться для каждого пробного запуска.
+    :return: Ничего.
+    """
+    global _worker_cwsd
+    _worker_cwsd = cwsd
+
+
+def _trial_rng(seed: int, number_fish: int, attempt: int) -> np.random.Generator:
+    """
+    Функция для получения генератора случайных чисел для отдельного пробного запуска. Генератор - дочерний
+     поток общего зерна, который зависит только от общего зерна, количества рыбы и номера попытки,
+     поэтому результат не зависит от количества процессов и порядка выполнения, а потоки разных попыток
+     независимы.
+    :param seed: Общее зерно.
+    :param number_fish: Количество новой рыбы.
+    :param attempt: Номер попытки.
+    :return: Генератор пробного запуска.
+    """
+    return np.random.default_rng(np.random.SeedSequence([seed, number_fish, attempt]))
+
+
+def _trial_macs(seed: int, number_fish: int, attempt: int, design: tuple[bool, str, int]) -> np.ndarray:
+    """
+    Функция для получения коэффициентов массонакопления новой рыбы для отдельного пробного запуска.
+    :param seed: Общее зерно.
+    :param number_fish: Количество новой рыбы.
+    :param attempt: Номер попытки.
+    :param design: Кортеж (общие случайные числа, способ выборки, количество попыток)
+     (см. search_optimal_number_new_fish_in_current_cwsd). При общих случайных числах поток попытки
+     не зависит от количества рыбы, поэтому попытки с одним номером у соседних количеств отличаются
+     только добавленной рыбой.
+    :return: Массив коэффициентов массонакопления.
+    """
+    common_random_numbers, sampling, attempts = design
+    stream: int = 0 if common_random_numbers else number_fish
+    rng: np.random.Generator = _trial_rng(seed, stream, attempt)
+    if sampling == 'random':
+        return random_macs(number_fish, rng)
+    if sampling == 'stratified':
+        return stratified_macs(number_fish, rng)
+    # Сдвиги частей слоев латинского гиперкуба общие для всех попыток
+    shifts_rng: np.random.Generator = np.random.default_rng(np.random.SeedSequence([seed, stream],
+                                                                                   spawn_key=(attempts,)))
+    shifts: np.ndarray = shifts_rng.integers(attempts, size=number_fish)
+    return stratified_macs(number_fish, rng, attempt, attempts, shifts)
+
+
+def _run_trial(cwsd: CWSD, list_fish: ListFish, average_mass: float) -> bool:
+    """
+    Функция для одного пробного запуска УЗВ с новой рыбой.
+    :param cwsd: Работающее УЗВ.
+    :param list_fish: Новая рыба.
+    :param average_mass: Средняя масса новой рыбы.
+    :return: True, если УЗВ проработало без переполнения, иначе - False.
+    """
+    test_cwsd: CWSD = cwsd.fork()
+
+    # Если есть пустой бассейн, добавим в него рыбу
+    if not test_cwsd.add_fish(list_fish):
+        # Если пустых бассейнов нет, добавим в близкий по средней массе
+        test_cwsd.add_fish_in_not_empty_pool(average_mass, list_fish)
+
+    # Начнем работу, пока биомасса не опуститься ниже 1 кг, или пока не произойдет переполнение
+    return test_cwsd.run_until(min_biomass=1.0, print_info=False) is not None
+
+
+def _run_seeded_trial(task: tuple[int, float, int, int, tuple[bool, str, int]]) -> bool:
+    """
+    Функция для пробного запуска в процессе-исполнителе с УЗВ, переданным при инициализации.
+    :param task: Кортеж (количество новой рыбы, средняя масса новой рыбы, общее зерно, номер попытки,
+     план попыток (см. _trial_macs)).
+    :return: True, если УЗВ проработало без переполнения, иначе - False.
+    """
+    number_fish, average_mass, seed, attempt, design = task
+    list_fish: ListFish = ListFish.from_arrays(np.full(number_fish, average_mass, dtype=float),
+                                               _trial_macs(seed, number_fish, attempt, design))
+    return _run_trial(_worker_cwsd, list_fish, average_mass)
 
 
 class Optimization:
     def __init__(self, number_pools: int, pool_area: float, max_planting_density: float, commercial_fish_mass: float,
-                 min_package: int):
+                 min_package: int, rng: np.random.Generator | None = None, backend: str | Backend | None = None,
+                 cache: ResultCache | None = None):
+        """
+        __init__
+        :param number_pools: Количество бассейнов.
+        :param pool_area: Площадь бассейна в м^2.
+        :param max_planting_density: Максимальная плотность посадки рыбы в кг/м^2.
+        :param commercial_fish_mass: Масса товарной рыбы в г.
+        :param min_package: Минимальный размер пакета на продажу.
+        :param rng: Генератор случайных чисел для коэффициентов массонакопления. Если None, то для каждого
+         расчета создается генератор с зерном из random (см. fish.random_macs).
+        :param backend: Вычислитель для бассейнов создаваемых УЗВ (см. backend.get_backend).
+        :param cache: Кэш результатов на диске для calculate_growing_time(_distribution) и
+         (calculate/search)_number_fish_for_max_density. Используется, только если задан rng: результат
+         тогда определяется параметрами, аргументами и состоянием генератора.
+        """
         self.number_pools: int = number_pools
         self.pool_area: float = pool_area
         self.max_planting_density: float = max_planting_density
         self.commercial_fish_mass: float = commercial_fish_mass
         self.min_package: int = min_package
         self.start_date: date = date.today()
+        self.rng: np.random.Generator | None = rng
+        self.backend: Backend = get_backend(backend)
+        self.cache: ResultCache | None = cache
 
     def create_cwsd(self) -> CWSD:
         return CWSD(
@@ -22,9 +135,27 @@ class Optimization:
             max_planting_density=self.max_planting_density,
             commercial_fish_mass=self.commercial_fish_mass,
             min_package=self.min_package,
-            start_date=self.start_date
+            start_date=self.start_date,
+            rng=None if self.rng is None else self.rng.spawn(1)[0],
+            backend=self.backend
         )
 
+    def _cached(self, method: str, arguments: dict, compute):
+        """
+        Метод для получения результата расчета из кэша (см. result_cache.ResultCache.cached).
+        :param method: Название метода.
+        :param arguments: Аргументы метода.
+        :param compute: Функция без аргументов, которая считает результат.
+        :return: Результат.
+        """
+        if self.cache is None or self.rng is None:
+            return compute()
+        parameters: dict = {'number_pools': self.number_pools, 'pool_area': self.pool_area,
+                            'max_planting_density': self.max_planting_density,
+                            'commercial_fish_mass': self.commercial_fish_mass, 'min_package': self.min_package,
+                            'backend': self.backend.name}
+        return self.cache.cached(method, {'optimization': parameters, 'arguments': arguments}, compute, self.rng)
+
     def calculate_growing_time(self, mass: float, number_fish: int) -> int:
         """
         Метод для расчета длительности выращивания с такой средней массой.
@@ -32,23 +163,51 @@ class Optimization:
         :param number_fish: Количество рыбок, по которому нужно усреднять.
         :return: Количество дней
         """
-        list_fish: ListFish = create_list_fish(mass=mass, number_fish=number_fish)
-        days: int = 0
+        growing_time: dict = self.calculate_growing_time_distribution(mass, number_fish, replicates=1)
+        return int(growing_time['days'][0])
 
-        amount_growth_fish: int = 0
+    def calculate_growing_time_distribution(self, mass: float, number_fish: int, replicates: int = 100,
+                                            percentiles: tuple[float, ...] = (5, 25, 50, 75, 95)) -> dict:
+        """
+        Метод для расчета распределения длительности выращивания сразу для нескольких повторений.
+         Для каждой рыбы день, в который она станет товарной, считается по точной формуле роста.
+         Длительность выращивания - это день, в который товарной стала min_package-я рыба.
+        :param mass: Средняя масса рыбки.
+        :param number_fish: Количество рыбок в каждом повторении.
+        :param replicates: Количество повторений.
+        :param percentiles: Перцентили, которые нужно посчитать.
+        :return: Словарь вида {'days': ..., 'min': ..., 'max': ..., 'mean': ...,
+         'percentiles': {percentile: days, ...}}, где 'days' - массив длительностей всех повторений.
+        """
+        if number_fish < self.min_package:
+            raise ValueError(f'Количество рыб {number_fish} меньше минимального размера пакета {self.min_package}')
+        return self._cached('calculate_growing_time_distribution',
+                            {'mass': mass, 'number_fish': number_fish, 'replicates': replicates,
+                             'percentiles': percentiles},
+                            lambda: self._growing_time_distribution(mass, number_fish, replicates, percentiles))
 
-        while amount_growth_fish < self.min_package:
-            amount_growth_fish = 0
-            for fish in list_fish.list_fish:
-                fish.daily_growth()
-                if fish.mass > self.commercial_fish_mass:
-                    amount_growth_fish += 1
-            days += 1
+    def _growing_time_distribution(self, mass: float, number_fish: int, replicates: int,
+                                   percentiles: tuple[float, ...]) -> dict:
+        """
+        Метод для расчета распределения длительности выращивания без кэша
+         (см. calculate_growing_time_distribution).
+        """
+        mac: np.ndarray = random_macs(replicates * number_fish, self.rng).reshape(replicates, number_fish)
+        days_for_fish: np.ndarray = days_to_reach_mass(np.full(mac.shape, mass, dtype=float), mac,
+                                                       self.commercial_fish_mass)
+        package: int = max(self.min_package, 1)
+        days: np.ndarray = np.partition(days_for_fish, package - 1, axis=1)[:, package - 1]
+        # Выращивание длится хотя бы одни сутки
+        days = np.maximum(days, 1)
 
-        return days
+        return {'days': days,
+                'min': float(days.min()),
+                'max': float(days.max()),
+                'mean': float(days.mean()),
+                'percentiles': {percentile: float(np.percentile(days, percentile)) for percentile in percentiles}}
 
     def calculate_number_fish_for_max_density(self, days: int, start_mass: float, start_number: int, step: int,
-                                              end_number: int) -> int:
+                                              end_number: int, mode: str = 'linear') -> int:
         """
         Метод для расчета количества рыбы в бассейне, которое будет соответствовать максимальной плотности
          прошествии определенного количества дней.
@@ -57,29 +216,237 @@ class Optimization:
         :param start_number: Начальное количество рыбы для вариации.
         :param step: Шаг для вариации.
         :param end_number: Конечное количество рыбы для вариации.
+        :param mode: Способ поиска: 'linear', 'bisection' или 'batched'
+         (см. search_number_fish_for_max_density).
         :return: Оптимальное количество дней
         """
-        number_fish: int = start_number
+        return self.search_number_fish_for_max_density(days, start_mass, start_number, step, end_number,
+                                                       mode)['number_fish']
+
+    def _simulate_density(self, days: int, list_fish: ListFish) -> float:
+        """
+        Метод для расчета плотности посадки в отдельном бассейне через указанное количество дней.
+        :param days: Количество дней выращивания.
+        :param list_fish: Рыба, которую посадили в бассейн.
+        :return: Плотность посадки в кг/м^2.
+        """
+        pool: Pool = Pool(self.pool_area, 0, backend=self.backend)
+        pool.add_new_fishes(list_fish)
+        pool.grow(days)
+        return pool.planting_density
+
+    def search_number_fish_for_max_density(self, days: int, start_mass: float, start_number: int, step: int,
+                                           end_number: int, mode: str = 'bisection') -> dict:
+        """
+        Метод для поиска количества рыбы в бассейне, которое будет соответствовать максимальной плотности
+         по прошествии определенного количества дней. Варьируемые количества: start_number, start_number + step, ...
+        Способы поиска:
+         'linear' - перебор всех количеств по порядку, для каждого количества рыба создается заново;
+         'bisection' - деление пополам. Коэффициенты массонакопления создаются один раз для end_number рыб,
+          и каждое количество n использует первые n из них, поэтому плотность строго растет с количеством;
+         'batched' - один расчет для end_number рыб с теми же общими коэффициентами, плотности для всех
+          количеств получаются накопленными суммами масс.
+        :param days: Количество дней, по истечению которых будет достигнута максимальная плотность.
+        :param start_mass: Начальная масса рыбок.
+        :param start_number: Начальное количество рыбы для вариации.
+        :param step: Шаг для вариации.
+        :param end_number: Конечное количество рыбы для вариации.
+        :param mode: Способ поиска.
+        :return: Словарь вида {'number_fish': ..., 'densities': {number_fish: density, ...}, 'simulations': ...},
+         где 'densities' - посчитанные плотности посадки, 'simulations' - количество расчетов бассейна.
+         Если максимальная плотность не достигнута, то 'number_fish' - первое количество больше end_number.
+        """
+        return self._cached('search_number_fish_for_max_density',
+                            {'days': days, 'start_mass': start_mass, 'start_number': start_number, 'step': step,
+                             'end_number': end_number, 'mode': mode},
+                            lambda: self._search_number_fish_for_max_density(days, start_mass, start_number, step,
+                                                                             end_number, mode))
 
-        while number_fish <= end_number:
-            pool: Pool = Pool(self.pool_area, 0)
-            list_fish: ListFish = create_list_fish(number_fish, start_mass)
-            pool.add_new_fishes(list_fish)
+    def _search_number_fish_for_max_density(self, days: int, start_mass: float, start_number: int, step: int,
+                                            end_number: int, mode: str) -> dict:
+        """
+        Метод для поиска количества рыбы для максимальной плотности без кэша
+         (см. search_number_fish_for_max_density).
+        """
+        # Количество вариантов, не превышающих end_number
+        number_variants: int = max((end_number - start_number) // step + 1, 0)
+        densities: dict[int, float] = dict()
 
-            for _ in range(days):
-                pool.daily_growth()
+        if mode == 'linear':
+            for variant in range(number_variants):
+                number_fish: int = start_number + variant * step
+                densities[number_fish] = self._simulate_density(
+                    days, create_list_fish(number_fish, start_mass, self.rng))
+                if densities[number_fish] >= self.max_planting_density:
+                    return {'number_fish': number_fish, 'densities': densities, 'simulations': len(densities)}
+            return {'number_fish': start_number + number_variants * step, 'densities': densities,
+                    'simulations': len(densities)}
 
-            if pool.planting_density >= self.max_planting_density:
-                break
-            else:
-                number_fish += step
+        # Общие коэффициенты массонакопления для всех вариантов
+        all_fish: ListFish = create_list_fish(max(start_number + (number_variants - 1) * step, 0), start_mass,
+                                          self.rng)
+        simulations: int = 0
+        found: int = number_variants  # индекс первого варианта, достигшего максимальной плотности
 
-        return number_fish
+        if mode == 'bisection':
+            low: int = -1  # плотность меньше максимальной
+            high: int = number_variants  # плотность не меньше максимальной
+            while high - low > 1:
+                middle: int = (low + high) // 2
+                number_fish: int = start_number + middle * step
+                densities[number_fish] = self._simulate_density(
+                    days, ListFish.from_arrays(all_fish.mass[:number_fish], all_fish.mac[:number_fish]))
+                simulations += 1
+                if densities[number_fish] >= self.max_planting_density:
+                    high = middle
+                else:
+                    low = middle
+            found = high
+        elif mode == 'batched':
+            final_mass: np.ndarray = grow_mass(all_fish.mass, all_fish.mac, days)
+            cumulative_biomass: np.ndarray = np.concatenate(([0.0], np.cumsum(final_mass) / 1000))
+            numbers_fish: np.ndarray = start_number + np.arange(number_variants) * step
+            curve: np.ndarray = cumulative_biomass[numbers_fish] / self.pool_area
+            densities = {int(number): float(density) for number, density in zip(numbers_fish, curve)}
+            simulations = 1
+            found = int(np.searchsorted(curve >= self.max_planting_density, True))
+        else:
+            raise ValueError(f'Неизвестный способ поиска: {mode}')
+
+        return {'number_fish': start_number + found * step, 'densities': densities, 'simulations': simulations}
+
+    @staticmethod
+    def _run_attempts(cwsd: CWSD, tasks: list[tuple[int, int]], average_mass: float, seed: int | None,
+                      executor: Executor | None, batched: bool = False,
+                      design: tuple[bool, str, int] = (False, 'random', 1)) -> list[bool]:
+        """
+        Метод для проведения пробных запусков. Каждая попытка получает свой генератор случайных чисел
+         (см. _trial_rng), поэтому результат попытки не зависит от того, как она выполнялась.
+        :param cwsd: Работающее УЗВ.
+        :param tasks: Список пар (количество новой рыбы, номер попытки).
+        :param average_mass: Средняя масса новой рыбы.
+        :param seed: Общее зерно генераторов случайных чисел. Если None, то оно берется из генератора random.
+        :param executor: Исполнитель, процессы которого инициализированы функцией _init_worker.
+         Если None, то запуски выполняются последовательно.
+        :param batched: Если True, то попытки с одинаковым количеством рыбы выполняются вместе в BatchCWSD.
+        :param design: План попыток (см. _trial_macs).
+        :return: Список результатов запусков в порядке задач: True, если переполнения не было.
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+
+        if batched:
+            results: list[bool] = list()
+            for number_fish, group in groupby(tasks, key=lambda task: task[0]):
+                attempts: list[tuple[int, int]] = list(group)
+                batch_cwsd: BatchCWSD = BatchCWSD(cwsd, len(attempts))
+                batch_cwsd.add_fish(number_fish, average_mass, mac=np.stack(
+                    [_trial_macs(seed, number_fish, attempt, design) for _, attempt in attempts]))
+                results += [bool(success) for success in batch_cwsd.run_until(min_biomass=1.0)['success']]
+            return results
+
+        if executor is None:
+            results: list[bool] = list()
+            for number_fish, attempt in tasks:
+                list_fish: ListFish = ListFish.from_arrays(np.full(number_fish, average_mass, dtype=float),
+                                                           _trial_macs(seed, number_fish, attempt, design))
+                results.append(_run_trial(cwsd, list_fish, average_mass))
+            return results
+
+        return [future.result() for future in Optimization._submit_attempts(tasks, average_mass, seed, executor,
+                                                                             design)]
+
+    @staticmethod
+    def _submit_attempts(tasks: list[tuple[int, int]], average_mass: float, seed: int, executor: Executor,
+                         design: tuple[bool, str, int]) -> list[Future]:
+        """
+        Метод для отправки пробных запусков в процессы без ожидания результатов.
+        :param tasks: Список пар (количество новой рыбы, номер попытки).
+        :param average_mass: Средняя масса новой рыбы.
+        :param seed: Общее зерно генераторов случайных чисел.
+        :param executor: Исполнитель, процессы которого инициализированы функцией _init_worker.
+        :param design: План попыток (см. _trial_macs).
+        :return: Список будущих результатов в порядке задач.
+        """
+        return [executor.submit(_run_seeded_trial, (number_fish, average_mass, seed, attempt, design))
+                for number_fish, attempt in tasks]
+
+    @staticmethod
+    def _classify_attempts(successes: int, failures: int, attempts: int, stopping: str | None,
+                           only_optimal: bool, sprt_margin: float, sprt_alpha: float, sprt_beta: float) -> str | None:
+        """
+        Метод для определения результата проверки количества новой рыбы по уже проведенным попыткам.
+        :param successes: Количество удачных попыток.
+        :param failures: Количество неудачных попыток.
+        :param attempts: Наибольшее количество попыток.
+        :param stopping: Способ досрочной остановки: None, 'deterministic' или 'sprt'.
+        :param only_optimal: Если True, то важно только оптимальное количество (100% удачных попыток).
+        :param sprt_margin: Полуширина зоны безразличия вокруг 90% для 'sprt'.
+        :param sprt_alpha: Вероятность ошибочно признать долю удачных попыток не меньше 90% для 'sprt'.
+        :param sprt_beta: Вероятность ошибочно признать долю удачных попыток меньше 90% для 'sprt'.
+        :return: 'optimal' (100% удачных попыток), 'risk' (от 90% удачных попыток), 'fail' (меньше 90%)
+         или None, если нужны еще попытки.
+        """
+        # Наименьшее количество удачных попыток, при котором их доля не меньше 90%
+        required: int = next(number for number in range(attempts + 1) if float(number) / float(attempts) >= 0.9)
+
+        if successes + failures >= attempts:
+            if successes == attempts:
+                return 'optimal'
+            return 'risk' if successes >= required else 'fail'
+        if (stopping is None and not only_optimal) or failures == 0:
+            return None
+
+        # Есть хотя бы одна неудача, значит, количество уже не оптимальное
+        if only_optimal or failures > attempts - required:
+            return 'fail'
+        if stopping == 'deterministic':
+            return 'risk' if successes >= required else None
+
+        # Последовательный критерий отношения правдоподобий Вальда для доли удачных попыток
+        low: float = 0.9 - sprt_margin
+        high: float = 0.9 + sprt_margin
+        likelihood_ratio: float = successes * np.log(high / low) + failures * np.log((1 - high) / (1 - low))
+        if likelihood_ratio >= np.log((1 - sprt_beta) / sprt_alpha):
+            return 'risk'
+        if likelihood_ratio <= np.log(sprt_beta / (1 - sprt_alpha)):
+            return 'fail'
+        return None
+
+    @staticmethod
+    def _confidence(successes: int, attempts: int, result: str) -> float:
+        """
+        Метод для расчета достигнутой уверенности в результате проверки количества новой рыбы по биномиальной
+         модели: для 'optimal' и 'risk' - вероятность увидеть меньше successes удачных попыток, если бы доля
+         удачных попыток была ровно 90% (уверенность, что она не меньше 90%), для 'fail' - вероятность увидеть
+         больше удачных попыток (уверенность, что доля меньше 90%). Стратифицированная выборка уменьшает
+         разброс между попытками, поэтому для нее эта оценка осторожная.
+        :param successes: Количество удачных попыток.
+        :param attempts: Количество проведенных попыток.
+        :param result: Результат проверки: 'optimal', 'risk' или 'fail'.
+        :return: Уверенность от 0 до 1.
+        """
+        # Вероятности считаются через логарифмы, иначе биномиальные коэффициенты не помещаются во float
+        # уже при тысяче попыток
+        log_factorial: float = lgamma(attempts + 1)
+        probabilities: list[float] = [exp(log_factorial - lgamma(number + 1) - lgamma(attempts - number + 1)
+                                          + number * log(0.9) + (attempts - number) * log(0.1))
+                                      for number in range(attempts + 1)]
+        if result == 'fail':
+            return fsum(probabilities[successes + 1:])
+        return fsum(probabilities[:successes])
 
     @staticmethod
     def calculate_optimal_number_new_fish_in_current_cwsd(cwsd: CWSD, average_mass: float,
                                                           start_number: int, step: int, end_number: int,
-                                                          attempts: int = 100, print_info: bool = False) -> int:
+                                                          attempts: int = 100, print_info: bool = False,
+                                                          workers: int | None = None, seed: int | None = None,
+                                                          stopping: str | None = None,
+                                                          only_optimal: bool = False, batched: bool = False,
+                                                          observer: Observer | None = None,
+                                                          common_random_numbers: bool = False,
+                                                          sampling: str = 'random',
+                                                          cache: ResultCache | None = None) -> int:
         """
         Метод для определения оптимального количества рыбы в уже работающее узв.
         :param cwsd: Работающее УЗВ.
@@ -89,50 +456,197 @@ class Optimization:
         :param end_number: Конечный предел вариации количества.
         :param attempts: Количество проверок.
         :param print_info: Если нужно писать подробную информацию, то True, иначе - False.
+        :param workers: Количество процессов для пробных запусков. Если None, то запуски выполняются
+         последовательно в текущем процессе. УЗВ передается в каждый процесс один раз.
+        :param seed: Общее зерно генераторов случайных чисел. Каждая попытка получает собственный дочерний
+         генератор (см. _trial_rng), поэтому результат воспроизводим и не зависит от количества процессов.
+         Если None, то зерно берется из генератора random.
+        :param stopping: Способ досрочной остановки попыток (см. search_optimal_number_new_fish_in_current_cwsd).
+        :param only_optimal: Если True, то поиск заканчивается на первом количестве с неудачной попыткой.
+        :param batched: Если True, то попытки выполняются вместе в BatchCWSD.
+        :param observer: Наблюдатель, который получает события 'attempts' и 'search'.
+        :param common_random_numbers: Если True, то попытки с одним номером у всех количеств используют
+         общий поток случайных чисел (см. search_optimal_number_new_fish_in_current_cwsd).
+        :param sampling: Способ выборки коэффициентов массонакопления: 'random', 'stratified' или 'lhs'.
+        :param cache: Кэш результатов на диске (см. search_optimal_number_new_fish_in_current_cwsd).
         :return: Оптимальное количество новой рыбы.
         """
+        return Optimization.search_optimal_number_new_fish_in_current_cwsd(
+            cwsd, average_mass, start_number, step, end_number, attempts, print_info, workers, seed,
+            stopping, only_optimal, batched=batched, observer=observer,
+            common_random_numbers=common_random_numbers, sampling=sampling, cache=cache)['optimal']
+
+    @staticmethod
+    def search_optimal_number_new_fish_in_current_cwsd(cwsd: CWSD, average_mass: float,
+                                                       start_number: int, step: int, end_number: int,
+                                                       attempts: int = 100, print_info: bool = False,
+                                                       workers: int | None = None, seed: int | None = None,
+                                                       stopping: str | None = None, only_optimal: bool = False,
+                                                       sprt_margin: float = 0.05, sprt_alpha: float = 0.05,
+                                                       sprt_beta: float = 0.05, batched: bool = False,
+                                                       observer: Observer | None = None,
+                                                       common_random_numbers: bool = False,
+                                                       sampling: str = 'random',
+                                                       cache: ResultCache | None = None) -> dict:
+        """
+        Метод для определения оптимального и рискованного количества рыбы в уже работающее узв.
+        Способы досрочной остановки попыток для каждого количества:
+         None - всегда проводятся все попытки;
+         'deterministic' - попытки прекращаются, как только их результат уже не может измениться:
+          неудач стало больше 10% от attempts, или была неудача, а удачных попыток уже не меньше 90%;
+         'sprt' - после первой неудачи доля удачных попыток проверяется последовательным критерием Вальда
+          против порога 90% с зоной безразличия ±sprt_margin. Результат может отличаться от полного перебора
+          с вероятностями ошибок sprt_alpha и sprt_beta.
+        :param cwsd: Работающее УЗВ.
+        :param average_mass: Средняя масса новой рыбы.
+        :param start_number: Начальное значение варьируемого количества.
+        :param step: Шаг вариации.
+        :param end_number: Конечный предел вариации количества.
+        :param attempts: Наибольшее количество проверок для каждого количества.
+        :param print_info: Если нужно писать подробную информацию, то True, иначе - False.
+        :param workers: Количество процессов для пробных запусков (см. calculate_optimal_number_new_fish_in_current_cwsd).
+        :param seed: Зерно генератора случайных чисел (см. calculate_optimal_number_new_fish_in_current_cwsd).
+        :param stopping: Способ досрочной остановки попыток.
+        :param only_optimal: Если True, то важно только оптимальное количество: попытки прекращаются на первой
+         неудаче, и на этом же количестве поиск заканчивается.
+        :param sprt_margin: Полуширина зоны безразличия вокруг 90% для 'sprt'.
+        :param sprt_alpha: Вероятность ошибочно признать долю удачных попыток не меньше 90% для 'sprt'.
+        :param sprt_beta: Вероятность ошибочно признать долю удачных попыток меньше 90% для 'sprt'.
+        :param batched: Если True, то попытки одного количества рыбы выполняются вместе в BatchCWSD
+         (между проверками досрочной остановки). Нельзя использовать вместе с workers.
+        :param observer: Наблюдатель, который получает событие 'attempts' после проверки каждого количества
+         и событие 'search' с итогом поиска. При print_info=True события еще и печатаются.
+        :param common_random_numbers: Если True, то попытка с номером k для всех количеств рыбы использует
+         один и тот же поток случайных чисел: у количеств n и n + step первые n коэффициентов совпадают
+         (при случайной выборке), и соседние количества сравниваются на одних и тех же условиях.
+        :param sampling: Способ выборки коэффициентов массонакопления новой рыбы: 'random' - независимые
+         значения, 'stratified' - по одному значению из каждого равновероятного слоя распределения,
+         'lhs' - латинский гиперкуб по рыбам и попыткам (см. fish.stratified_macs). Стратифицированные
+         выборки уменьшают разброс результатов попыток, поэтому то же качество решения достигается
+         за меньшее количество попыток.
+        :param cache: Кэш результатов на диске. Используется, только если задано seed: ключ - состояние УЗВ,
+         аргументы, влияющие на результат, и зерно. При попадании в кэш попытки не проводятся, и события
+         наблюдателю не отправляются.
+        :return: Словарь вида {'optimal': ..., 'risk': ..., 'confidence': ..., 'attempts': {number_fish:
+         {'successes': ..., 'attempts': ..., 'result': ..., 'confidence': ...}, ...}}, где для каждого
+         проверенного количества указано количество удачных и проведенных попыток, результат: 'optimal',
+         'risk' или 'fail', и достигнутая уверенность в нем (см. _confidence). 'confidence' - наименьшая
+         уверенность среди всех проверенных количеств.
+        """
+        if stopping not in (None, 'deterministic', 'sprt'):
+            raise ValueError(f'Неизвестный способ остановки: {stopping}')
+        if sampling not in ('random', 'stratified', 'lhs'):
+            raise ValueError(f'Неизвестный способ выборки: {sampling}')
+        design: tuple[bool, str, int] = (common_random_numbers, sampling, attempts)
+        if batched and workers is not None:
+            raise ValueError('Совместные попытки нельзя выполнять в нескольких процессах')
+        if cache is not None and seed is not None:
+            return cache.cached(
+                'search_optimal_number_new_fish_in_current_cwsd',
+                {'cwsd': cwsd, 'average_mass': average_mass, 'start_number': start_number, 'step': step,
+                 'end_number': end_number, 'attempts': attempts, 'seed': seed, 'stopping': stopping,
+                 'only_optimal': only_optimal, 'sprt': (sprt_margin, sprt_alpha, sprt_beta), 'batched': batched,
+                 'common_random_numbers': common_random_numbers, 'sampling': sampling},
+                lambda: Optimization.search_optimal_number_new_fish_in_current_cwsd(
+                    cwsd, average_mass, start_number, step, end_number, attempts, print_info, workers, seed,
+                    stopping, only_optimal, sprt_margin, sprt_alpha, sprt_beta, batched, observer,
+                    common_random_numbers, sampling))
+
+        listeners: list[Observer] = [observer] if observer is not None else list()
+        if print_info:
+            listeners.append(PrintObserver())
+
         number_fish: int = start_number
         optimal_quantity: int = start_number
         risk_quantity: int = start_number
+        report: dict[int, dict] = dict()
 
-        # Сделаем вариацию параметра number_fish
-        while number_fish <= end_number:
-            if print_info:
-                print(f'Тестируем с {number_fish} рыб массой {average_mass}')
-            success_attempts: int = 0
+        executor: Executor | None = None
+        # Сколько количеств рыбы проверять одновременно, чтобы загрузить все процессы
+        numbers_per_batch: int = 1
+        # Попытки следующей порции количеств, отправленные в процессы заранее
+        prefetched: list[Future] | None = None
+        # Сколько попыток проводить между проверками досрочной остановки
+        chunk: int = attempts if stopping is None and not only_optimal else 1
+        if seed is None:
+            seed = random.getrandbits(64)
+        if workers is not None:
+            executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cwsd,))
+            if chunk == attempts:
+                numbers_per_batch = max(1, -(-workers // attempts))
+            else:
+                chunk = workers
+        elif batched and chunk < attempts:
+            # Совместные попытки проводятся десятыми долями, чтобы досрочная остановка имела смысл
+            chunk = max(1, attempts // 10)
 
-            for _ in range(attempts):
-                test_cwsd: CWSD = deepcopy(cwsd)
-                list_fish: ListFish = create_list_fish(number_fish, average_mass)
+        try:
+            # Сделаем вариацию параметра number_fish
+            while number_fish <= end_number:
+                numbers_fish: list[int] = list(range(number_fish, end_number + 1, step)[:numbers_per_batch])
+                tasks: list[tuple[int, int]] = [(number, attempt) for number in numbers_fish
+                                                for attempt in range(min(chunk, attempts))]
+                outcomes: dict[int, list[bool]] = {number: list() for number in numbers_fish}
+                results: list[bool]
+                if executor is not None and chunk == attempts:
+                    # Пока проверяется эта порция, процессы уже считают попытки следующей, поэтому они
+                    # не простаивают на границе порций. Если поиск остановится, эти попытки отменяются
+                    futures: list[Future] = prefetched if prefetched is not None else \
+                        Optimization._submit_attempts(tasks, average_mass, seed, executor, design)
+                    next_tasks: list[tuple[int, int]] = [
+                        (number, attempt)
+                        for number in range(numbers_fish[-1] + step, end_number + 1, step)[:numbers_per_batch]
+                        for attempt in range(attempts)]
+                    prefetched = Optimization._submit_attempts(next_tasks, average_mass, seed, executor, design) \
+                        if next_tasks else None
+                    results = [future.result() for future in futures]
+                else:
+                    results = Optimization._run_attempts(cwsd, tasks, average_mass, seed, executor, batched, design)
+                for task, outcome in zip(tasks, results):
+                    outcomes[task[0]].append(outcome)
 
-                # Если есть пустой бассейн, добавим в него рыбу
-                if not test_cwsd.add_fish(list_fish):
-                    # Если пустых бассейнов нет, добавим в близкий по средней массе
-                    test_cwsd.add_fish_in_not_empty_pool(average_mass, list_fish)
+                stop: bool = False
+                for number_fish in numbers_fish:
+                    # Проведем попытки, пока результат не станет известен
+                    result: str | None
+                    while True:
+                        success_attempts: int = sum(outcomes[number_fish])
+                        result = Optimization._classify_attempts(
+                            success_attempts, len(outcomes[number_fish]) - success_attempts, attempts, stopping,
+                            only_optimal, sprt_margin, sprt_alpha, sprt_beta)
+                        if result is not None:
+                            break
+                        done: int = len(outcomes[number_fish])
+                        tasks = [(number_fish, attempt) for attempt in range(done, min(done + chunk, attempts))]
+                        outcomes[number_fish] += Optimization._run_attempts(cwsd, tasks, average_mass, seed,
+                                                                            executor, batched, design)
 
-                # Начнем ежедневную работу, пока биомасса не опуститься ниже 1 кг, или пока не произойдет переполнение
-                success: bool = True
-                while test_cwsd.biomass > 1.0:
-                    result: dict[str, float] | None = test_cwsd.daily_growth(print_info=False)
+                    report[number_fish] = {'successes': success_attempts, 'attempts': len(outcomes[number_fish]),
+                                           'result': result,
+                                           'confidence': Optimization._confidence(
+                                               success_attempts, len(outcomes[number_fish]), result)}
+                    event: Event = Event('attempts', cwsd.days, {'number_fish': number_fish,
+                                                                'average_mass': average_mass, **report[number_fish]})
+                    for listener in listeners:
+                        listener.notify(event)
 
-                    if result is None:
-                        success = False
+                    if result == 'optimal':
+                        optimal_quantity = number_fish
+                    if result in ('optimal', 'risk'):
+                        risk_quantity = number_fish
+                        number_fish += step
+                    else:
+                        event = Event('search', cwsd.days, {'optimal': optimal_quantity, 'risk': risk_quantity,
+                                                            'attempts': attempts, 'successes': success_attempts,
+                                                            'tested': len(outcomes[number_fish])})
+                        for listener in listeners:
+                            listener.notify(event)
+                        stop = True
                         break
-                if success:
-                    success_attempts += 1
-            if print_info:
-                print(f'Было {success_attempts} попыток из {attempts}')
-
-            if success_attempts == attempts:
-                optimal_quantity = number_fish
-            if float(success_attempts) / float(attempts) >= 0.9:
-                risk_quantity = number_fish
-                number_fish += step
-            else:
-                if print_info:
-                    print(f'Оптимальное значение количества новой рыбы, при котором не происходит переполнение в'
-                          f' {attempts} из {attempts} случаев, равно {optimal_quantity}.\n'
-                          f'Рискованное значение количества новой рыбы, при котором не происходит переполнение в 90% и'
-                          f' выше (в {success_attempts} случаях из {attempts}), равно {risk_quantity}.')
-                break
-        return optimal_quantity
+                if stop:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        confidence: float = min((item['confidence'] for item in report.values()), default=0.0)
+        return {'optimal': optimal_quantity, 'risk': risk_quantity, 'confidence': confidence, 'attempts': report}
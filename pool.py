@@ -1,13 +1,108 @@
-from fish import Fish, ListFish
+from copy import copy
+
+import numpy as np
+
+from backend import Backend, get_backend
+from fish import ListFish, MassStatistics, first_day
+
+
+def _compensated_add(sums: np.ndarray, error: np.ndarray, terms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Функция для сложения массивов сумм с компенсацией ошибок округления (алгоритм Ноймайера).
+     Потерянные младшие разряды копятся в отдельном массиве, поэтому многократные добавления
+     и удаления рыбы не накапливают ошибку.
+    :param sums: Массив сумм.
+    :param error: Массив накопленных поправок к суммам.
+    :param terms: Массив слагаемых.
+    :return: Новые массивы сумм и поправок.
+    """
+    new_sums: np.ndarray = sums + terms
+    lost: np.ndarray = np.where(np.abs(sums) >= np.abs(terms), (sums - new_sums) + terms, (terms - new_sums) + sums)
+    return new_sums, error + lost
+
+
+def _shift_power_sums(sums: np.ndarray, days: int) -> np.ndarray:
+    """
+    Функция для пересчета сумм при переносе начала отсчета времени на несколько суток вперед
+     (корни a заменяются на a + b * days).
+    :param sums: Массив [Σa^3, Σa^2*b, Σa*b^2, Σb^3].
+    :param days: Количество суток.
+    :return: Новый массив сумм.
+    """
+    s0, s1, s2, s3 = sums
+    return np.array([s0 + 3 * days * s1 + 3 * days ** 2 * s2 + days ** 3 * s3,
+                     s1 + 2 * days * s2 + days ** 2 * s3,
+                     s2 + days * s3,
+                     s3])
+
+
+def _envelope(roots: np.ndarray, rates: np.ndarray, upper: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Функция для построения огибающей прямых a + b * t при t >= 0: в любом возрасте наибольший (или наименьший)
+     корень дает одна из прямых огибающей. Сначала отбрасываются прямые, у которых и корень, и прирост
+     не больше, чем у другой прямой, потом по оставшимся прямым строится огибающая.
+    :param roots: Корни a.
+    :param rates: Приросты b.
+    :param upper: Если True, то строится огибающая наибольших корней, иначе - наименьших.
+    :return: Возрасты, начиная с которых прямые огибающей дают крайний корень, и корни и приросты этих прямых.
+    """
+    if len(roots) == 0:
+        return np.empty(0), np.empty(0), np.empty(0)
+    sign: int = 1 if upper else -1
+    order: np.ndarray = np.lexsort((-sign * roots, -sign * rates))
+    roots, rates = sign * roots[order], sign * rates[order]
+    front: np.ndarray = np.concatenate(([True], roots[1:] > np.maximum.accumulate(roots)[:-1]))
+
+    # Прямые идут по возрастанию прироста и убыванию корня, каждая обгоняет предыдущую
+    starts: list[float] = list()
+    lines: list[tuple[float, float]] = list()
+    for root, rate in zip(roots[front][::-1].tolist(), rates[front][::-1].tolist()):
+        start: float = 0.0
+        while lines:
+            start = (lines[-1][0] - root) / (rate - lines[-1][1])
+            if start > starts[-1]:
+                break
+            starts.pop()
+            lines.pop()
+            start = 0.0
+        starts.append(start)
+        lines.append((root, rate))
+    return np.array(starts), sign * np.array([line[0] for line in lines]), sign * np.array([line[1] for line in lines])
+
+
+def _envelope_root(envelope: tuple[np.ndarray, np.ndarray, np.ndarray], age: int) -> float:
+    """
+    Функция для получения крайнего корня в указанном возрасте по огибающей (см. _envelope).
+    :param envelope: Возрасты начала, корни и приросты прямых огибающей.
+    :param age: Возраст.
+    :return: Крайний корень.
+    """
+    starts, roots, rates = envelope
+    line: int = int(np.searchsorted(starts, age, side='right')) - 1
+    return float(roots[line] + rates[line] * age)
 
 
 class Pool:
     """
-    Класс отвечающий за работу бассейна
+    Класс отвечающий за работу бассейна.
+    Кубический корень из массы каждой рыбы растет линейно: (a + b * t)^3, где a - корень из массы
+     в момент последнего добавления рыбы, b = mac / 3, t - количество суток с этого момента. Поэтому
+     биомасса бассейна - многочлен третьей степени от t, коэффициенты которого выражаются через суммы
+     Σa^3, Σa^2*b, Σa*b^2 и Σb^3. Бассейн хранит эти суммы, и суточный рост не трогает отдельных рыб.
+     Массы рыб вычисляются только тогда, когда они нужны (продажа, распределение рыбы).
+    Массивы бассейна никогда не изменяются на месте, а только заменяются новыми. Поэтому копии бассейна
+     могут использовать одни и те же массивы, пока одна из копий не изменит свою рыбу.
+    Порядок рыбы по массе меняется при росте, поэтому бассейн не пересортировывает рыбу каждые сутки.
+     Массивы считаются отсортированными, только если с момента сортировки рыба не росла. Тогда новая рыба
+     вливается в них слиянием, а удаление k крайних рыб - это срез. Иначе новая рыба просто дописывается
+     в конец, а k самых больших или маленьких рыб выбираются частичным разбиением за O(n).
+    Работа, которая просматривает всю рыбу бассейна, выполняется вычислителем backend (см. backend.Backend).
     """
-    def __init__(self, area: float, mass_index: int):
+    def __init__(self, area: float, mass_index: int, feed_ratio: float = 1.5, backend: str | Backend | None = None):
         self._area: float = area
+        self.backend: Backend = get_backend(backend)
         self.mass_index: int = mass_index
+        self.feed_ratio: float = feed_ratio  # кормовой коэффициент
 
         self.biomass: float = 0.0
         self.number_fish: int = 0
@@ -15,40 +110,203 @@ class Pool:
         self.average_mass: float = 0.0
         self.planting_density: float = 0.0
 
-        self.fishes: list[Fish] = list()
+        self._roots: np.ndarray = np.empty(0)
+        self._rates: np.ndarray = np.empty(0)
+        self._age: int = 0  # количество суток с момента последнего добавления
+        self._sorted_age: int | None = 0  # возраст, в котором массивы были отсортированы по массе
+        self._sums: np.ndarray = np.zeros(4)
+        self._sums_error: np.ndarray = np.zeros(4)  # поправки к суммам из-за ошибок округления
+        self._fishes: ListFish | None = None  # массы рыб, вычисленные для текущего возраста
+        # Отсортированные возрасты, в которые рыбы достигают массы, и порядок рыб по этим возрастам
+        self._crossing: dict[float, tuple[np.ndarray, np.ndarray]] = dict()
+        # Статистика масс рыб и возраст, для которого она посчитана
+        self._statistics: tuple[int, MassStatistics] | None = None
+        # Огибающие наименьших и наибольших корней (см. _envelope), None - огибающую нужно построить заново
+        self._envelopes: tuple[tuple | None, tuple | None] = (_envelope(self._roots, self._rates, False),
+                                                              _envelope(self._roots, self._rates, True))
+
+    @property
+    def fishes(self) -> ListFish:
+        """
+        Рыба в бассейне (в порядке хранения, который не обязательно совпадает с порядком по массе).
+         Массы вычисляются при первом обращении после изменения бассейна.
+        :return: Список рыб.
+        """
+        if self._fishes is None:
+            self._fishes = ListFish.from_arrays(self.backend.grow_roots(self._roots, self._rates, self._age) ** 3,
+                                                self._rates * 3)
+        return self._fishes
+
+    def copy(self) -> 'Pool':
+        """
+        Метод для быстрого копирования бассейна. Массивы рыб не копируются, а используются совместно
+         с исходным бассейном до первого изменения рыбы в одном из них.
+        :return: Копия бассейна.
+        """
+        return copy(self)
+
+    def get_state(self) -> tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Метод для получения состояния бассейна для сохранения на диск. Рыба хранится так же, как в бассейне:
+         кубические корни масс на момент последнего добавления рыбы и их суточные приросты (mac / 3).
+        :return: Массив корней, массив приростов и словарь с остальными параметрами бассейна.
+        """
+        return self._roots, self._rates, {'area': self._area, 'mass_index': self.mass_index,
+                                          'feed_ratio': self.feed_ratio, 'age': self._age,
+                                          'sorted_age': self._sorted_age, 'sums': self._sums.tolist(),
+                                          'sums_error': self._sums_error.tolist()}
+
+    @classmethod
+    def from_state(cls, roots: np.ndarray, rates: np.ndarray, info: dict,
+                   backend: str | Backend | None = None) -> 'Pool':
+        """
+        Метод для восстановления бассейна из сохраненного состояния. Массивы не копируются и не читаются,
+         поэтому могут быть отображены в память с диска (массивы бассейна никогда не изменяются на месте).
+        :param roots: Массив корней (см. get_state).
+        :param rates: Массив приростов корней.
+        :param info: Словарь с остальными параметрами бассейна.
+        :param backend: Вычислитель (см. backend.get_backend).
+        :return: Бассейн.
+        """
+        pool: Pool = cls(info['area'], info['mass_index'], info['feed_ratio'], backend=backend)
+        pool._roots = roots
+        pool._rates = rates
+        pool._age = info['age']
+        pool._sorted_age = info['sorted_age']
+        pool._sums = np.array(info['sums'])
+        pool._sums_error = np.array(info['sums_error'])
+        pool._envelopes = (None, None)
+        pool.number_fish = len(roots)
+        pool._update_info()
+        return pool
+
+    def _calculate_biomass(self, age: int) -> float:
+        """
+        Метод для расчета биомассы бассейна в указанном возрасте по сохраненным суммам.
+        :param age: Количество суток с момента последнего добавления рыбы.
+        :return: Биомасса в кг.
+        """
+        s0, s1, s2, s3 = self._sums + self._sums_error
+        return float(s0 + 3 * age * s1 + 3 * age ** 2 * s2 + age ** 3 * s3) / 1000
 
     def _update_info(self):
         """
         Метод для обновления информации о рыбе в бассейне.
         :return: Ничего
         """
-        if len(self.fishes) == 0:
+        if self.number_fish == 0:
+            self._sums = np.zeros(4)
+            self._sums_error = np.zeros(4)
             self.biomass = 0.0
-            self.number_fish = 0
             self.average_mass = 0.0
             self.planting_density = 0.0
         else:
+            self.biomass = self._calculate_biomass(self._age)
             self.average_mass = self.biomass / self.number_fish * 1000  # в граммах
             self.planting_density = self.biomass / self._area
 
+    def _is_sorted(self) -> bool:
+        """
+        Метод, который сообщает, отсортированы ли массивы рыбы по текущей массе.
+        :return: True, если отсортированы, иначе - False.
+        """
+        return self._sorted_age == self._age or self.number_fish <= 1
+
     def add_new_fishes(self, new_fish: ListFish):
         """
         Метод для добавления новых рыбок в бассейн.
         :param new_fish: Список новых рыбок.
         :return: Ничего.
         """
-        for fish in new_fish.list_fish:
-            self.fishes.append(fish)
+        self._add_block(np.cbrt(new_fish.mass), new_fish.mac / 3, ordered=False)
+
+    def _add_block(self, new_roots: np.ndarray, new_rates: np.ndarray, ordered: bool):
+        """
+        Метод для добавления блока рыбы, заданного корнями текущих масс и их суточными приростами.
+        :param new_roots: Кубические корни масс новой рыбы.
+        :param new_rates: Суточные приросты корней (mac / 3).
+        :param ordered: True, если блок уже отсортирован по возрастанию массы.
+        :return: Ничего.
+        """
+        # Перенесем начало отсчета времени на текущие сутки
+        roots: np.ndarray = self.backend.grow_roots(self._roots, self._rates, self._age)
+        self._sums, self._sums_error = _compensated_add(
+            _shift_power_sums(self._sums, self._age), _shift_power_sums(self._sums_error, self._age),
+            self.backend.power_sums(new_roots, new_rates))
+        # Прямая, которая не лежит на огибающей, не попадет на нее и после добавления рыбы,
+        # поэтому новые огибающие строятся только по старым огибающим и новой рыбе
+        self._envelopes = tuple(
+            None if envelope is None else _envelope(np.concatenate((envelope[1] + envelope[2] * self._age, new_roots)),
+                                                    np.concatenate((envelope[2], new_rates)), upper)
+            for upper, envelope in zip((False, True), self._envelopes))
+
+        if self._is_sorted():
+            # Вольем отсортированную новую рыбу в отсортированные массивы
+            if not ordered:
+                order: np.ndarray = np.argsort(new_roots, kind='stable')
+                new_roots, new_rates = new_roots[order], new_rates[order]
+            positions: np.ndarray = np.searchsorted(roots, new_roots, side='right')
+            self._roots = np.insert(roots, positions, new_roots)
+            self._rates = np.insert(self._rates, positions, new_rates)
+            self._sorted_age = 0
+        else:
+            self._roots = np.concatenate((roots, new_roots))
+            self._rates = np.concatenate((self._rates, new_rates))
+            self._sorted_age = None
+        self._age = 0
+        self._fishes = None
+        self._crossing = dict()
+        self._statistics = None
 
         # Обновим информацию о рыбе в бассейне
-        self.biomass += new_fish.get_biomass()
-        self.number_fish += new_fish.get_number_fish()
+        self.number_fish += len(new_roots)
+        self._update_info()
+
+    def _remove_block(self, number_fish: int, biggest_fish: bool) -> tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Метод для удаления блока крайних по массе рыб.
+        :param number_fish: Количество удаляемых рыб (не больше количества рыбы в бассейне).
+        :param biggest_fish: Если True, то удаляет самые большие рыбы, иначе - самые маленькие.
+        :return: Кубические корни текущих масс удаленных рыб, их суточные приросты и True, если блок
+         отсортирован по возрастанию массы (иначе порядок произвольный).
+        """
+        roots: np.ndarray = self.backend.grow_roots(self._roots, self._rates, self._age)
+        removed: np.ndarray | slice
+        kept: np.ndarray | slice
+        ordered: bool = True
+
+        if self._is_sorted() or number_fish in (0, self.number_fish):
+            if not self._is_sorted() and number_fish > 0:
+                # Удаляется вся рыба, отсортируем ее
+                order: np.ndarray = np.argsort(roots, kind='stable')
+                roots, self._roots, self._rates = roots[order], self._roots[order], self._rates[order]
+            border: int = self.number_fish - number_fish if biggest_fish else number_fish
+            removed = slice(border, None) if biggest_fish else slice(0, border)
+            kept = slice(0, border) if biggest_fish else slice(border, None)
+        else:
+            # Выберем крайние рыбы частичным разбиением без полной сортировки
+            removed, kept = self.backend.select_extreme(roots, number_fish, biggest_fish)
+            ordered = False
+            self._sorted_age = None
 
-        # Отсортируем рыбу по массе
-        self.fishes.sort(key=lambda item: item.mass)
+        removed_roots: np.ndarray = roots[removed]
+        removed_rates: np.ndarray = self._rates[removed]
+        # Огибающая остается верной, если ни одна ее прямая не удалена
+        self._envelopes = tuple(
+            None if envelope is None or np.isin(envelope[1], self._roots[removed]).any() else envelope
+            for envelope in self._envelopes)
+        self._sums, self._sums_error = _compensated_add(self._sums, self._sums_error,
+                                                        -self.backend.power_sums(self._roots[removed], removed_rates))
+        self._roots = self._roots[kept]
+        self._rates = self._rates[kept]
+        self._fishes = None
+        self._crossing = dict()
+        self._statistics = None
+        self.number_fish -= number_fish
 
         # Обновим информацию о рыбе в бассейне
         self._update_info()
+        return removed_roots, removed_rates, ordered
 
     def remove_fish(self, number_fish: int, biggest_fish: bool = True) -> ListFish:
         """
@@ -56,28 +314,60 @@ class Pool:
         :param number_fish: Количество удаляемых рыб.
         :param biggest_fish: Если True, то удаляет самые большие рыбы,
          иначе - самые маленькие.
-        :return: Список удаленных рыб
+        :return: Список удаленных рыб (от крайней по массе рыбы к середине)
         """
         if number_fish > self.number_fish:
             print('Попытка удалить рыбы больше чем есть в бассейне!')
         else:
-            removed_fish: list[Fish] = list()
+            removed_roots, removed_rates, ordered = self._remove_block(number_fish, biggest_fish)
+            if not ordered:
+                order: np.ndarray = np.argsort(removed_roots, kind='stable')
+                removed_roots, removed_rates = removed_roots[order], removed_rates[order]
 
-            for _ in range(number_fish):
-                fish: Fish
-                if biggest_fish:
-                    fish = self.fishes.pop(-1)
-                else:
-                    fish = self.fishes.pop(0)
+            # Удаленные рыбы идут от крайней по массе рыбы к середине
+            if biggest_fish:
+                removed_roots, removed_rates = removed_roots[::-1], removed_rates[::-1]
+            return ListFish.from_arrays(removed_roots ** 3, removed_rates * 3)
 
-                self.biomass -= fish.mass / 1000
-                self.number_fish -= 1
-                removed_fish.append(fish)
+    def transfer_fish(self, destination: 'Pool', number_fish: int, biggest_fish: bool = True) -> int:
+        """
+        Метод для перемещения крайних по массе рыб в другой бассейн одним блоком: корни масс и приросты
+         переносятся напрямую, без промежуточного списка рыб и пересчета масс.
+        :param destination: Бассейн, в который перемещается рыба.
+        :param number_fish: Количество перемещаемых рыб.
+        :param biggest_fish: Если True, то перемещаются самые большие рыбы, иначе - самые маленькие.
+        :return: Количество перемещенных рыб.
+        """
+        if number_fish > self.number_fish:
+            print('Попытка удалить рыбы больше чем есть в бассейне!')
+            return 0
+        destination._add_block(*self._remove_block(number_fish, biggest_fish))
+        return number_fish
 
-            # Обновим информацию о рыбе в бассейне
-            self._update_info()
+    def grow(self, days: int) -> dict[str, float]:
+        """
+        Метод для расчета выращивания всей рыбы в этом бассейне за несколько суток сразу.
+        :param days: Количество суток.
+        :return: Возвращает словарь с информацией о приросте биомассы
+         и затраченном корме на бассейн за все эти сутки.
+        Словарь имеет вид:
+        {'biomass_increase': ..., 'spent_feed': ...}
+        """
+        if days <= 0 or self.is_empty():
+            return {'biomass_increase': 0.0, 'spent_feed': 0.0}
+
+        previous_biomass: float = self.biomass
+        self._age += days
+        self._fishes = None
+
+        # Обновим информацию о рыбе в бассейне
+        self._update_info()
 
-            return ListFish(removed_fish)
+        # Затраченный корм пропорционален приросту массы с кормовым коэффициентом
+        biomass_increase: float = self.biomass - previous_biomass
+        spent_feed: float = biomass_increase * self.feed_ratio
+
+        return {'biomass_increase': biomass_increase, 'spent_feed': spent_feed}
 
     def daily_growth(self) -> dict[str, float]:
         """
@@ -87,19 +377,128 @@ class Pool:
         Словарь имеет вид:
         {'biomass_increase': ..., 'spent_feed': ...}
         """
-        biomass_increase: float = 0.0
-        spent_feed: float = 0.0
+        return self.grow(1)
 
-        for fish in self.fishes:
-            daily_result: dict[str, float] = fish.daily_growth()
-            biomass_increase += daily_result['mass_increase'] / 1000
-            spent_feed += daily_result['required_feed'] / 1000
+    def get_biomass_after(self, days: int) -> float:
+        """
+        Метод для расчета биомассы бассейна через несколько суток без изменения бассейна.
+        :param days: Количество суток.
+        :return: Биомасса в кг.
+        """
+        if self.is_empty():
+            return 0.0
+        return self._calculate_biomass(self._age + days)
 
-        # Обновим информацию о рыбе в бассейне
-        self.biomass += biomass_increase
-        self._update_info()
+    def days_to_density(self, density: float, max_days: int) -> int | None:
+        """
+        Метод для расчета количества суток, через которое плотность посадки достигнет указанной.
+        :param density: Плотность посадки в кг/м^2.
+        :param max_days: Наибольшее количество суток для поиска.
+        :return: Количество суток (от 1 до max_days). Если плотность не будет достигнута, то None.
+        """
+        if self.is_empty():
+            return None
+        return first_day(lambda days: self.get_biomass_after(days) / self._area >= density, max_days)
 
-        return {'biomass_increase': biomass_increase, 'spent_feed': spent_feed}
+    def _crossing_ages(self, mass: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод для получения отсортированных возрастов бассейна, в которые рыбы достигают указанной массы.
+         Возрасты считаются один раз после каждого изменения рыбы в бассейне.
+        :param mass: Масса рыбы в г.
+        :return: Отсортированный массив возрастов (-inf - рыба всегда не легче, inf - никогда)
+         и номера рыб в этом порядке.
+        """
+        if mass not in self._crossing:
+            ages: np.ndarray = self.backend.crossing_ages(self._roots, self._rates, mass)
+            order: np.ndarray = np.argsort(ages, kind='stable')
+            self._crossing[mass] = (ages[order], order)
+        return self._crossing[mass]
+
+    def _count_fish_not_lighter_at(self, mass: float, age: int) -> int:
+        """
+        Метод для подсчета рыб не легче указанной массы в указанном возрасте бассейна бинарным поиском
+         по возрастам достижения массы. Рыбы на границе проверяются точным расчетом массы.
+        :param mass: Масса рыбы в г.
+        :param age: Возраст бассейна.
+        :return: Количество рыб.
+        """
+        ages, order = self._crossing_ages(mass)
+        count: int = int(np.searchsorted(ages, age, side='right'))
+
+        # Поправим ошибки округления для рыб, которые достигают массы почти в этот же возраст
+        low: int = int(np.searchsorted(ages, ages[max(count - 2, 0)], side='left'))
+        high: int = int(np.searchsorted(ages, ages[min(count + 1, len(ages) - 1)], side='right'))
+        border: np.ndarray = order[low:high]
+        return low + self.backend.count_not_lighter(self._roots[border], self._rates[border], age, mass)
+
+    def count_fish_not_lighter(self, mass: float) -> int:
+        """
+        Метод для подсчета рыб, масса которых не меньше указанной.
+        :param mass: Масса рыбы в г.
+        :return: Количество рыб.
+        """
+        if self.is_empty():
+            return 0
+        return self._count_fish_not_lighter_at(mass, self._age)
+
+    def statistics(self, bins: np.ndarray | None = None) -> MassStatistics:
+        """
+        Метод для получения статистики масс рыб в бассейне. Количество и биомасса берутся из сохраненных
+         сумм, наименьшая и наибольшая масса - из концов массивов, если они отсортированы, иначе - из огибающих
+         корней (см. _envelope), которые обновляются при добавлении рыбы и строятся заново, только если
+         удаление рыбы задело их прямые. Гистограмма считается бинарным поиском по возрастам, в которые
+         рыбы достигают границ интервалов, поэтому при суточном росте рыба не просматривается.
+        :param bins: Границы интервалов масс для гистограммы. Если None, то гистограмма не считается.
+        :return: Статистика масс.
+        """
+        if self._statistics is None or self._statistics[0] != self._age:
+            statistics: MassStatistics = MassStatistics(self.number_fish, self.biomass)
+            if not self.is_empty():
+                if self._is_sorted():
+                    extreme_roots: np.ndarray = self._roots[[0, -1]] + self._rates[[0, -1]] * self._age
+                else:
+                    self._envelopes = tuple(_envelope(self._roots, self._rates, upper) if envelope is None
+                                            else envelope for upper, envelope in zip((False, True), self._envelopes))
+                    extreme_roots = np.array([_envelope_root(envelope, self._age) for envelope in self._envelopes])
+                statistics.min_mass, statistics.max_mass = (float(root) ** 3 for root in extreme_roots)
+            self._statistics = (self._age, statistics)
+
+        if bins is None:
+            return self._statistics[1]
+
+        cached: MassStatistics = self._statistics[1]
+        not_lighter: np.ndarray = np.array([self.count_fish_not_lighter(float(edge)) for edge in bins])
+        return MassStatistics(cached.number_fish, cached.biomass, cached.min_mass, cached.max_mass,
+                              bins, not_lighter[:-1] - not_lighter[1:])
+
+    def days_to_commercial(self, commercial_fish_mass: float, min_package: int, max_days: int) -> int | None:
+        """
+        Метод для расчета количества суток, через которое в бассейне вырастет пакет товарной рыбы
+         (либо вырастет вся рыба).
+        :param commercial_fish_mass: Масса товарной рыбы в г.
+        :param min_package: Минимальный размер пакета на продажу.
+        :param max_days: Наибольшее количество суток для поиска.
+        :return: Количество суток (от 1 до max_days). Если пакет не вырастет, то None.
+        """
+        if self.is_empty():
+            return None
+
+        # Пакет готов, когда выросла min_package-я по скорости рыба или вся рыба
+        package: int = min(max(min_package, 1), self.number_fish)
+        package_age: float = float(self._crossing_ages(commercial_fish_mass)[0][package - 1])
+        if package_age - self._age > max_days + 1:
+            return None
+
+        # -inf: рыба не растет, но уже не легче товарной массы, пакет готов сразу
+        days: int = max(int(np.ceil(package_age - self._age)), 1) if np.isfinite(package_age) else 1
+        # Поправим ошибки округления точным подсчетом
+        while days > 1 and self._count_fish_not_lighter_at(commercial_fish_mass, self._age + days - 1) >= package:
+            days -= 1
+        while self._count_fish_not_lighter_at(commercial_fish_mass, self._age + days) < package:
+            days += 1
+        if days > max_days:
+            return None
+        return days
 
     def is_empty(self) -> bool:
         """
@@ -116,7 +515,9 @@ class Pool:
         Метод для печати информации о рыбе в бассейне.
         :return: Ничего
         """
-        print(f'Биомасса в бассейне: {self.biomass} кг.\n'
-              f'Количество рыбы в бассейне: {self.number_fish} шт.\n'
-              f'Средняя масса рыбы: {self.average_mass} г.\n'
+        statistics: MassStatistics = self.statistics()
+        print(f'Биомасса в бассейне: {statistics.biomass} кг.\n'
+              f'Количество рыбы в бассейне: {statistics.number_fish} шт.\n'
+              f'Средняя масса рыбы: {statistics.average_mass} г.\n'
+              f'Масса рыбы: от {statistics.min_mass} до {statistics.max_mass} г.\n'
               f'Плотность посадки: {self.planting_density} кг/м^2.')
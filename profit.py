@@ -1,12 +1,186 @@
 from cwsd import CWSD
+from collections import OrderedDict
 from datetime import date
 from optimization import Optimization
 from fish import create_list_fish
+from pool import Pool
+
+import numpy as np
+
+
+class DecisionCache:
+    """
+    Класс для запоминания количества новой рыбы, выбранного для состояния УЗВ.
+     Состояние округляется: количество рыбы в каждом бассейне - до count_quantum штук, средняя масса -
+     до mass_quantum грамм. Бассейны берутся по порядку массовых индексов. При переполнении кэша
+     удаляется решение, которое дольше всего не использовалось.
+    """
+    def __init__(self, max_size: int = 64, count_quantum: int = 10, mass_quantum: float = 10.0):
+        self.max_size: int = max_size
+        self.count_quantum: int = count_quantum
+        self.mass_quantum: float = mass_quantum
+        self._decisions: OrderedDict[tuple, int] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def key(self, cwsd: CWSD, fry_mass: float) -> tuple:
+        """
+        Метод для получения ключа кэша по состоянию УЗВ.
+        :param cwsd: Работающее УЗВ.
+        :param fry_mass: Масса новой рыбы.
+        :return: Кортеж (масса новой рыбы, ((округленное количество, округленная масса), ...)).
+        """
+        pools: list[Pool] = sorted(cwsd.pools, key=lambda pool: pool.mass_index)
+        return (fry_mass, tuple((round(pool.number_fish / self.count_quantum),
+                                 round(pool.average_mass / self.mass_quantum)) for pool in pools))
+
+    def get(self, key: tuple) -> int | None:
+        """
+        Метод для получения запомненного решения.
+        :param key: Ключ состояния.
+        :return: Количество новой рыбы или None, если решения нет.
+        """
+        if key not in self._decisions:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._decisions.move_to_end(key)
+        return self._decisions[key]
+
+    def nearest(self, key: tuple) -> int | None:
+        """
+        Метод для поиска решения для ближайшего запомненного состояния с той же массой новой рыбы.
+        :param key: Ключ состояния.
+        :return: Количество новой рыбы или None, если подходящих решений нет.
+        """
+        fry_mass, state = key
+        best: int | None = None
+        best_distance: float = float('inf')
+        for (cached_fry_mass, cached_state), decision in self._decisions.items():
+            if cached_fry_mass != fry_mass or len(cached_state) != len(state):
+                continue
+            distance: float = sum((count - cached_count) ** 2 + (mass - cached_mass) ** 2
+                                  for (count, mass), (cached_count, cached_mass) in zip(state, cached_state))
+            if distance < best_distance:
+                best, best_distance = decision, distance
+        return best
+
+    def put(self, key: tuple, decision: int):
+        """
+        Метод для запоминания решения.
+        :param key: Ключ состояния.
+        :param decision: Количество новой рыбы.
+        :return: Ничего.
+        """
+        if self.max_size <= 0:
+            return
+        self._decisions[key] = decision
+        self._decisions.move_to_end(key)
+        while len(self._decisions) > self.max_size:
+            self._decisions.popitem(last=False)
+
+
+class ProfitTrace:
+    """
+    Класс для биологического следа работы УЗВ в Profit: по суткам - потраченный корм, проданная биомасса
+     и количество купленной новой рыбы каждой массы. Цены не влияют на рост рыбы, поэтому по одному следу
+     можно посчитать денежный поток для любого количества наборов цен сразу (см. evaluate).
+    """
+    def __init__(self, fry_mass: list[float]):
+        """
+        __init__
+        :param fry_mass: Массы новой рыбы в порядке prices_for_fry.
+        """
+        self.fry_mass: np.ndarray = np.array(fry_mass, dtype=float)
+        self._days: list[int] = list()
+        self._spent_feed: list[float] = list()
+        self._sold_biomass: list[float] = list()
+        self._fry_counts: list[np.ndarray] = list()
+
+    def append(self, day: int, spent_feed: float, sold_biomass: float, fry_counts: np.ndarray):
+        """
+        Метод для добавления суток в след.
+        :param day: Номер суток работы УЗВ.
+        :param spent_feed: Потраченный корм в кг.
+        :param sold_biomass: Проданная биомасса в кг.
+        :param fry_counts: Количество купленной новой рыбы каждой массы.
+        :return: Ничего.
+        """
+        self._days.append(day)
+        self._spent_feed.append(spent_feed)
+        self._sold_biomass.append(sold_biomass)
+        self._fry_counts.append(fry_counts)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    @property
+    def days(self) -> np.ndarray:
+        """
+        Номера суток работы УЗВ.
+        :return: Массив по суткам.
+        """
+        return np.array(self._days, dtype=int)
+
+    @property
+    def spent_feed(self) -> np.ndarray:
+        """
+        Потраченный корм по суткам в кг.
+        :return: Массив по суткам.
+        """
+        return np.array(self._spent_feed, dtype=float)
+
+    @property
+    def sold_biomass(self) -> np.ndarray:
+        """
+        Проданная биомасса по суткам в кг.
+        :return: Массив по суткам.
+        """
+        return np.array(self._sold_biomass, dtype=float)
+
+    @property
+    def fry_counts(self) -> np.ndarray:
+        """
+        Количество купленной новой рыбы.
+        :return: Массив (сутки × массы новой рыбы).
+        """
+        return np.array(self._fry_counts, dtype=float).reshape(len(self), len(self.fry_mass))
+
+    def evaluate(self, feed_cost: float | np.ndarray, fish_cost: float | np.ndarray,
+                 fry_prices: list[float] | np.ndarray, start_up_capital: float | np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Метод для расчета денежного потока по следу для нескольких наборов цен одним матричным расчетом.
+         Расчет такой же, как в Profit.iter_days.
+        :param feed_cost: Стоимость килограмма корма: число или массив (наборы цен).
+        :param fish_cost: Стоимость килограмма рыбы: число или массив.
+        :param fry_prices: Цены новой рыбы каждой массы (второй элемент prices_for_fry): массив (массы)
+         или (наборы цен × массы).
+        :param start_up_capital: Начальный капитал: число или массив.
+        :return: Словарь вида {'income': ..., 'expenses': ..., 'budget': ..., 'profit': ...}, где 'income',
+         'expenses' и 'budget' - массивы (наборы цен × сутки), 'profit' - массив итоговой прибыли
+         (доходы - расходы - начальный капитал) для каждого набора цен.
+        """
+        fry_prices = np.atleast_2d(np.asarray(fry_prices, dtype=float))
+        feed_cost, fish_cost, start_up_capital = (np.asarray(value, dtype=float).reshape(-1)
+                                                  for value in (feed_cost, fish_cost, start_up_capital))
+        number_scenarios: int = max(len(feed_cost), len(fish_cost), len(fry_prices), len(start_up_capital))
+        feed_cost, fish_cost, start_up_capital = (np.broadcast_to(value, number_scenarios)
+                                                  for value in (feed_cost, fish_cost, start_up_capital))
+        fry_prices = np.broadcast_to(fry_prices, (number_scenarios, len(self.fry_mass)))
+
+        income: np.ndarray = fish_cost[:, None] * self.sold_biomass[None, :]
+        # Затраты на новую рыбу: масса * количество * цена для каждой массы
+        fry_expenses: np.ndarray = fry_prices @ (self.fry_counts * self.fry_mass[None, :]).T
+        expenses: np.ndarray = feed_cost[:, None] * self.spent_feed[None, :] + fry_expenses
+        budget: np.ndarray = start_up_capital[:, None] + np.cumsum(income - expenses, axis=1)
+        return {'income': income, 'expenses': expenses, 'budget': budget,
+                'profit': income.sum(axis=1) - expenses.sum(axis=1) - start_up_capital}
 
 
 class Profit:
     def __init__(self, cwsd: CWSD, feed_cost: float, prices_for_fry: list[list[float, int]], fish_cost: float,
-                 start_date: date, start_up_capital: float):
+                 start_date: date, start_up_capital: float, decision_cache: DecisionCache | None = None,
+                 search: tuple[int, int, int] = (10, 10, 5000), attempts: int = 100):
         """
         __init__
         :param cwsd: Объект УЗВ.
@@ -16,6 +190,10 @@ class Profit:
         :param fish_cost: Стоимость килограмма рыбы.
         :param start_date: Дата зарыбления.
         :param start_up_capital: Начальный капитал.
+        :param decision_cache: Кэш решений о количестве новой рыбы. Если None, то создается кэш
+         с параметрами по умолчанию. Чтобы отключить кэш, можно передать DecisionCache(max_size=0).
+        :param search: Начальное значение, шаг и конечный предел количества новой рыбы при поиске.
+        :param attempts: Количество проверок каждого количества новой рыбы.
         """
         self.cwsd: CWSD = cwsd
         self.start_date: date = start_date
@@ -38,17 +216,89 @@ class Profit:
             commercial_fish_mass=cwsd.commercial_fish_mass,
             min_package=cwsd.min_package
         )
+        self.decision_cache: DecisionCache = DecisionCache() if decision_cache is None else decision_cache
+        self.search: tuple[int, int, int] = search
+        self.attempts: int = attempts
+        # Биологический след работы УЗВ для пересчета при других ценах
+        self.trace: ProfitTrace = ProfitTrace([mass for mass, _ in prices_for_fry])
 
-    def work_cwsd(self, days: int, print_info: bool = False):
+    def _search_seed(self) -> int | None:
         """
-        Метод, который ведет подсчет расходов и доходов за указанное количество дней.
+        Метод для получения общего зерна пробных запусков из генератора случайных чисел УЗВ.
+        :return: Зерно или None, если у УЗВ нет генератора (тогда зерно берется из random).
+        """
+        if self.cwsd.rng is None:
+            return None
+        return int(self.cwsd.rng.integers(2 ** 63))
+
+    def _is_optimal(self, number_fish: int, mass: float) -> bool:
+        """
+        Метод для проверки, что указанное количество новой рыбы не приводит к переполнению ни в одной попытке.
+        :param number_fish: Количество новой рыбы.
+        :param mass: Масса новой рыбы.
+        :return: True, если количество оптимальное, иначе - False.
+        """
+        report: dict = self.optimization.search_optimal_number_new_fish_in_current_cwsd(
+            cwsd=self.cwsd, average_mass=mass, start_number=number_fish, step=1, end_number=number_fish,
+            attempts=self.attempts, seed=self._search_seed(), only_optimal=True)
+        return report['attempts'][number_fish]['result'] == 'optimal'
+
+    def choose_number_new_fish(self, mass: float, start_number: int = 10, step: int = 10,
+                               end_number: int = 5000) -> int:
+        """
+        Метод для выбора количества новой рыбы в пустой бассейн. Решение для уже встречавшегося состояния
+         УЗВ берется из кэша. Иначе поиск начинается с решения для ближайшего запомненного состояния:
+         если оно оптимально, то поиск идет вверх от него, иначе - вниз до первого оптимального количества.
+        :param mass: Масса новой рыбы.
+        :param start_number: Начальное значение варьируемого количества.
+        :param step: Шаг вариации.
+        :param end_number: Конечный предел вариации количества.
+        :return: Количество новой рыбы.
+        """
+        key: tuple = self.decision_cache.key(self.cwsd, mass)
+        number_new_fish: int | None = self.decision_cache.get(key)
+        if number_new_fish is not None:
+            return number_new_fish
+
+        warm_start: int | None = self.decision_cache.nearest(key)
+        if warm_start is None or warm_start <= start_number:
+            number_new_fish = self.optimization.calculate_optimal_number_new_fish_in_current_cwsd(
+                cwsd=self.cwsd, average_mass=mass, start_number=start_number, step=step, end_number=end_number,
+                attempts=self.attempts, seed=self._search_seed())
+        elif self._is_optimal(warm_start, mass):
+            # Пойдем вверх от ближайшего решения
+            number_new_fish = warm_start
+            if warm_start + step <= end_number:
+                report: dict = self.optimization.search_optimal_number_new_fish_in_current_cwsd(
+                    cwsd=self.cwsd, average_mass=mass, start_number=warm_start + step, step=step,
+                    end_number=end_number, attempts=self.attempts, seed=self._search_seed())
+                # Поиск проходит и через рискованные количества, поэтому оптимальное может найтись выше первого
+                if any(item['result'] == 'optimal' for item in report['attempts'].values()):
+                    number_new_fish = max(warm_start, report['optimal'])
+        else:
+            # Пойдем вниз от ближайшего решения до первого оптимального количества
+            number_new_fish = warm_start - step
+            while number_new_fish > start_number and not self._is_optimal(number_new_fish, mass):
+                number_new_fish -= step
+            number_new_fish = max(number_new_fish, start_number)
+
+        self.decision_cache.put(key, number_new_fish)
+        return number_new_fish
+
+    def iter_days(self, days: int, print_info: bool = False):
+        """
+        Генератор подсчета расходов и доходов, который после каждых суток выдает суточную запись УЗВ
+         (см. CWSD.record) с добавленными полями 'income', 'expenses', 'budget' и 'stocked_fish'.
+         Бюджет на конец каждых суток сохраняется в self.daily_budget.
         :param days: Количество дней работы УЗВ.
         :param print_info: Если нужно писать подробную информацию, то True, иначе - False.
-        :return: Пока не знаю, наверное это будет словарь с необходимыми результатами.
+        :return: Генератор суточных записей. Заканчивается после days суток или при переполнении УЗВ.
         """
         for day in range(days):
             # Проанализируем дневной результат
             daily_result: dict[str, float] | None = self.cwsd.daily_growth(print_info=False)
+            if daily_result is None:
+                return
             if print_info:
                 self.cwsd.print()
                 print()
@@ -62,19 +312,17 @@ class Profit:
 
             # Добавим новую рыбу, если есть пустые бассейны
             number_empty_pools: int = self.cwsd.have_empty_pool()
+            stocked_fish: int = 0
+            fry_counts: np.ndarray = np.zeros(len(self.prices_for_fry), dtype=int)
 
             for number_empty_pool in range(number_empty_pools):
                 mass: float = self.prices_for_fry[number_empty_pool][0]
-                number_new_fish: int = self.optimization.calculate_optimal_number_new_fish_in_current_cwsd(
-                    cwsd=self.cwsd,
-                    average_mass=mass,
-                    start_number=10,
-                    step=10,
-                    end_number=5000
-                )
-
-                self.cwsd.add_fish(create_list_fish(number_fish=number_new_fish, mass=mass))
+                number_new_fish: int = self.choose_number_new_fish(mass, *self.search)
+
+                self.cwsd.add_fish(create_list_fish(number_fish=number_new_fish, mass=mass, rng=self.cwsd.rng))
                 daily_expenses += mass * number_new_fish * self.prices_for_fry[number_empty_pool][1]
+                stocked_fish += number_new_fish
+                fry_counts[number_empty_pool] += number_new_fish
                 if print_info:
                     print(f'В УЗВ (в пустой бассейн) добавлено {number_new_fish} рыб массой {mass}.')
 
@@ -83,3 +331,38 @@ class Profit:
             self.income += daily_income
             self.expenses += daily_expenses
             self.profit = self.income - self.expenses - self.start_up_capital
+            self.daily_budget[self.cwsd.days] = self.current_budget
+            self.trace.append(self.cwsd.days, daily_result['spent_feed'], daily_result['sold_biomass'], fry_counts)
+
+            record: dict = self.cwsd.record(daily_result)
+            record.update({'income': daily_income, 'expenses': daily_expenses, 'budget': self.current_budget,
+                           'stocked_fish': stocked_fish})
+            yield record
+
+    def work_cwsd(self, days: int, print_info: bool = False):
+        """
+        Метод, который ведет подсчет расходов и доходов за указанное количество дней.
+        :param days: Количество дней работы УЗВ.
+        :param print_info: Если нужно писать подробную информацию, то True, иначе - False.
+        :return: Ничего. Суточные записи можно получить генератором iter_days.
+        """
+        for _ in self.iter_days(days, print_info):
+            pass
+
+    def reprice(self, feed_cost: float | np.ndarray | None = None, fish_cost: float | np.ndarray | None = None,
+                fry_prices: list[float] | np.ndarray | None = None,
+                start_up_capital: float | np.ndarray | None = None) -> dict[str, np.ndarray]:
+        """
+        Метод для расчета денежного потока уже отработанных суток при других ценах без повторного расчета УЗВ
+         (см. ProfitTrace.evaluate). Не указанные цены берутся из этого объекта.
+        :param feed_cost: Стоимость килограмма корма: число или массив (наборы цен).
+        :param fish_cost: Стоимость килограмма рыбы: число или массив.
+        :param fry_prices: Цены новой рыбы каждой массы: массив (массы) или (наборы цен × массы).
+        :param start_up_capital: Начальный капитал: число или массив.
+        :return: Словарь с массивами доходов, расходов, бюджета по суткам и итоговой прибыли для каждого набора цен.
+        """
+        return self.trace.evaluate(
+            self.feed_cost if feed_cost is None else feed_cost,
+            self.fish_cost if fish_cost is None else fish_cost,
+            [price for _, price in self.prices_for_fry] if fry_prices is None else fry_prices,
+            self.start_up_capital if start_up_capital is None else start_up_capital)
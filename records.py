@@ -0,0 +1,128 @@
+import csv
+import os
+from typing import Iterable
+
+import numpy as np
+
+
+def flatten_record(record: dict) -> dict[str, float]:
+    """
+    Функция для превращения суточной записи в плоский словарь: массивы по бассейнам
+     раскладываются на отдельные столбцы name_0, name_1, ...
+    :param record: Суточная запись.
+    :return: Словарь {столбец: значение}.
+    """
+    row: dict[str, float] = dict()
+    for key, value in record.items():
+        if isinstance(value, np.ndarray):
+            for number, item in enumerate(value):
+                row[f'{key}_{number}'] = float(item)
+        else:
+            row[key] = value
+    return row
+
+
+class RecordSink:
+    """
+    Класс для записи суточных записей на диск порциями по столбцам. В памяти хранится не больше
+     chunk_size строк, поэтому длинные расчеты не накапливают списки словарей.
+    Форматы:
+     'csv' - один файл path, порции дописываются в конец, заголовок пишется один раз;
+     'npy' - папка path, каждая порция - отдельный файл chunk_00000.npy со структурированным массивом
+      (по полю на столбец). Прочитать все порции можно функцией load_records.
+    """
+    def __init__(self, path: str, chunk_size: int = 1000, file_format: str = 'csv'):
+        if file_format not in ('csv', 'npy'):
+            raise ValueError(f'Неизвестный формат: {file_format}')
+        self.path: str = path
+        self.chunk_size: int = chunk_size
+        self.file_format: str = file_format
+
+        self.columns: list[str] | None = None
+        self.rows_written: int = 0
+        self._columns_data: dict[str, list[float]] = dict()
+        self._chunks: int = 0
+
+        # Старые результаты по этому пути удаляются
+        if file_format == 'npy':
+            os.makedirs(path, exist_ok=True)
+            for name in os.listdir(path):
+                if name.startswith('chunk_') and name.endswith('.npy'):
+                    os.remove(os.path.join(path, name))
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def __enter__(self) -> 'RecordSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record: dict):
+        """
+        Метод для добавления записи. Когда набирается chunk_size строк, они записываются на диск.
+        :param record: Суточная запись.
+        :return: Ничего.
+        """
+        row: dict[str, float] = flatten_record(record)
+        if self.columns is None:
+            self.columns = list(row)
+            self._columns_data = {column: list() for column in self.columns}
+        for column in self.columns:
+            self._columns_data[column].append(row[column])
+
+        if len(self._columns_data[self.columns[0]]) >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, records: Iterable[dict]) -> int:
+        """
+        Метод для записи всех записей генератора.
+        :param records: Генератор суточных записей.
+        :return: Количество записанных строк.
+        """
+        for record in records:
+            self.write(record)
+        self.flush()
+        return self.rows_written
+
+    def flush(self):
+        """
+        Метод для записи накопленной порции на диск.
+        :return: Ничего.
+        """
+        if self.columns is None or not self._columns_data[self.columns[0]]:
+            return
+        number_rows: int = len(self._columns_data[self.columns[0]])
+
+        if self.file_format == 'csv':
+            with open(self.path, 'a', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                if self.rows_written == 0:
+                    writer.writerow(self.columns)
+                writer.writerows(zip(*(self._columns_data[column] for column in self.columns)))
+        else:
+            chunk: np.ndarray = np.empty(number_rows, dtype=[(column, float) for column in self.columns])
+            for column in self.columns:
+                chunk[column] = self._columns_data[column]
+            np.save(os.path.join(self.path, f'chunk_{self._chunks:05d}.npy'), chunk)
+
+        self._chunks += 1
+        self.rows_written += number_rows
+        self._columns_data = {column: list() for column in self.columns}
+
+    def close(self):
+        """
+        Метод для записи последней порции.
+        :return: Ничего.
+        """
+        self.flush()
+
+
+def load_records(path: str) -> np.ndarray:
+    """
+    Функция для чтения всех порций, записанных RecordSink в формате 'npy'.
+    :param path: Папка с порциями.
+    :return: Структурированный массив со всеми строками.
+    """
+    chunks: list[str] = sorted(name for name in os.listdir(path) if name.startswith('chunk_') and name.endswith('.npy'))
+    return np.concatenate([np.load(os.path.join(path, name)) for name in chunks])
@@ -0,0 +1,203 @@
+import hashlib
+import importlib
+import json
+import pickle
+import sqlite3
+from typing import Any, Callable
+
+import numpy as np
+
+from cwsd import CWSD
+
+
+# Модули, от которых зависят результаты расчетов Optimization (модель роста, вычислители бассейнов,
+# работа УЗВ и сами расчеты)
+model_modules: tuple[str, ...] = ('fish', 'backend', 'pool', 'cohort_pool', 'cwsd', 'batch_cwsd', 'optimization')
+# Параметры модели роста, которые можно изменить без изменения кода
+model_parameters: tuple[str, ...] = ('min_mass_accumulation', 'max_mass_accumulation', 'mac_mean', 'mac_std')
+
+
+def model_version() -> str:
+    """
+    Функция для получения версии модели: хэша исходного кода модулей model_modules и значений параметров
+     модели роста из fish. Любое изменение модели меняет версию, и старые результаты кэша перестают
+     использоваться.
+    :return: Шестнадцатеричная строка.
+    """
+    digest = hashlib.sha1()
+    for name in model_modules:
+        with open(importlib.import_module(name).__file__, 'rb') as file:
+            digest.update(file.read())
+    fish = importlib.import_module('fish')
+    digest.update(json.dumps([getattr(fish, name) for name in model_parameters]).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _cwsd_state(cwsd: CWSD) -> dict:
+    """
+    Функция для получения состояния УЗВ для ключа кэша: параметры и счетчики УЗВ (как в CWSD.save)
+     и хэши массивов рыбы каждого бассейна.
+    :param cwsd: УЗВ.
+    :return: Словарь, который можно записать в JSON.
+    """
+    pools: list[dict] = list()
+    for pool in cwsd.pools:
+        roots, rates, info = pool.get_state()
+        pools.append({'class': type(pool).__name__, 'roots': _canonical(roots), 'rates': _canonical(rates), **info})
+    return {'number_pools': cwsd.number_pools, 'pool_area': cwsd.pool_area,
+            'max_planting_density': cwsd.max_planting_density, 'commercial_fish_mass': cwsd.commercial_fish_mass,
+            'min_package': cwsd.min_package, 'backend': cwsd.backend.name, 'biomass': cwsd.biomass,
+            'days': cwsd.days, 'ranking': cwsd._ranking, 'pools': pools}
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Функция для превращения значения в данные JSON с однозначной записью. Массивы заменяются хэшем
+     их содержимого, УЗВ - своим состоянием (см. _cwsd_state).
+    :param value: Значение.
+    :return: Данные JSON.
+    """
+    if isinstance(value, np.ndarray):
+        array: np.ndarray = np.ascontiguousarray(value)
+        return {'dtype': str(array.dtype), 'shape': list(array.shape),
+                'sha1': hashlib.sha1(array.tobytes()).hexdigest()}
+    if isinstance(value, CWSD):
+        return _cwsd_state(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+class ResultCache:
+    """
+    Класс для хранения результатов расчетов Optimization в файле SQLite между сеансами.
+     Ключ - хэш названия метода, параметров Optimization, аргументов, зерна и версии модели (см. model_version).
+     При открытии файла результаты других версий модели удаляются. Когда результатов становится больше
+     max_size, удаляются те, которые дольше всего не использовались.
+    Результаты хранятся через pickle, поэтому файл кэша должен быть своим, а не полученным со стороны.
+    """
+    def __init__(self, path: str, max_size: int = 1000, version: str | None = None):
+        """
+        __init__
+        :param path: Путь к файлу SQLite.
+        :param max_size: Наибольшее количество результатов в файле.
+        :param version: Версия модели. Если None, то считается по коду модели (см. model_version).
+        """
+        self.path: str = path
+        self.max_size: int = max_size
+        self.version: str = version if version is not None else model_version()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._connection: sqlite3.Connection = sqlite3.connect(path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS results '
+                                 '(key TEXT PRIMARY KEY, version TEXT, value BLOB, used INTEGER)')
+        self._connection.execute('DELETE FROM results WHERE version != ?', (self.version,))
+        self._connection.commit()
+        # Счетчик обращений для выбора давно не использованных результатов
+        self._clock: int = self._connection.execute('SELECT COALESCE(MAX(used), 0) FROM results').fetchone()[0]
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def key(self, method: str, parts: dict) -> str:
+        """
+        Метод для получения ключа результата.
+        :param method: Название метода.
+        :param parts: Словарь со всем, от чего зависит результат (параметры, аргументы, зерно).
+        :return: Шестнадцатеричная строка.
+        """
+        text: str = json.dumps({'method': method, 'version': self.version, 'parts': _canonical(parts)},
+                               sort_keys=True)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Метод для получения запомненного результата.
+        :param key: Ключ результата.
+        :return: Кортеж (найден ли результат, результат или None).
+        """
+        row: tuple | None = self._connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._clock += 1
+        self._connection.execute('UPDATE results SET used = ? WHERE key = ?', (self._clock, key))
+        self._connection.commit()
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """
+        Метод для запоминания результата. Если результатов стало больше max_size, то давно не использованные
+         удаляются.
+        :param key: Ключ результата.
+        :param value: Результат.
+        :return: Ничего.
+        """
+        self._clock += 1
+        self._connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                 (key, self.version, pickle.dumps(value), self._clock))
+        extra: int = len(self) - self.max_size
+        if extra > 0:
+            self._connection.execute('DELETE FROM results WHERE key IN '
+                                     '(SELECT key FROM results ORDER BY used LIMIT ?)', (extra,))
+            self.evictions += extra
+        self._connection.commit()
+
+    def cached(self, method: str, parts: dict, compute: Callable[[], Any],
+               rng: np.random.Generator | None = None) -> Any:
+        """
+        Метод для получения результата из кэша или его расчета и запоминания.
+        :param method: Название метода.
+        :param parts: Словарь со всем, от чего зависит результат (см. key).
+        :param compute: Функция без аргументов, которая считает результат.
+        :param rng: Генератор случайных чисел, который использует расчет. Его состояние до расчета входит
+         в ключ, а состояние после расчета запоминается вместе с результатом и восстанавливается при
+         попадании в кэш, поэтому следующие расчеты идут так же, как без кэша.
+        :return: Результат.
+        """
+        if rng is not None:
+            parts = {**parts, 'rng': rng.bit_generator.state}
+        key: str = self.key(method, parts)
+        found, value = self.get(key)
+        if found:
+            result, state = value
+            if rng is not None:
+                rng.bit_generator.state = state
+            return result
+        result = compute()
+        self.put(key, (result, None if rng is None else rng.bit_generator.state))
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """
+        Метод для получения статистики кэша.
+        :return: Словарь {'hits': ..., 'misses': ..., 'evictions': ..., 'size': ...}.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self)}
+
+    def clear(self):
+        """
+        Метод для удаления всех результатов.
+        :return: Ничего.
+        """
+        self._connection.execute('DELETE FROM results')
+        self._connection.commit()
+
+    def close(self):
+        """
+        Метод для закрытия файла.
+        :return: Ничего.
+        """
+        self._connection.close()
@@ -27,6 +27,24 @@ def get_cwsd() -> CWSD:
     return cwsd
 
 
+def get_small_cwsd() -> CWSD:
+    """
+    Метод для получения УЗВ, которое работает без переполнения.
+    :return: объект CWSD
+    """
+    cwsd: CWSD = CWSD(
+        number_pools=4,
+        pool_area=6.0,
+        max_planting_density=40.0,
+        commercial_fish_mass=450.0,
+        min_package=1000,
+        start_date=date.today()
+    )
+    for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0], [900, 50.0]]:
+        cwsd.add_fish(create_list_fish(number_fish, mass))
+    return cwsd
+
+
 def get_optimization() -> Optimization:
     """
     Метод для получения стандартного объекта Optimization
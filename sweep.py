@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import date
+from itertools import product
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import create_list_fish
+from optimization import Optimization
+from records import RecordSink
+from result_cache import model_version
+
+
+# Параметры точки сетки и их значения по умолчанию (стандартное УЗВ)
+parameters: dict[str, float | int] = {
+    'number_pools': 4,
+    'pool_area': 6.0,
+    'max_planting_density': 40.0,
+    'commercial_fish_mass': 450.0,
+    'min_package': 1000,
+    'fry_mass': 50.0,
+}
+# Показатели, которые считаются для каждой точки
+metrics: tuple[str, ...] = ('growing_time', 'optimal_stocking', 'days', 'spent_feed', 'sold_biomass',
+                            'feed_conversion', 'overflow')
+
+
+def _point_key(point: dict, settings: dict, seed: int, version: str) -> str:
+    """
+    Функция для получения ключа точки сетки. Ключ зависит только от значений параметров, настроек расчета,
+     зерна и версии модели, поэтому не меняется при изменении сетки или порядка точек, а результаты
+     с другим зерном или другой моделью не считаются посчитанными.
+    :param point: Словарь {параметр: значение}.
+    :param settings: Настройки расчета.
+    :param seed: Общее зерно.
+    :param version: Версия модели (см. result_cache.model_version).
+    :return: Шестнадцатеричная строка.
+    """
+    text: str = json.dumps({'point': point, 'settings': settings, 'seed': seed, 'version': version},
+                           sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _point_rng(seed: int, key: str) -> np.random.Generator:
+    """
+    Функция для получения генератора случайных чисел для точки сетки - дочернего потока общего зерна.
+    :param seed: Общее зерно.
+    :param key: Ключ точки.
+    :return: Генератор точки.
+    """
+    return np.random.default_rng(np.random.SeedSequence([seed, int(key, 16)]))
+
+
+def _run_point(task: tuple[dict, dict, np.random.Generator]) -> dict:
+    """
+    Функция для расчета показателей одной точки сетки.
+     Длительность выращивания - средняя по replicates повторениям для number_fish рыб массой fry_mass.
+     Оптимальное зарыбление - количество рыбы, при котором бассейн к концу выращивания достигает
+     максимальной плотности. Затем УЗВ с таким зарыблением в одном бассейне работает, пока вся рыба
+     не продана (но не дольше max_days суток), и по этой работе считаются корм, проданная биомасса
+     и кормовой коэффициент (корм на кг прироста).
+    :param task: Кортеж (точка сетки, настройки расчета, генератор случайных чисел).
+    :return: Словарь {показатель: значение}.
+    """
+    point, settings, rng = task
+    optimization: Optimization = Optimization(point['number_pools'], point['pool_area'],
+                                              point['max_planting_density'], point['commercial_fish_mass'],
+                                              point['min_package'], rng)
+    growing_time: float = optimization.calculate_growing_time_distribution(
+        point['fry_mass'], max(settings['number_fish'], point['min_package']), settings['replicates'])['mean']
+    step: int = settings['stocking_step']
+    optimal_stocking: int = optimization.calculate_number_fish_for_max_density(
+        int(round(growing_time)), point['fry_mass'], step, step, settings['max_stocking'], mode='bisection')
+
+    cwsd: CWSD = CWSD(point['number_pools'], point['pool_area'], point['max_planting_density'],
+                      point['commercial_fish_mass'], point['min_package'], date(2024, 1, 1), rng=rng)
+    cwsd.add_fish(create_list_fish(optimal_stocking, point['fry_mass'], cwsd.rng))
+    stocked_biomass: float = cwsd.biomass
+    overflow: bool = cwsd.run_until(min_biomass=1.0, max_days=settings['max_days'], print_info=False) is None
+
+    biomass_gain: float = cwsd.sold_biomass + cwsd.biomass - stocked_biomass
+    return {'growing_time': growing_time,
+            'optimal_stocking': optimal_stocking,
+            'days': cwsd.days,
+            'spent_feed': cwsd.spent_feed,
+            'sold_biomass': cwsd.sold_biomass,
+            'feed_conversion': cwsd.spent_feed / biomass_gain if biomass_gain > 0 else float('nan'),
+            'overflow': overflow}
+
+
+class Sweep:
+    """
+    Класс для расчета показателей УЗВ по сетке параметров (см. parameters и metrics).
+     Результат каждой точки сохраняется в отдельный файл <ключ>.json в папке directory сразу после расчета.
+     Точки, для которых файл уже есть, не пересчитываются, поэтому прерванный расчет можно продолжить,
+     запустив его заново с той же сеткой и тем же зерном. Ключ точки включает зерно и версию модели,
+     поэтому после их изменения точки считаются заново.
+    """
+    def __init__(self, directory: str, grid: dict[str, list], number_fish: int = 1000, replicates: int = 10,
+                 stocking_step: int = 10, max_stocking: int = 20000, max_days: int = 1000):
+        """
+        __init__
+        :param directory: Папка для результатов точек.
+        :param grid: Словарь {параметр: список значений}. Не указанные параметры берутся из parameters.
+        :param number_fish: Количество рыбы для расчета длительности выращивания
+         (не меньше минимального пакета точки).
+        :param replicates: Количество повторений для расчета длительности выращивания.
+        :param stocking_step: Шаг поиска оптимального зарыбления.
+        :param max_stocking: Наибольшее количество рыбы при поиске оптимального зарыбления.
+        :param max_days: Наибольшее количество суток работы УЗВ для точки.
+        """
+        unknown: set[str] = set(grid) - set(parameters)
+        if unknown:
+            raise ValueError(f'Неизвестные параметры: {", ".join(sorted(unknown))}')
+        self.directory: str = directory
+        self.grid: dict[str, list] = grid
+        self.settings: dict[str, int] = {'number_fish': number_fish, 'replicates': replicates,
+                                         'stocking_step': stocking_step, 'max_stocking': max_stocking,
+                                         'max_days': max_days}
+        self.version: str = model_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def points(self) -> list[dict]:
+        """
+        Метод для получения всех точек сетки.
+        :return: Список словарей {параметр: значение} со всеми параметрами.
+        """
+        names: list[str] = list(self.grid)
+        return [{**parameters, **dict(zip(names, values))} for values in product(*self.grid.values())]
+
+    def _path(self, point: dict, seed: int) -> str:
+        """
+        Метод для получения пути к файлу результата точки.
+        :param point: Точка сетки.
+        :param seed: Общее зерно.
+        :return: Путь к файлу.
+        """
+        return os.path.join(self.directory, f'{_point_key(point, self.settings, seed, self.version)}.json')
+
+    def pending(self, seed: int = 0) -> list[dict]:
+        """
+        Метод для получения точек, результатов которых с этим зерном еще нет на диске.
+        :param seed: Общее зерно.
+        :return: Список точек.
+        """
+        return [point for point in self.points() if not os.path.exists(self._path(point, seed))]
+
+    def _save(self, point: dict, seed: int, result: dict):
+        """
+        Метод для сохранения результата точки. Файл сначала пишется под временным именем и затем
+         переименовывается, поэтому при прерывании на диске не остается недописанных результатов.
+        :param point: Точка сетки.
+        :param seed: Общее зерно.
+        :param result: Показатели точки.
+        :return: Ничего.
+        """
+        path: str = self._path(point, seed)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump({'point': point, 'settings': self.settings, 'seed': seed, 'version': self.version,
+                       'result': result}, file)
+        os.replace(path + '.tmp', path)
+
+    def run(self, workers: int | None = None, seed: int = 0, print_info: bool = False) -> int:
+        """
+        Метод для расчета всех точек, результатов которых еще нет на диске.
+        :param workers: Количество процессов. Если None, то точки считаются последовательно в текущем процессе.
+        :param seed: Общее зерно. Генератор точки зависит только от него и от ключа точки, поэтому результат
+         не зависит от количества процессов, порядка точек и от того, прерывался ли расчет.
+        :param print_info: Если нужно писать о каждой посчитанной точке, то True, иначе - False.
+        :return: Количество посчитанных точек.
+        """
+        tasks: list[tuple[dict, dict, np.random.Generator]] = [
+            (point, self.settings, _point_rng(seed, _point_key(point, self.settings, seed, self.version)))
+            for point in self.pending(seed)]
+
+        if workers is None:
+            for task in tasks:
+                self._save(task[0], seed, _run_point(task))
+                if print_info:
+                    print(f'Посчитана точка {task[0]}')
+            return len(tasks)
+
+        with ProcessPoolExecutor(workers) as executor:
+            futures: dict[Future, dict] = {executor.submit(_run_point, task): task[0] for task in tasks}
+            for future in as_completed(futures):
+                self._save(futures[future], seed, future.result())
+                if print_info:
+                    print(f'Посчитана точка {futures[future]}')
+        return len(tasks)
+
+    def table(self, seed: int = 0) -> list[dict]:
+        """
+        Метод для получения таблицы результатов: одна строка на точку сетки в порядке сетки.
+         Точки без результатов с этим зерном пропускаются.
+        :param seed: Общее зерно.
+        :return: Список словарей {параметр или показатель: значение}.
+        """
+        rows: list[dict] = list()
+        for point in self.points():
+            path: str = self._path(point, seed)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as file:
+                    rows.append({**point, **json.load(file)['result']})
+        return rows
+
+    def save_table(self, path: str, seed: int = 0) -> int:
+        """
+        Метод для сохранения таблицы результатов в файл CSV.
+        :param path: Путь к файлу.
+        :param seed: Общее зерно.
+        :return: Количество строк.
+        """
+        with RecordSink(path) as sink:
+            return sink.write_all(self.table(seed))
@@ -0,0 +1,73 @@
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend import Backend, NumpyBackend, available_backends, get_backend
+from cwsd import CWSD
+from fish import create_list_fish
+
+
+def get_cwsd(backend: str) -> CWSD:
+    """
+    Метод для получения маленького УЗВ с указанным вычислителем.
+    :param backend: Название вычислителя.
+    :return: объект CWSD
+    """
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date(2024, 1, 1), backend=backend)
+    for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0], [900, 50.0]]:
+        cwsd.add_fish(create_list_fish(number_fish, mass))
+    return cwsd
+
+
+def test_kernels_match_numpy():
+    """
+    Все доступные вычислители дают для одних и тех же рыб те же результаты, что и NumpyBackend.
+    """
+    rng: np.random.Generator = np.random.default_rng(5)
+    roots: np.ndarray = np.cbrt(rng.uniform(20.0, 300.0, 500))
+    rates: np.ndarray = rng.normal(0.0325, 0.005, 500) / 3
+    rates[:10] = 0.0
+    reference: NumpyBackend = NumpyBackend()
+
+    for name in available_backends():
+        backend: Backend = get_backend(name)
+        assert np.allclose(backend.grow_roots(roots, rates, 30), reference.grow_roots(roots, rates, 30))
+        assert np.allclose(backend.power_sums(roots, rates), reference.power_sums(roots, rates), rtol=1e-12)
+        assert np.array_equal(backend.crossing_ages(roots, rates, 150.0), reference.crossing_ages(roots, rates, 150.0))
+        assert backend.count_not_lighter(roots, rates, 30, 150.0) == reference.count_not_lighter(roots, rates, 30, 150.0)
+        for biggest_fish in [True, False]:
+            chosen, others = backend.select_extreme(roots, 120, biggest_fish)
+            expected: np.ndarray = np.sort(roots)[-120:] if biggest_fish else np.sort(roots)[:120]
+            assert np.array_equal(np.sort(roots[chosen]), expected)
+            assert np.array_equal(np.sort(np.concatenate([chosen, others])), np.arange(500))
+
+
+def test_cwsd_matches_across_backends():
+    """
+    УЗВ с одной и той же рыбой работает одинаково на всех доступных вычислителях.
+    """
+    results: dict[str, tuple] = dict()
+    for name in available_backends():
+        random.seed(11)
+        cwsd: CWSD = get_cwsd(name)
+        assert cwsd.backend.name == name and cwsd.pools[0].backend is cwsd.backend
+        cwsd.run_until(min_biomass=1.0, max_days=1000, print_info=False)
+        results[name] = (cwsd.days, cwsd.sold_biomass, cwsd.spent_feed)
+
+    days, sold_biomass, spent_feed = results['numpy']
+    for name, result in results.items():
+        assert result[0] == days, name
+        assert np.isclose(result[1], sold_biomass, rtol=1e-9) and np.isclose(result[2], spent_feed, rtol=1e-9), name
+
+
+def test_get_backend():
+    """
+    По умолчанию берется самый быстрый вычислитель, неизвестное название - ошибка.
+    """
+    assert get_backend().name == available_backends()[0]
+    assert get_backend('auto') is get_backend(None)
+    assert get_backend(get_backend('python')).name == 'python'
+    with pytest.raises(ValueError):
+        get_backend('fortran')
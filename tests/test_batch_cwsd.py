@@ -0,0 +1,65 @@
+import random
+from datetime import date
+
+import numpy as np
+
+from batch_cwsd import BatchCWSD
+from cwsd import CWSD
+from fish import ListFish, create_list_fish
+
+
+def test_batch_matches_sequential_trials():
+    """
+    Повторения в BatchCWSD должны совпадать с последовательными запусками CWSD с теми же
+     генераторами случайных чисел для новой рыбы.
+    """
+    random.seed(7)
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today())
+    for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0]]:
+        cwsd.add_fish(create_list_fish(number_fish, mass))
+    cwsd.run_until(max_days=20, print_info=False)
+
+    for number_fish in (400, 900, 1800):
+        sequential: list[tuple] = list()
+        for replicate in range(4):
+            test_cwsd: CWSD = cwsd.fork()
+            list_fish: ListFish = create_list_fish(number_fish, 50.0, np.random.default_rng([number_fish, replicate]))
+            if not test_cwsd.add_fish(list_fish):
+                test_cwsd.add_fish_in_not_empty_pool(50.0, list_fish)
+            success: bool = test_cwsd.run_until(print_info=False) is not None
+            sequential.append((success, test_cwsd.days, test_cwsd.spent_feed, test_cwsd.sold_biomass))
+
+        batch_cwsd: BatchCWSD = BatchCWSD(cwsd, 4)
+        batch_cwsd.add_fish(number_fish, 50.0, [np.random.default_rng([number_fish, replicate])
+                                                for replicate in range(4)])
+        result: dict = batch_cwsd.run_until()
+
+        for replicate, (success, days, spent_feed, sold_biomass) in enumerate(sequential):
+            assert result['success'][replicate] == success
+            assert result['days'][replicate] == days
+            assert abs(result['spent_feed'][replicate] - spent_feed) < 1e-6
+            assert abs(result['sold_biomass'][replicate] - sold_biomass) < 1e-6
+
+
+def test_sold_fish_are_compacted():
+    """
+    Проданная рыба удаляется из массивов повторений, поэтому при долгой работе с новыми партиями рыбы
+     массивы не растут.
+    """
+    random.seed(8)
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 100, date.today())
+    for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0]]:
+        cwsd.add_fish(create_list_fish(number_fish, mass))
+
+    batch_cwsd: BatchCWSD = BatchCWSD(cwsd, 3)
+    added: int = 1350
+    for day in range(300):
+        if day % 30 == 0:
+            batch_cwsd.add_fish(300, 50.0, [np.random.default_rng([day, replicate]) for replicate in range(3)])
+            added += 300
+        batch_cwsd.daily_growth()
+        alive: np.ndarray = (batch_cwsd._pool >= 0).sum(axis=1)
+        assert np.array_equal(batch_cwsd._number_fish.sum(axis=1), alive)
+        assert batch_cwsd._pool.shape[1] <= 2 * alive.max()
+    assert batch_cwsd.sold_biomass.min() > 0
+    assert batch_cwsd._pool.shape[1] < added
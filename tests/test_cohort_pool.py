@@ -0,0 +1,95 @@
+import random
+from datetime import date
+
+import numpy as np
+
+from cohort_pool import CohortPool
+from cwsd import CWSD
+from fish import ListFish, create_list_fish
+from pool import Pool
+
+
+def test_cohort_pool_matches_fish_pool():
+    """
+    Бассейн когорт растет и отдает рыбу почти так же, как поштучный бассейн.
+    """
+    random.seed(11)
+    list_fish: ListFish = create_list_fish(20000, 50.0)
+    pool: Pool = Pool(6.0, 0)
+    cohort_pool: CohortPool = CohortPool(6.0, 0)
+    for current_pool in (pool, cohort_pool):
+        current_pool.add_new_fishes(list_fish)
+        current_pool.grow(60)
+    assert cohort_pool.number_cohorts < 1000
+    assert abs(cohort_pool.biomass / pool.biomass - 1) < 1e-3
+
+    biggest: ListFish = pool.remove_fish(3000)
+    cohort_biggest: ListFish = cohort_pool.remove_fish(3000)
+    assert cohort_biggest.get_number_fish() == 3000 and cohort_pool.number_fish == 17000
+    assert abs(cohort_biggest.get_biomass() / biggest.get_biomass() - 1) < 1e-2
+
+    for current_pool in (pool, cohort_pool):
+        current_pool.add_new_fishes(create_list_fish(5000, 100.0))
+        current_pool.grow(40)
+    assert abs(cohort_pool.biomass / pool.biomass - 1) < 1e-2
+    assert abs(cohort_pool.count_fish_not_lighter(300.0) - pool.count_fish_not_lighter(300.0)) < 200
+
+
+def test_cohort_cwsd(tmp_path):
+    """
+    УЗВ с бассейнами когорт продает почти столько же рыбы, сколько поштучное, и сохраняется на диск.
+    """
+    results: dict[str, CWSD] = dict()
+    for pool_mode in ('fish', 'cohort'):
+        random.seed(12)
+        cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today(), pool_mode=pool_mode)
+        for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0], [900, 50.0]]:
+            cwsd.add_fish(create_list_fish(number_fish, mass))
+        cwsd.run_until(max_days=150, print_info=False)
+        results[pool_mode] = cwsd
+
+    assert abs(results['cohort'].sold_biomass / results['fish'].sold_biomass - 1) < 1e-2
+
+    results['cohort'].save(str(tmp_path))
+    loaded_cwsd: CWSD = CWSD.load(str(tmp_path))
+    assert loaded_cwsd.pool_mode == 'cohort'
+    for cwsd in (loaded_cwsd, results['cohort']):
+        cwsd.run_until(max_days=50, print_info=False)
+    assert loaded_cwsd.sold_biomass == results['cohort'].sold_biomass
+
+
+def test_days_to_commercial_without_growth_in_cohort_pool():
+    """
+    Рыба, которая не растет, либо уже товарная (пакет готов через сутки), либо никогда не станет товарной.
+    """
+    for masses, expected in (([500.0, 500.0], 1), ([300.0, 300.0], None), ([500.0, 300.0], 1)):
+        pool: CohortPool = CohortPool(6.0, 0)
+        pool.add_new_fishes(ListFish.from_arrays(np.array(masses), np.zeros(2)))
+        assert pool.days_to_commercial(400.0, 1, 100) == expected
+    assert pool.days_to_commercial(400.0, 2, 100) is None
+
+
+def test_add_new_fishes_keeps_other_cohorts():
+    """
+    При добавлении рыбы по клеткам раскладывается только новая рыба, остальные когорты не меняются.
+    """
+    random.seed(13)
+    pool: CohortPool = CohortPool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(2000, 50.0))
+    pool.grow(30)
+    masses: np.ndarray = pool.fishes.mass.copy()
+    counts: np.ndarray = pool.fishes.counts.copy()
+
+    # Рыба далеко от когорт бассейна образует новые когорты
+    pool.add_new_fishes(ListFish.from_arrays(np.array([1000.0, 1000.0]), np.array([0.03, 0.03])))
+    assert pool.number_cohorts == len(counts) + 1
+    assert np.allclose(pool.fishes.mass[:len(counts)], masses, rtol=1e-12)
+    assert np.array_equal(pool.fishes.counts[:len(counts)], counts)
+
+    # Рыба из клетки когорты бассейна сливается с ней, и средние корень и прирост когорты учитывают ее
+    cohorts: int = pool.number_cohorts
+    root: float = float(np.cbrt(pool.fishes.mass[-1]))
+    pool.add_new_fishes(ListFish.from_arrays(np.array([(root + 0.001) ** 3]), np.array([0.03])))
+    assert pool.number_cohorts == cohorts and pool.fishes.counts[-1] == 3
+    assert np.isclose(np.cbrt(pool.fishes.mass[-1]), root + 0.001 / 3)
+    assert np.array_equal(pool.fishes.counts[:len(counts)], counts)
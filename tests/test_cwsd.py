@@ -0,0 +1,140 @@
+import random
+from copy import deepcopy
+from datetime import date
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import create_list_fish
+from observer import Profiler
+from standart_objects import get_small_cwsd
+
+
+def test_run_until_matches_daily_growth():
+    """
+    Переход от события к событию должен давать тот же результат, что и ежедневная работа.
+    """
+    random.seed(0)
+    daily_cwsd: CWSD = get_small_cwsd()
+    fast_cwsd: CWSD = deepcopy(daily_cwsd)
+
+    while daily_cwsd.biomass > 1.0:
+        assert daily_cwsd.daily_growth(print_info=False) is not None
+
+    result: dict[str, float] | None = fast_cwsd.run_until(min_biomass=1.0, print_info=False)
+
+    assert result is not None
+    assert result['days'] == daily_cwsd.days == fast_cwsd.days
+    assert abs(fast_cwsd.spent_feed - daily_cwsd.spent_feed) < 1e-6
+    assert abs(fast_cwsd.sold_biomass - daily_cwsd.sold_biomass) < 1e-6
+    assert abs(result['spent_feed'] - daily_cwsd.spent_feed) < 1e-6
+
+
+def test_run_until_max_days():
+    """
+    Ограничение количества суток в run_until.
+    """
+    random.seed(0)
+    cwsd: CWSD = get_small_cwsd()
+    result: dict[str, float] | None = cwsd.run_until(max_days=10, print_info=False)
+
+    assert result is not None
+    assert result['days'] == cwsd.days == 10
+
+
+def test_fork_does_not_change_original():
+    """
+    Работа копии УЗВ не должна менять исходное УЗВ.
+    """
+    random.seed(1)
+    cwsd: CWSD = get_small_cwsd()
+    masses: list = [pool.fishes.mass.copy() for pool in cwsd.pools]
+    biomass: float = cwsd.biomass
+
+    forked_cwsd: CWSD = cwsd.fork()
+    forked_cwsd.add_fish_in_not_empty_pool(100.0, create_list_fish(100, 100.0))
+    forked_cwsd.run_until(max_days=60, print_info=False)
+
+    assert forked_cwsd.days == 60
+    assert cwsd.days == 0
+    assert cwsd.biomass == biomass
+    for pool, mass in zip(cwsd.pools, masses):
+        assert (pool.fishes.mass == mass).all()
+        assert abs(pool.biomass - pool.fishes.get_biomass()) < 1e-9
+
+
+def test_unique_mass_indexes():
+    """
+    Массовые индексы уникальны даже у пустых бассейнов с одинаковой средней массой.
+    """
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today())
+    cwsd.add_fish(create_list_fish(400, 200.0))
+    assert sorted(pool.mass_index for pool in cwsd.pools) == [0, 1, 2, 3]
+    for mass_index in range(4):
+        assert cwsd._find_pool_with_mass_index(mass_index).mass_index == mass_index
+    assert cwsd._find_commercial_pool().biomass > 0
+
+
+def test_observers():
+    """
+    Наблюдатель получает события и время этапов, а результат работы УЗВ от наблюдателя не зависит.
+    """
+    random.seed(3)
+    cwsd: CWSD = get_small_cwsd()
+    observed_cwsd: CWSD = cwsd.fork()
+    profiler: Profiler = Profiler()
+    observed_cwsd.add_observer(profiler)
+
+    for _ in range(150):
+        cwsd.daily_growth(print_info=False)
+        observed_cwsd.daily_growth(print_info=False)
+
+    assert (observed_cwsd.biomass, observed_cwsd.sold_biomass) == (cwsd.biomass, cwsd.sold_biomass)
+    report: dict = profiler.report()
+    assert set(report['timings']) == {'growth', 'sale', 'overflow', 'separation'}
+    assert report['events']['phase'] == 4 * 150
+    assert report['counters']['fish_sold'] > 0 and report['events']['sale'] > 0
+    assert report['counters']['fish_days'] > 150 * 1000
+    assert observed_cwsd.fork().observers == []
+
+
+def test_save_and_load(tmp_path):
+    """
+    Загруженное УЗВ (в том числе отображенное в память) работает так же, как исходное.
+    """
+    random.seed(10)
+    cwsd: CWSD = get_small_cwsd()
+    cwsd.run_until(max_days=60, print_info=False)
+    cwsd.save(str(tmp_path))
+
+    for mmap in (True, False):
+        loaded_cwsd: CWSD = CWSD.load(str(tmp_path), mmap=mmap)
+        assert (loaded_cwsd.days, loaded_cwsd.biomass, loaded_cwsd.sold_biomass) == \
+            (cwsd.days, cwsd.biomass, cwsd.sold_biomass)
+        assert [pool.mass_index for pool in loaded_cwsd.pools] == [pool.mass_index for pool in cwsd.pools]
+
+        original: CWSD = cwsd.fork()
+        for _ in range(100):
+            original.daily_growth(print_info=False)
+            loaded_cwsd.daily_growth(print_info=False)
+        assert (loaded_cwsd.biomass, loaded_cwsd.sold_biomass) == (original.biomass, original.sold_biomass)
+
+
+def test_rng_streams(tmp_path):
+    """
+    Генератор УЗВ воспроизводит новую рыбу, копии получают независимые потоки,
+     а сохраненное УЗВ продолжает тот же поток.
+    """
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today(), rng=np.random.default_rng(42))
+    same: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today(), rng=np.random.default_rng(42))
+    assert np.array_equal(create_list_fish(100, 50.0, cwsd.rng).mac, create_list_fish(100, 50.0, same.rng).mac)
+
+    first, second = cwsd.fork(), cwsd.fork()
+    assert not np.array_equal(create_list_fish(100, 50.0, first.rng).mac,
+                              create_list_fish(100, 50.0, second.rng).mac)
+
+    cwsd.save(str(tmp_path))
+    loaded_cwsd: CWSD = CWSD.load(str(tmp_path))
+    assert np.array_equal(create_list_fish(100, 50.0, loaded_cwsd.rng).mac, create_list_fish(100, 50.0, cwsd.rng).mac)
+    assert np.array_equal(create_list_fish(100, 50.0, loaded_cwsd.fork().rng).mac,
+                          create_list_fish(100, 50.0, cwsd.fork().rng).mac)
@@ -0,0 +1,182 @@
+import random
+from statistics import NormalDist
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import ListFish, create_list_fish, grow_mass, mac_mean, mac_std, random_macs, stratified_macs
+from optimization import Optimization
+from standart_objects import get_cwsd, get_optimization
+
+
+def test_growing_time_matches_daily_growth():
+    """
+    Длительность выращивания по точной формуле должна совпадать с ежедневным расчетом.
+    """
+    optimization: Optimization = get_optimization()
+    optimization.rng = np.random.default_rng(3)
+    growing_time: dict = optimization.calculate_growing_time_distribution(200.0, 1000, replicates=3)
+
+    rng: np.random.Generator = np.random.default_rng(3)
+    for replicate in range(3):
+        list_fish: ListFish = create_list_fish(1000, 200.0, rng)
+        mass: np.ndarray = list_fish.mass
+        days: int = 0
+        while np.count_nonzero(mass > optimization.commercial_fish_mass) < optimization.min_package:
+            mass = grow_mass(mass, list_fish.mac)
+            days += 1
+        assert growing_time['days'][replicate] == days
+
+    assert growing_time['min'] <= growing_time['percentiles'][50] <= growing_time['max']
+
+
+def test_number_fish_for_max_density_modes():
+    """
+    Поиск делением пополам и расчет всей кривой плотности должны давать одинаковый ответ.
+    """
+    optimization: Optimization = get_optimization()
+
+    random.seed(4)
+    bisection: dict = optimization.search_number_fish_for_max_density(83, 50.0, 10, 10, 5000, mode='bisection')
+    random.seed(4)
+    batched: dict = optimization.search_number_fish_for_max_density(83, 50.0, 10, 10, 5000, mode='batched')
+    random.seed(4)
+    linear: int = optimization.calculate_number_fish_for_max_density(83, 50.0, 10, 10, 5000)
+
+    assert bisection['number_fish'] == batched['number_fish']
+    assert abs(linear - bisection['number_fish']) <= 20
+    assert bisection['simulations'] <= 10
+    assert batched['simulations'] == 1
+    assert len(batched['densities']) == 500
+    for number_fish, density in bisection['densities'].items():
+        assert abs(batched['densities'][number_fish] - density) < 1e-9
+
+
+def test_optimal_number_does_not_depend_on_workers():
+    """
+    С заданным зерном результат не должен зависеть от количества процессов.
+    """
+    cwsd: CWSD = get_cwsd()
+    cwsd.run_until(max_days=80, print_info=False)
+
+    arguments: dict = {'cwsd': cwsd, 'average_mass': 180.0, 'start_number': 100, 'step': 100,
+                       'end_number': 1500, 'attempts': 4, 'seed': 5}
+    serial: int = Optimization.calculate_optimal_number_new_fish_in_current_cwsd(**arguments)
+    parallel: int = Optimization.calculate_optimal_number_new_fish_in_current_cwsd(workers=3, **arguments)
+
+    assert serial == parallel
+    # Попытки следующих количеств отправляются в процессы заранее, но отчет совпадает с последовательным
+    assert Optimization.search_optimal_number_new_fish_in_current_cwsd(workers=3, **arguments) == \
+        Optimization.search_optimal_number_new_fish_in_current_cwsd(**arguments)
+
+
+def test_deterministic_stopping_keeps_result():
+    """
+    Досрочная остановка с детерминированными порогами не должна менять результат, но должна
+     сокращать количество попыток.
+    """
+    cwsd: CWSD = get_cwsd()
+    cwsd.run_until(max_days=80, print_info=False)
+
+    arguments: dict = {'cwsd': cwsd, 'average_mass': 180.0, 'start_number': 100, 'step': 100,
+                       'end_number': 1500, 'attempts': 10, 'seed': 6}
+    full: dict = Optimization.search_optimal_number_new_fish_in_current_cwsd(**arguments)
+    stopped: dict = Optimization.search_optimal_number_new_fish_in_current_cwsd(stopping='deterministic',
+                                                                                **arguments)
+
+    assert full['optimal'] == stopped['optimal']
+    assert full['risk'] == stopped['risk']
+    for number_fish, report in stopped['attempts'].items():
+        assert report['result'] == full['attempts'][number_fish]['result']
+        assert report['attempts'] <= full['attempts'][number_fish]['attempts'] == 10
+    last_number: int = max(stopped['attempts'])
+    assert stopped['attempts'][last_number]['attempts'] < 10
+
+
+def test_classify_attempts():
+    """
+    Результат проверки по уже проведенным попыткам.
+    """
+    parameters: tuple = (0.05, 0.05, 0.05)
+    assert Optimization._classify_attempts(100, 0, 100, None, False, *parameters) == 'optimal'
+    assert Optimization._classify_attempts(90, 10, 100, None, False, *parameters) == 'risk'
+    assert Optimization._classify_attempts(50, 10, 100, None, False, *parameters) is None
+    assert Optimization._classify_attempts(50, 11, 100, 'deterministic', False, *parameters) == 'fail'
+    assert Optimization._classify_attempts(90, 1, 100, 'deterministic', False, *parameters) == 'risk'
+    assert Optimization._classify_attempts(50, 1, 100, 'deterministic', False, *parameters) is None
+    assert Optimization._classify_attempts(5, 1, 100, None, True, *parameters) == 'fail'
+    assert Optimization._classify_attempts(5, 5, 100, 'sprt', False, *parameters) == 'fail'
+    assert Optimization._classify_attempts(80, 1, 100, 'sprt', False, *parameters) == 'risk'
+
+
+def test_batched_attempts_match_sequential():
+    """
+    Совместные попытки в BatchCWSD должны давать тот же результат, что и последовательные.
+    """
+    cwsd: CWSD = get_cwsd()
+    cwsd.run_until(max_days=80, print_info=False)
+
+    tasks: list[tuple[int, int]] = [(300, attempt) for attempt in range(3)] + [(600, 0)]
+    random.seed(8)
+    sequential: list[bool] = Optimization._run_attempts(cwsd, tasks, 180.0, None, None)
+    random.seed(8)
+    batched: list[bool] = Optimization._run_attempts(cwsd, tasks, 180.0, None, None, batched=True)
+
+    assert sequential == batched
+
+
+def test_stratified_macs_reduce_variance():
+    """
+    Стратифицированная выборка и латинский гиперкуб дают меньший разброс средних коэффициентов
+     массонакопления между попытками, чем независимая выборка.
+    """
+    rng: np.random.Generator = np.random.default_rng(0)
+    shifts: np.ndarray = rng.integers(20, size=200)
+    random_means: list[float] = [random_macs(200, rng).mean() for _ in range(20)]
+    stratified_means: list[float] = [stratified_macs(200, rng).mean() for _ in range(20)]
+    lhs: np.ndarray = np.stack([stratified_macs(200, rng, attempt, 20, shifts) for attempt in range(20)])
+
+    assert np.std(stratified_means) < np.std(random_means) / 5
+    assert np.std(lhs.mean(axis=1)) < np.std(random_means) / 5
+    # Каждая часть каждого слоя используется ровно в одной попытке
+    distribution: NormalDist = NormalDist(mac_mean, mac_std)
+    probability: np.ndarray = np.array([[distribution.cdf(mac) for mac in row] for row in lhs])
+    parts: np.ndarray = np.floor((probability * 200 - np.arange(200)) * 20)
+    assert np.array_equal(np.sort(parts, axis=0), np.tile(np.arange(20)[:, None], (1, 200)))
+
+
+def test_common_random_numbers_and_confidence():
+    """
+    Общие случайные числа и латинский гиперкуб работают одинаково в последовательных и совместных попытках,
+     а для каждого проверенного количества сообщается уверенность в результате.
+    """
+    cwsd: CWSD = get_cwsd()
+    cwsd.run_until(max_days=80, print_info=False)
+
+    design: tuple[bool, str, int] = (True, 'lhs', 3)
+    tasks: list[tuple[int, int]] = [(300, attempt) for attempt in range(3)] + [(600, 0)]
+    sequential: list[bool] = Optimization._run_attempts(cwsd, tasks, 180.0, 9, None, design=design)
+    batched: list[bool] = Optimization._run_attempts(cwsd, tasks, 180.0, 9, None, batched=True, design=design)
+    assert sequential == batched
+
+    report: dict = Optimization.search_optimal_number_new_fish_in_current_cwsd(
+        cwsd, 180.0, 100, 100, 1500, attempts=10, seed=9, common_random_numbers=True, sampling='stratified')
+    for item in report['attempts'].values():
+        assert 0.0 <= item['confidence'] <= 1.0
+    assert abs(report['attempts'][report['optimal']]['confidence'] - (1 - 0.9 ** 10)) < 1e-12
+    assert report['confidence'] == min(item['confidence'] for item in report['attempts'].values())
+
+
+def test_confidence_for_many_attempts():
+    """
+    Уверенность считается и для тысяч попыток и совпадает с нормальным приближением биномиального закона.
+    """
+    for attempts in (1200, 5000):
+        normal: NormalDist = NormalDist(0.9 * attempts, (0.9 * 0.1 * attempts) ** 0.5)
+        for successes in (int(0.88 * attempts), int(0.9 * attempts), int(0.92 * attempts)):
+            risk: float = Optimization._confidence(successes, attempts, 'risk')
+            fail: float = Optimization._confidence(successes, attempts, 'fail')
+            assert 0.0 <= risk <= 1.0 and 0.0 <= fail <= 1.0
+            # P(X < successes + 1) + P(X > successes) = 1
+            assert abs(Optimization._confidence(successes + 1, attempts, 'risk') + fail - 1.0) < 1e-9
+            assert abs(risk - normal.cdf(successes - 0.5)) < 0.01
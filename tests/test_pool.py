@@ -0,0 +1,240 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from fish import Fish, ListFish, create_list_fish
+from pool import Pool
+
+
+def test_daily_growth_matches_fish():
+    """
+    Суточный рост бассейна должен совпадать с ростом отдельных объектов Fish.
+    """
+    random.seed(1)
+    fishes: list[Fish] = [Fish(100.0 + i) for i in range(50)]
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(ListFish(fishes))
+
+    biomass_increase: float = 0.0
+    spent_feed: float = 0.0
+    for _ in range(10):
+        for fish in fishes:
+            daily_result: dict[str, float] = fish.daily_growth()
+            biomass_increase += daily_result['mass_increase'] / 1000
+            spent_feed += daily_result['required_feed'] / 1000
+        pool_result: dict[str, float] = pool.daily_growth()
+        biomass_increase -= pool_result['biomass_increase']
+        spent_feed -= pool_result['spent_feed']
+
+    assert abs(biomass_increase) < 1e-9
+    assert abs(spent_feed) < 1e-9
+    assert np.allclose(np.sort(pool.fishes.mass), np.sort([fish.mass for fish in fishes]))
+    assert abs(pool.biomass - sum(fish.mass for fish in fishes) / 1000) < 1e-9
+
+
+def test_remove_fish():
+    """
+    Удаление самых больших и самых маленьких рыб.
+    """
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(ListFish.from_arrays(np.array([5.0, 1.0, 3.0, 2.0, 4.0]), np.full(5, 0.08)))
+
+    biggest: ListFish = pool.remove_fish(2)
+    smallest: ListFish = pool.remove_fish(1, biggest_fish=False)
+
+    assert np.allclose(biggest.mass, [5.0, 4.0])
+    assert np.allclose(smallest.mass, [1.0])
+    assert np.allclose(pool.fishes.mass, [2.0, 3.0])
+    assert pool.number_fish == 2
+    assert abs(pool.biomass - 0.005) < 1e-12
+    assert pool.remove_fish(0).get_number_fish() == 0
+    assert pool.remove_fish(3) is None
+
+
+def test_list_fish_statistics():
+    """
+    Биомасса и массы списка рыб.
+    """
+    list_fish: ListFish = create_list_fish(100, 50.0)
+    assert list_fish.get_number_fish() == 100
+    assert abs(list_fish.get_biomass() - 5.0) < 1e-12
+    assert list_fish.get_mass(min=True) == 50.0
+    assert list_fish.get_mass(average=True) == 50.0
+
+
+def test_list_fish_arrays_are_read_only():
+    """
+    Массивы списка рыб нельзя изменить на месте, поэтому запомненная статистика не устаревает.
+    """
+    mass: np.ndarray = np.array([50.0, 60.0])
+    for list_fish in (ListFish.from_arrays(mass, np.zeros(2)), ListFish([Fish(50.0), Fish(60.0)])):
+        assert list_fish.get_biomass() == 0.11
+        for array in (list_fish.mass, list_fish.mac):
+            with pytest.raises(ValueError):
+                array[0] = 100.0
+        assert list_fish.get_biomass() == 0.11
+    # Переданный массив остается изменяемым
+    mass[0] = 100.0
+
+
+def test_polynomial_biomass():
+    """
+    Биомасса, посчитанная по суммам, должна совпадать с суммой масс рыб после роста и удаления.
+    """
+    random.seed(2)
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(300, 50.0))
+    pool.grow(30)
+    pool.add_new_fishes(create_list_fish(200, 120.0))
+    pool.grow(15)
+    pool.remove_fish(100)
+    pool.remove_fish(50, biggest_fish=False)
+    pool.daily_growth()
+
+    assert pool.number_fish == 350
+    assert abs(pool.biomass - pool.fishes.get_biomass()) < 1e-9
+    assert abs(pool.get_biomass_after(10) - pool.biomass - pool.grow(10)['biomass_increase']) < 1e-9
+    assert abs(pool.average_mass - pool.fishes.get_mass(average=True)) < 1e-9
+
+
+def test_remove_fish_by_current_mass():
+    """
+    После роста порядок рыбы по массе меняется, и удаляться должны самые большие (маленькие)
+     рыбы по текущей массе.
+    """
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(ListFish.from_arrays(np.array([100.0, 101.0, 102.0, 103.0]),
+                                             np.array([0.09, 0.07, 0.08, 0.06])))
+    pool.grow(30)
+    mass: np.ndarray = pool.fishes.mass.copy()
+
+    biggest: ListFish = pool.remove_fish(1)
+    smallest: ListFish = pool.remove_fish(2, biggest_fish=False)
+
+    assert np.isclose(biggest.mass[0], mass.max())
+    assert np.allclose(smallest.mass, np.sort(mass)[:2])
+    assert np.isclose(pool.fishes.mass[0], np.sort(mass)[2])
+    assert abs(pool.biomass - pool.fishes.get_biomass()) < 1e-9
+
+    # Новая рыба добавляется и к неотсортированной рыбе
+    pool.add_new_fishes(ListFish.from_arrays(np.array([50.0, 500.0]), np.array([0.08, 0.08])))
+    assert np.isclose(pool.remove_fish(1).mass[0], 500.0)
+    assert np.isclose(pool.remove_fish(1, biggest_fish=False).mass[0], 50.0)
+
+
+def test_count_fish_not_lighter():
+    """
+    Подсчет рыб не легче указанной массы по возрастам достижения массы совпадает с прямым подсчетом.
+    """
+    random.seed(4)
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(500, 100.0))
+    for _ in range(60):
+        pool.daily_growth()
+        for mass in (150.0, 200.0, 300.0):
+            assert pool.count_fish_not_lighter(mass) == np.count_nonzero(pool.fishes.mass >= mass)
+        if pool.count_fish_not_lighter(200.0) >= 50:
+            pool.remove_fish(50)
+
+
+def test_pool_statistics():
+    """
+    Статистика бассейна совпадает с расчетом по массам рыб, а гистограмма - с np.histogram.
+    """
+    random.seed(5)
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(300, 100.0))
+    pool.grow(20)
+    pool.add_new_fishes(create_list_fish(200, 50.0))
+    pool.grow(15)
+
+    bins: np.ndarray = np.array([50.0, 100.0, 150.0, 200.0, 250.0, 300.0])
+    statistics = pool.statistics(bins)
+    expected = pool.fishes.statistics(bins)
+    assert statistics.number_fish == expected.number_fish == 500
+    assert abs(statistics.biomass - expected.biomass) < 1e-9
+    assert abs(statistics.min_mass - expected.min_mass) < 1e-9
+    assert abs(statistics.max_mass - expected.max_mass) < 1e-9
+    assert np.array_equal(statistics.histogram, expected.histogram)
+    assert bins[0] <= statistics.percentile(50) <= bins[-1]
+
+
+def test_pool_extremes_with_crossing_fish():
+    """
+    Наименьшая и наибольшая масса в несортированном бассейне верны каждые сутки, хотя рыбы обгоняют друг
+     друга, и после добавления рыбы огибающие обновляются без просмотра рыбы бассейна.
+    """
+    rng: np.random.Generator = np.random.default_rng(8)
+    pool: Pool = Pool(6.0, 0)
+    for day in range(120):
+        if day % 20 == 0:
+            pool.add_new_fishes(ListFish.from_arrays(rng.uniform(20.0, 300.0, 200), rng.uniform(0.0, 0.1, 200)))
+            assert all(envelope is not None for envelope in pool._envelopes)
+        if day % 30 == 10:
+            pool.remove_fish(50, biggest_fish=day % 60 == 10)
+        pool.grow(1)
+        assert not pool._is_sorted()
+        statistics = pool.statistics()
+        assert np.isclose(statistics.min_mass, pool.fishes.mass.min(), rtol=1e-12)
+        assert np.isclose(statistics.max_mass, pool.fishes.mass.max(), rtol=1e-12)
+
+
+def test_compensated_sums():
+    """
+    Многократные добавления и удаления рыбы не накапливают ошибку биомассы.
+    """
+    random.seed(6)
+    pool: Pool = Pool(6.0, 0)
+    pool.add_new_fishes(create_list_fish(10, 1e6))
+    for number in range(5000):
+        pool.add_new_fishes(ListFish.from_arrays(np.array([0.1234567 + number * 1e-7]), np.zeros(1)))
+        if number % 2:
+            pool.remove_fish(1, biggest_fish=False)
+    # Компенсированная сумма отличается от точно округленной суммы масс не больше чем на несколько
+    # единиц последнего разряда (массы рыб восстанавливаются из кубических корней со своим округлением)
+    exact: float = math.fsum(pool.fishes.mass)
+    assert abs(pool.biomass * 1000 - exact) <= 4 * math.ulp(exact)
+
+
+def test_transfer_fish():
+    """
+    Перемещение блока рыбы дает то же, что удаление и добавление списка рыб, в том числе
+     для несортированных бассейнов.
+    """
+    random.seed(7)
+    for grown_days in (0, 5):
+        source: Pool = Pool(6.0, 0)
+        destination: Pool = Pool(6.0, 1)
+        source.add_new_fishes(create_list_fish(300, 100.0))
+        destination.add_new_fishes(create_list_fish(200, 150.0))
+        source.grow(grown_days)
+        destination.grow(grown_days)
+        copied_source, copied_destination = source.copy(), destination.copy()
+
+        for biggest_fish in (True, False):
+            assert source.transfer_fish(destination, 40, biggest_fish) == 40
+            copied_destination.add_new_fishes(copied_source.remove_fish(40, biggest_fish))
+
+        for pool, copied_pool in ((source, copied_source), (destination, copied_destination)):
+            assert pool.number_fish == copied_pool.number_fish
+            assert abs(pool.biomass - copied_pool.biomass) < 1e-9
+            assert np.allclose(np.sort(pool.fishes.mass), np.sort(copied_pool.fishes.mass))
+            assert abs(pool.biomass - pool.fishes.get_biomass()) < 1e-9
+        if grown_days == 0:
+            # Отсортированный блок вливается в отсортированный бассейн без нарушения порядка
+            assert destination._is_sorted() and np.all(np.diff(destination.fishes.mass) >= 0)
+
+    assert source.transfer_fish(destination, source.number_fish + 1) == 0
+
+
+def test_days_to_commercial_without_growth():
+    """
+    Рыба, которая не растет, либо уже товарная (пакет готов через сутки), либо никогда не станет товарной.
+    """
+    for masses, expected in (([500.0, 500.0], 1), ([300.0, 300.0], None), ([500.0, 300.0], 1)):
+        pool: Pool = Pool(6.0, 0)
+        pool.add_new_fishes(ListFish.from_arrays(np.array(masses), np.zeros(2)))
+        assert pool.days_to_commercial(400.0, 1, 100) == expected
+    assert pool.days_to_commercial(400.0, 2, 100) is None
@@ -0,0 +1,139 @@
+import random
+from datetime import date
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import create_list_fish
+from optimization import Optimization
+from profit import DecisionCache, Profit
+
+
+def get_profit(decision_cache: DecisionCache | None = None) -> Profit:
+    """
+    Метод для получения объекта Profit с маленьким УЗВ, в котором один бассейн пустой.
+    :param decision_cache: Кэш решений.
+    :return: объект Profit
+    """
+    cwsd: CWSD = CWSD(4, 6.0, 40.0, 450.0, 1000, date.today())
+    for number_fish, mass in [[400, 200.0], [450, 150.0], [500, 100.0]]:
+        cwsd.add_fish(create_list_fish(number_fish, mass))
+    return Profit(cwsd, 100.0, [[50.0, 10], [30.0, 8]], 850.0, date.today(), 1e6, decision_cache)
+
+
+def test_decision_cache_lru():
+    """
+    Кэш решений округляет состояние УЗВ и удаляет давно не использованные решения.
+    """
+    cache: DecisionCache = DecisionCache(max_size=2)
+    profit: Profit = get_profit(cache)
+    key: tuple = cache.key(profit.cwsd, 50.0)
+    assert key == (50.0, ((0, 0), (50, 10), (45, 15), (40, 20)))
+
+    cache.put(key, 300)
+    cache.put((50.0, ((1, 1),) * 4), 200)
+    assert cache.get(key) == 300
+    cache.put((30.0, ((1, 1),) * 4), 100)
+    assert cache.get((50.0, ((1, 1),) * 4)) is None
+    assert cache.nearest((50.0, ((0, 0), (50, 10), (45, 15), (41, 20)))) == 300
+    assert cache.nearest((40.0, ((0, 0),) * 4)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_choose_number_new_fish_uses_cache():
+    """
+    Повторный выбор для того же состояния берется из кэша, а выбор с ближайшего решения
+     отличается от полного поиска не больше чем на шаг.
+    """
+    random.seed(7)
+    profit: Profit = get_profit()
+    number_new_fish: int = profit.choose_number_new_fish(50.0, start_number=100, step=100, end_number=2000)
+    assert profit.choose_number_new_fish(50.0, start_number=100, step=100, end_number=2000) == number_new_fish
+    assert profit.decision_cache.hits == 1
+
+    random.seed(7)
+    warm_profit: Profit = get_profit()
+    warm_profit.decision_cache.put((50.0, ((0, 0), (50, 10), (45, 15), (41, 20))), number_new_fish + 200)
+    warm_number: int = warm_profit.choose_number_new_fish(50.0, start_number=100, step=100, end_number=2000)
+    assert abs(warm_number - number_new_fish) <= 100
+
+
+class ScriptedOptimization(Optimization):
+    """
+    Optimization, у которого поиск количества новой рыбы возвращает заданные результаты проверок.
+    """
+    results: dict[int, str] = dict()
+
+    @staticmethod
+    def search_optimal_number_new_fish_in_current_cwsd(cwsd: CWSD, average_mass: float, start_number: int,
+                                                       step: int, end_number: int, **kwargs) -> dict:
+        report: dict = dict()
+        optimal: int = start_number
+        for number_fish in range(start_number, end_number + 1, step):
+            result: str = ScriptedOptimization.results.get(number_fish, 'fail')
+            report[number_fish] = {'successes': 0, 'attempts': 1, 'result': result, 'confidence': 1.0}
+            if result == 'optimal':
+                optimal = number_fish
+            if result == 'fail':
+                break
+        return {'optimal': optimal, 'risk': optimal, 'confidence': 1.0, 'attempts': report}
+
+
+def test_warm_start_passes_risky_numbers():
+    """
+    Поиск вверх от ближайшего решения не останавливается на рискованном количестве: если выше есть
+     оптимальное, то выбирается оно, как и при полном поиске.
+    """
+    profit: Profit = get_profit()
+    profit.optimization = ScriptedOptimization(4, 6.0, 40.0, 450.0, 1000)
+    ScriptedOptimization.results = {300: 'optimal', 400: 'risk', 500: 'optimal', 600: 'risk'}
+    profit.decision_cache.put((50.0, ((0, 0), (50, 10), (45, 15), (41, 20))), 300)
+    assert profit.choose_number_new_fish(50.0, start_number=100, step=100, end_number=2000) == 500
+
+    profit = get_profit()
+    profit.optimization = ScriptedOptimization(4, 6.0, 40.0, 450.0, 1000)
+    ScriptedOptimization.results = {300: 'optimal', 400: 'risk'}
+    profit.decision_cache.put((50.0, ((0, 0), (50, 10), (45, 15), (41, 20))), 300)
+    assert profit.choose_number_new_fish(50.0, start_number=100, step=100, end_number=2000) == 300
+
+
+def test_iter_days_fills_budget():
+    """
+    Генератор Profit выдает суточные записи с бюджетом и заполняет daily_budget.
+    """
+    random.seed(9)
+    profit: Profit = get_profit()
+    profit.search, profit.attempts = (100, 100, 2000), 5
+    records: list[dict] = list(profit.iter_days(5))
+    assert len(records) == 5
+    assert records[0]['stocked_fish'] > 0 and records[0]['pool_number_fish'].min() > 0
+    assert list(profit.daily_budget.values()) == [record['budget'] for record in records]
+    assert abs(records[-1]['budget'] - profit.current_budget) < 1e-9
+
+
+def test_reprice_matches_simulation():
+    """
+    Пересчет по следу при тех же ценах совпадает с бюджетом расчета, а при других ценах - с новым расчетом
+     УЗВ с теми же случайными числами.
+    """
+    random.seed(9)
+    profit: Profit = get_profit()
+    profit.search, profit.attempts = (100, 100, 2000), 5
+    profit.work_cwsd(40)
+    assert len(profit.trace) == 40 and profit.trace.fry_counts.sum() > 0
+
+    same: dict = profit.reprice()
+    assert np.allclose(same['budget'][0], list(profit.daily_budget.values()))
+    assert np.isclose(same['profit'][0], profit.profit)
+
+    random.seed(9)
+    other: Profit = get_profit()
+    other.search, other.attempts = (100, 100, 2000), 5
+    other.feed_cost, other.fish_cost, other.prices_for_fry = 70.0, 900.0, [[50.0, 12], [30.0, 8]]
+    other.work_cwsd(40)
+
+    scenarios: dict = profit.reprice(feed_cost=[100.0, 70.0], fish_cost=[850.0, 900.0],
+                                     fry_prices=[[10, 8], [12, 8]])
+    assert scenarios['budget'].shape == (2, 40)
+    assert np.allclose(scenarios['budget'][1], list(other.daily_budget.values()))
+    assert np.isclose(scenarios['profit'][1], other.profit)
@@ -0,0 +1,33 @@
+import csv
+import random
+
+import numpy as np
+
+from records import RecordSink, load_records
+from standart_objects import get_small_cwsd
+
+
+def test_stream_cwsd_to_npy_and_csv(tmp_path):
+    """
+    Суточные записи УЗВ пишутся порциями и читаются обратно без потерь.
+    """
+    random.seed(8)
+    cwsd = get_small_cwsd()
+    expected: list[dict] = list(cwsd.fork().iter_days(25))
+    assert len(expected) == 25
+    assert expected[-1]['day'] == 25 and len(expected[-1]['pool_biomass']) == 4
+
+    with RecordSink(str(tmp_path / 'days'), chunk_size=10, file_format='npy') as sink:
+        assert sink.write_all(cwsd.fork().iter_days(25)) == 25
+    loaded: np.ndarray = load_records(str(tmp_path / 'days'))
+    assert len(list((tmp_path / 'days').iterdir())) == 3
+    assert np.allclose(loaded['biomass'], [record['biomass'] for record in expected])
+    assert np.allclose(loaded['pool_biomass_3'], [record['pool_biomass'][3] for record in expected])
+
+    with RecordSink(str(tmp_path / 'days.csv'), chunk_size=7) as sink:
+        for record in expected:
+            sink.write(record)
+    with open(tmp_path / 'days.csv', encoding='utf-8') as file:
+        rows: list[dict] = list(csv.DictReader(file))
+    assert len(rows) == 25
+    assert float(rows[-1]['sold_biomass']) == expected[-1]['sold_biomass']
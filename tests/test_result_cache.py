@@ -0,0 +1,92 @@
+import random
+
+import numpy as np
+
+from cwsd import CWSD
+from optimization import Optimization
+from result_cache import ResultCache, model_modules, model_version
+from standart_objects import get_cwsd
+
+
+def get_optimization(seed: int, cache: ResultCache | None) -> Optimization:
+    """
+    Метод для получения стандартного объекта Optimization с генератором и кэшем.
+    :param seed: Зерно генератора.
+    :param cache: Кэш результатов.
+    :return: объект Optimization
+    """
+    return Optimization(4, 6.0, 40.0, 450.0, 1000, np.random.default_rng(seed), cache=cache)
+
+
+def test_optimization_results_are_cached(tmp_path):
+    """
+    Повторные расчеты с тем же зерном берутся из файла кэша и дают те же результаты и то же состояние
+     генератора, что и расчеты без кэша.
+    """
+    path: str = str(tmp_path / 'cache.sqlite')
+    plain: Optimization = get_optimization(3, None)
+    expected: list = [plain.calculate_growing_time(200.0, 1000),
+                      plain.calculate_number_fish_for_max_density(83, 50.0, 10, 10, 5000),
+                      plain.calculate_growing_time(200.0, 1000)]
+
+    for session in range(2):
+        with ResultCache(path) as cache:
+            optimization: Optimization = get_optimization(3, cache)
+            assert [optimization.calculate_growing_time(200.0, 1000),
+                    optimization.calculate_number_fish_for_max_density(83, 50.0, 10, 10, 5000),
+                    optimization.calculate_growing_time(200.0, 1000)] == expected
+            assert optimization.rng.bit_generator.state == plain.rng.bit_generator.state
+            assert (cache.hits, cache.misses) == ((3, 0) if session else (0, 3))
+
+    with ResultCache(path) as cache:
+        # Без генератора результат не воспроизводим и не кэшируется
+        Optimization(4, 6.0, 40.0, 450.0, 1000, cache=cache).calculate_growing_time(200.0, 1000)
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 3}
+
+        # Результаты другого вычислителя хранятся отдельно
+        other: Optimization = Optimization(4, 6.0, 40.0, 450.0, 1000, np.random.default_rng(3), backend='python',
+                                           cache=cache)
+        assert other.calculate_growing_time(200.0, 1000) == expected[0]
+        assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_stocking_search_is_cached(tmp_path):
+    """
+    Поиск количества новой рыбы с зерном кэшируется по состоянию УЗВ.
+    """
+    random.seed(1)
+    cwsd: CWSD = get_cwsd()
+    cwsd.run_until(max_days=80, print_info=False)
+    arguments: dict = {'cwsd': cwsd, 'average_mass': 180.0, 'start_number': 100, 'step': 100,
+                       'end_number': 1500, 'attempts': 4, 'seed': 5}
+
+    with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+        expected: dict = Optimization.search_optimal_number_new_fish_in_current_cwsd(**arguments)
+        assert Optimization.search_optimal_number_new_fish_in_current_cwsd(cache=cache, **arguments) == expected
+        assert Optimization.search_optimal_number_new_fish_in_current_cwsd(cache=cache, **arguments) == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        cwsd.daily_growth(print_info=False)
+        Optimization.calculate_optimal_number_new_fish_in_current_cwsd(cache=cache, **arguments)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_eviction_and_model_version(tmp_path):
+    """
+    Кэш удаляет давно не использованные результаты и забывает результаты другой версии модели.
+    """
+    path: str = str(tmp_path / 'cache.sqlite')
+    assert 'backend' in model_modules
+    with ResultCache(path, max_size=2) as cache:
+        assert cache.version == model_version()
+        for name in ['a', 'b']:
+            cache.put(cache.key(name, {}), name)
+        assert cache.get(cache.key('a', {})) == (True, 'a')
+        cache.put(cache.key('c', {}), 'c')
+        assert cache.get(cache.key('b', {})) == (False, None)
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2}
+
+    with ResultCache(path, max_size=2) as cache:
+        assert cache.get(cache.key('a', {})) == (True, 'a')
+    with ResultCache(path, version='other') as cache:
+        assert len(cache) == 0
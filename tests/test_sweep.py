@@ -0,0 +1,51 @@
+import csv
+
+from sweep import Sweep
+
+
+def test_sweep_skips_saved_points(tmp_path):
+    """
+    Посчитанные точки сохраняются на диск и не пересчитываются, результат не зависит от количества процессов.
+    """
+    grid: dict[str, list] = {'pool_area': [6.0, 8.0], 'fry_mass': [50.0, 100.0]}
+    sweep = Sweep(str(tmp_path / 'serial'), grid, replicates=2, stocking_step=50)
+    assert len(sweep.points()) == 4
+
+    # Прерванный расчет: посчитана только часть точек
+    sweep.grid = {'pool_area': [6.0], 'fry_mass': [50.0, 100.0]}
+    assert sweep.run(seed=1) == 2
+    sweep.grid = grid
+    assert len(sweep.pending(seed=1)) == 2
+    assert sweep.run(seed=1) == 2
+    assert sweep.run(seed=1) == 0
+
+    rows: list[dict] = sweep.table(seed=1)
+    assert [(row['pool_area'], row['fry_mass']) for row in rows] == [(6.0, 50.0), (6.0, 100.0), (8.0, 50.0),
+                                                                     (8.0, 100.0)]
+    for row in rows:
+        assert not row['overflow'] and row['sold_biomass'] > 0 and row['feed_conversion'] > 0
+    # Чем больше площадь, тем больше оптимальное зарыбление
+    assert rows[2]['optimal_stocking'] > rows[0]['optimal_stocking']
+
+    parallel = Sweep(str(tmp_path / 'parallel'), grid, replicates=2, stocking_step=50)
+    assert parallel.run(workers=2, seed=1) == 4
+    assert parallel.table(seed=1) == rows
+
+    assert sweep.save_table(str(tmp_path / 'table.csv'), seed=1) == 4
+    with open(tmp_path / 'table.csv', encoding='utf-8') as file:
+        assert len(list(csv.DictReader(file))) == 4
+
+
+def test_sweep_recomputes_for_other_seed(tmp_path):
+    """
+    Результаты с другим зерном или другой версией модели не считаются посчитанными.
+    """
+    sweep = Sweep(str(tmp_path), {'fry_mass': [50.0, 100.0]}, replicates=2, stocking_step=50)
+    assert sweep.run(seed=0) == 2
+    assert sweep.run(seed=0) == 0
+    assert len(sweep.pending(seed=1)) == 2
+    assert sweep.run(seed=1) == 2
+    assert len(sweep.table(seed=0)) == len(sweep.table(seed=1)) == 2
+
+    sweep.version = 'other'
+    assert len(sweep.pending(seed=0)) == 2